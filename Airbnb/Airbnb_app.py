@@ -1,9 +1,18 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+import streamlit.components.v1 as components
 import folium
-from streamlit_folium import folium_static
+from streamlit_folium import st_folium
+
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from eda_common.map_layers import CanvasPointLayer, step_colormap
+from eda_common.summary_stats import ci_barplot, group_stats, summarize
+from eda_common.density import viewport_bounds
+from listing_store import load_listings
 
 # Set Seaborn style
 sns.set(style="darkgrid")
@@ -11,27 +20,53 @@ sns.set(style="darkgrid")
 # Set a wide layout and a title for the Streamlit app
 st.set_page_config(layout="wide", page_title="NYC Airbnb Data Analysis")
 
-@st.cache_data
+# cache_resource keeps one copy of the listings and their spatial index across reruns
+@st.cache_resource
 def load_data():
     """
-    Loads the Airbnb dataset and performs necessary data cleaning.
+    Loads the Airbnb dataset, performs necessary data cleaning and builds a
+    spatial index over the listing coordinates for area queries.
     """
     try:
-        df = pd.read_csv("Airbnb/AB_NYC_2019.csv")
+        return load_listings("Airbnb/AB_NYC_2019.csv")
     except FileNotFoundError:
         st.error("Error: 'AB_NYC_2019.csv' not found. Please upload the file or ensure it's in the same directory.")
-        return None
-    
-    # Drop unnecessary columns
-    df.drop(['id', 'name', 'host_name', 'last_review'], axis=1, inplace=True)
-    
-    # Fill missing values
-    df['reviews_per_month'] = df['reviews_per_month'].fillna(0)
-    
-    return df
+        return None, None
+
+def area_summary(listings):
+    """
+    Price statistics, room-type mix and availability of the listings in an area.
+    """
+    price = listings['price']
+    return {
+        'count': len(listings),
+        'median_price': price.median(),
+        'mean_price': price.mean(),
+        'price_quartiles': price.quantile([0.25, 0.75]).tolist(),
+        'room_types': listings['room_type'].value_counts(normalize=True),
+        'mean_availability': listings['availability_365'].mean(),
+    }
+
+# Price classes used to colour the listings on the map
+PRICE_EDGES = [0, 50, 75, 100, 150, 200, 300, 500, 1000, 10000]
+
+@st.cache_data(max_entries=32)
+def render_listing_map(max_price, boroughs):
+    """
+    Renders every listing matching the filters as one canvas point layer
+    coloured by price, and returns the map page as HTML. Cached per filter
+    state, so revisiting a combination skips building the map entirely.
+    """
+    listings = df[(df['price'] <= max_price) & df['neighbourhood_group'].isin(boroughs)]
+    colormap = step_colormap(PRICE_EDGES, cmap='plasma', caption="Price per night ($)")
+    map_nyc = folium.Map(location=[40.7128, -74.0060], zoom_start=11, prefer_canvas=True)
+    CanvasPointLayer(listings['latitude'], listings['longitude'], listings['price'], colormap,
+                     radius=2, name="Listings").add_to(map_nyc)
+    colormap.add_to(map_nyc)
+    return map_nyc.get_root().render(), len(listings)
 
 # Load the data using the cached function
-df = load_data()
+df, listing_index = load_data()
 
 # App title and introduction
 st.title("NYC Airbnb Data Analysis Dashboard")
@@ -39,7 +74,8 @@ st.markdown("An interactive dashboard to explore Airbnb listings in New York Cit
 
 if df is not None:
     # Create tabs for better organization
-    tab1, tab2, tab3, tab4 = st.tabs(["Price & Room Types", "Geospatial Map", "Availability", "Raw Data"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Price & Room Types", "Geospatial Map", "Area Explorer",
+                                             "Availability", "Raw Data"])
 
     with tab1:
         st.header("Price and Room Type Analysis")
@@ -62,31 +98,71 @@ if df is not None:
 
         st.subheader("Average Price by Borough")
         fig3, ax3 = plt.subplots(figsize=(10, 5))
-        sns.barplot(x='neighbourhood_group', y='price', data=df[df['price'] < 500], ax=ax3)
+        # Means and 95% confidence intervals from per-borough sums instead of a bootstrap over listings
+        borough_prices = summarize(group_stats(df[df['price'] < 500], 'neighbourhood_group', 'price'))
+        ci_barplot(borough_prices['MEAN'], borough_prices['CI_LOW'], borough_prices['CI_HIGH'],
+                   color=sns.color_palette()[0], ax=ax3)
+        plt.ylabel("price")
         plt.title("Average Price by Borough")
         st.pyplot(fig3)
 
     with tab2:
         st.header("Geospatial Map of NYC Listings")
         
-        # Folium map
-        map_nyc = folium.Map(location=[40.7128, -74.0060], zoom_start=11)
-        # Sample 500 listings for performance
-        sample_df = df[df['price'] < 500].sample(500)
-        for _, row in sample_df.iterrows():
-            folium.CircleMarker(
-                [row["latitude"], row["longitude"]],
-                radius=1,
-                color='blue',
-                fill=True,
-                fill_opacity=0.5
-            ).add_to(map_nyc)
-        
-        # Display the map in the Streamlit app
-        folium_static(map_nyc)
-        st.info("The map displays a sample of 500 listings with prices under $500.")
+        # Map filters; the rendered map is cached for each combination
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            max_price = st.slider("Maximum price ($)", 0, int(df['price'].max()), 500, step=10)
+        with col2:
+            all_boroughs = sorted(df['neighbourhood_group'].unique())
+            boroughs = st.multiselect("Boroughs", all_boroughs, default=all_boroughs)
+
+        html, shown = render_listing_map(max_price, tuple(sorted(boroughs)))
+        components.html(html, height=600)
+        st.info(f"The map displays all {shown:,} listings priced at or under ${max_price:,}, coloured by price.")
 
     with tab3:
+        st.header("Listings in an Area")
+        mode = st.radio("Area", ["Visible map bounds", "Near a point"], horizontal=True)
+        radius = st.slider("Radius (m)", 100, 5000, 1000, step=100, disabled=mode != "Near a point")
+
+        # The point is the last place clicked on the map
+        point = st.session_state.setdefault('area_point', [40.7128, -74.0060])
+        area_map = folium.Map(location=point, zoom_start=13)
+        if mode == "Near a point":
+            folium.Circle(point, radius=radius, color='crimson', fill=True, fill_opacity=0.1).add_to(area_map)
+        map_state = st_folium(area_map, height=450, use_container_width=True,
+                              returned_objects=['bounds', 'last_clicked'], key='area_map')
+
+        clicked = (map_state or {}).get('last_clicked')
+        if clicked and [clicked['lat'], clicked['lng']] != point:
+            st.session_state['area_point'] = [clicked['lat'], clicked['lng']]
+            st.rerun()
+
+        south_west = ((map_state or {}).get('bounds') or {}).get('_southWest') or {}
+        if mode == "Near a point":
+            positions = listing_index.radius(point[0], point[1], radius)
+        elif south_west.get('lat') is not None:
+            north_east = map_state['bounds']['_northEast']
+            positions = listing_index.bbox(south_west['lat'], south_west['lng'],
+                                           north_east['lat'], north_east['lng'])
+        else:
+            # Before the map reports its bounds, use the view it opens with
+            positions = listing_index.bbox(*viewport_bounds(point[0], point[1], 13, 1000, 450))
+
+        summary = area_summary(df.iloc[positions])
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Listings", f"{summary['count']:,}")
+        if summary['count']:
+            col2.metric("Median price", f"${summary['median_price']:,.0f}")
+            col3.metric("Interquartile price", "${:,.0f} - ${:,.0f}".format(*summary['price_quartiles']))
+            col4.metric("Mean availability", f"{summary['mean_availability']:.0f} days")
+            st.subheader("Room Type Mix")
+            st.bar_chart(summary['room_types'])
+        else:
+            st.info("No listings in this area.")
+
+    with tab4:
         st.header("Availability Analysis")
         st.subheader("Availability Over the Year")
         fig4, ax4 = plt.subplots(figsize=(10, 5))
@@ -95,6 +171,6 @@ if df is not None:
         plt.xlabel("Days Available")
         st.pyplot(fig4)
 
-    with tab4:
+    with tab5:
         st.header("Raw Data Overview")
         st.dataframe(df.head(20))
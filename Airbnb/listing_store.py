@@ -0,0 +1,20 @@
+import pandas as pd
+
+from eda_common.spatial import GridIndex
+
+
+def load_listings(csv_path):
+    """
+    Loads the Airbnb listings, drops the columns the dashboard does not use,
+    fills missing reviews_per_month with 0 and builds a spatial index over
+    the listing coordinates for area queries. Returns (listings, index).
+    """
+    df = pd.read_csv(csv_path)
+
+    # Drop unnecessary columns
+    df.drop(['id', 'name', 'host_name', 'last_review'], axis=1, inplace=True)
+
+    # Fill missing values
+    df['reviews_per_month'] = df['reviews_per_month'].fillna(0)
+
+    return df, GridIndex(df['latitude'], df['longitude'])
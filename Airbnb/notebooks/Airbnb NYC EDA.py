@@ -2,6 +2,13 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import folium
+import os
+import sys
+
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from eda_common.map_layers import CanvasPointLayer, step_colormap
+from eda_common.summary_stats import ci_barplot, group_stats, summarize
 
 # Load data
 print("Loading dataset 'AB_NYC_2019.csv'...")
@@ -53,7 +60,11 @@ print("Chart displayed: Listings by Borough.")
 # Average price per borough
 print("\nGenerating Average Price by Borough chart...")
 plt.figure(figsize=(8, 5))
-sns.barplot(x='neighbourhood_group', y='price', data=df[df['price'] < 500])
+# Means and 95% confidence intervals from per-borough sums instead of a bootstrap over listings
+borough_prices = summarize(group_stats(df[df['price'] < 500], 'neighbourhood_group', 'price'))
+ci_barplot(borough_prices['MEAN'], borough_prices['CI_LOW'], borough_prices['CI_HIGH'],
+           color=sns.color_palette()[0])
+plt.ylabel("price")
 plt.title("Average Price by Borough")
 plt.show()
 print("Chart displayed: Average Price by Borough.")
@@ -67,16 +78,13 @@ plt.xlabel("Days Available")
 plt.show()
 print("Chart displayed: Availability Over the Year.")
 
-# Folium heatmap
-print("\nGenerating Folium heatmap of NYC Airbnb listings...")
-map_nyc = folium.Map(location=[40.7128, -74.0060], zoom_start=11)
-for idx, row in df[df['price'] < 500].sample(500).iterrows():
-    folium.CircleMarker(
-        [row["latitude"], row["longitude"]],
-        radius=1,
-        color='blue',
-        fill=True,
-        fill_opacity=0.5
-    ).add_to(map_nyc)
+# Folium map of every listing, coloured by price
+print("\nGenerating Folium map of NYC Airbnb listings...")
+map_nyc = folium.Map(location=[40.7128, -74.0060], zoom_start=11, prefer_canvas=True)
+colormap = step_colormap([0, 50, 75, 100, 150, 200, 300, 500, 1000, 10000], cmap='plasma',
+                         caption="Price per night ($)")
+CanvasPointLayer(df['latitude'], df['longitude'], df['price'], colormap, radius=2,
+                 name="Listings").add_to(map_nyc)
+colormap.add_to(map_nyc)
 map_nyc.save("NYC_Airbnb_Map.html")
-print("Folium map saved as 'NYC_Airbnb_Map.html'.")
+print(f"Folium map of all {len(df):,} listings saved as 'NYC_Airbnb_Map.html'.")
\ No newline at end of file
@@ -1,8 +1,15 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from eda_common.bitmaps import BitmapIndex
+from eda_common.summary_stats import ci_barplot
+from flight_store import DELAY_CAUSE_COLUMNS, load_delay_cube, rollup, weighted_kde_factor
+
 # Set page configuration for wide layout and title
 st.set_page_config(layout="wide", page_title="Flight Delay Analysis")
 
@@ -13,46 +20,47 @@ sns.set_style("darkgrid")
 def load_data():
     """
     Loads the flight delay dataset, handles missing values, and performs data cleaning.
+    Returns the airline x month x route delay cube and the per-airline delay
+    histogram; both are cached on disk, so only the first start parses the CSV.
     """
     try:
-        df = pd.read_csv("Flight_Delay/flights_sample_3m.csv", on_bad_lines='skip')
-        
-        # Correct column names and drop rows with missing values
-        df.dropna(subset=['ARR_DELAY', 'DEP_DELAY'], inplace=True)
-        
-        # Convert FL_DATE to datetime and extract month
-        df['FL_DATE'] = pd.to_datetime(df['FL_DATE'], errors='coerce')
-        df['MONTH'] = df['FL_DATE'].dt.month
-        
-        # Create a route column
-        df['ROUTE'] = df['ORIGIN'] + "-" + df['DEST']
-        
-        return df
+        return load_delay_cube("Flight_Delay/flights_sample_3m.csv")
     except FileNotFoundError:
         st.error("Error: 'flights_sample_3m.csv' not found.")
         st.info("Please download the file from Kaggle and place it in the same directory as this script.")
         return None
 
 # Load the dataset
-df = load_data()
+data = load_data()
+
+@st.cache_resource
+def load_bitmaps():
+    """
+    Builds one row bitmap per airline over the delay cube and the delay histogram.
+    """
+    cube, delay_hist = data
+    return BitmapIndex(cube, ['AIRLINE']), BitmapIndex(delay_hist, ['AIRLINE'])
 
 # App title and introduction
 st.title("Flight Delay Analysis Dashboard")
 st.markdown("An interactive dashboard to explore key factors contributing to flight delays.")
 
-if df is not None:
+if data is not None:
+    cube, delay_hist = data
+    cube_bitmaps, hist_bitmaps = load_bitmaps()
+
     # Sidebar for filters
     st.sidebar.header("Filters")
-    selected_airline = st.sidebar.selectbox("Select an Airline", ["All"] + sorted(df['AIRLINE'].unique()))
+    selected_airline = st.sidebar.selectbox("Select an Airline", ["All"] + sorted(cube_bitmaps.labels['AIRLINE'].astype(str)))
     
-    # Filter data based on sidebar selection
-    filtered_df = df
-    if selected_airline != "All":
-        filtered_df = df[df['AIRLINE'] == selected_airline]
+    # Filter the pre-aggregated cube (not the flights) based on sidebar selection, from the airline bitmaps
+    filtered_cube = cube.iloc[cube_bitmaps.rows(cube_bitmaps.select({'AIRLINE': selected_airline}))]
+    filtered_hist = delay_hist.iloc[hist_bitmaps.rows(hist_bitmaps.select({'AIRLINE': selected_airline}))]
+    n_flights = int(filtered_cube['COUNT'].sum())
 
     # Display basic info
     st.write(f"Displaying data for: **{selected_airline}** airline.")
-    st.write(f"Number of flights: {len(filtered_df)}")
+    st.write(f"Number of flights: {n_flights}")
 
     # Tabs for different analyses
     tab1, tab2, tab3 = st.tabs(["Overview", "Trends", "Delay Causes"])
@@ -63,9 +71,11 @@ if df is not None:
 
         with col1:
             st.subheader("Average Arrival Delay by Airline")
-            airline_delays = filtered_df.groupby('AIRLINE')['ARR_DELAY'].mean().sort_values(ascending=False)
+            airline_delays = rollup(filtered_cube, 'AIRLINE').sort_values('ARR_DELAY_MEAN', ascending=False)
             fig1, ax1 = plt.subplots(figsize=(10, 5))
-            sns.barplot(x=airline_delays.index, y=airline_delays.values, hue=airline_delays.index, legend=False, ax=ax1)
+            # 95% confidence intervals come from the cube's sums, not from resampling flights
+            ci_barplot(airline_delays['ARR_DELAY_MEAN'], airline_delays['ARR_DELAY_CI_LOW'],
+                       airline_delays['ARR_DELAY_CI_HIGH'], hue=airline_delays.index, legend=False, ax=ax1)
             plt.ylabel("Avg Delay (minutes)")
             plt.xlabel("Airline")
             plt.xticks(rotation=45)
@@ -74,9 +84,10 @@ if df is not None:
 
         with col2:
             st.subheader("Top 10 Most Delayed Routes")
-            route_delays = filtered_df.groupby('ROUTE')['ARR_DELAY'].mean().sort_values(ascending=False).head(10)
+            route_delays = rollup(filtered_cube, 'ROUTE').sort_values('ARR_DELAY_MEAN', ascending=False).head(10)
             fig2, ax2 = plt.subplots(figsize=(10, 6))
-            sns.barplot(x=route_delays.values, y=route_delays.index, hue=route_delays.index, legend=False, ax=ax2)
+            ci_barplot(route_delays['ARR_DELAY_MEAN'], route_delays['ARR_DELAY_CI_LOW'],
+                       route_delays['ARR_DELAY_CI_HIGH'], orient='h', hue=route_delays.index, legend=False, ax=ax2)
             plt.xlabel("Avg Arrival Delay (minutes)")
             plt.tight_layout()
             st.pyplot(fig2)
@@ -87,7 +98,7 @@ if df is not None:
 
         with col1:
             st.subheader("Average Arrival Delay by Month")
-            monthly_avg_delay = filtered_df.groupby('MONTH')['ARR_DELAY'].mean()
+            monthly_avg_delay = rollup(filtered_cube, 'MONTH')['ARR_DELAY_MEAN']
             fig3, ax3 = plt.subplots(figsize=(10, 5))
             ax3.plot(monthly_avg_delay, marker='o')
             plt.title("Average Arrival Delay by Month")
@@ -100,7 +111,9 @@ if df is not None:
         with col2:
             st.subheader("Arrival Delay Distribution")
             fig4, ax4 = plt.subplots(figsize=(10, 5))
-            sns.histplot(filtered_df['ARR_DELAY'], bins=100, kde=True, ax=ax4)
+            # One weighted row per distinct delay value; the KDE bandwidth matches the raw flights
+            sns.histplot(data=filtered_hist, x='ARR_DELAY', weights='COUNT', bins=100, kde=True,
+                         kde_kws={'bw_method': weighted_kde_factor(filtered_hist['COUNT'])}, ax=ax4)
             plt.title("Arrival Delay Distribution")
             plt.xlabel("Arrival Delay (minutes)")
             plt.ylabel("Frequency")
@@ -112,11 +125,10 @@ if df is not None:
         st.header("Analysis of Delay Causes")
         
         st.subheader("Total Delay by Cause")
-        delay_cols = ['DELAY_DUE_CARRIER', 'DELAY_DUE_WEATHER', 'DELAY_DUE_NAS', 'DELAY_DUE_SECURITY', 'DELAY_DUE_LATE_AIRCRAFT']
+        delay_cols = DELAY_CAUSE_COLUMNS
         # Check if delay columns exist before trying to access them
-        if all(col in filtered_df.columns for col in delay_cols):
-            df_delay = filtered_df[delay_cols].dropna()
-            df_delay_sum = df_delay.sum().sort_values(ascending=False)
+        if all(col in filtered_cube.columns for col in delay_cols):
+            df_delay_sum = filtered_cube[delay_cols].sum().sort_values(ascending=False)
             fig5, ax5 = plt.subplots(figsize=(8, 5))
             sns.barplot(x=df_delay_sum.index, y=df_delay_sum.values, hue=df_delay_sum.index, legend=False, ax=ax5)
             plt.title("Total Delay by Cause")
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from eda_common import read_csv_parallel
+from eda_common.summary_stats import mean_ci
+from eda_common.uniques import on_uniques
+
+# pyarrow is the Parquet engine behind the ingest cache. Without it the
+# loader still works, it just parses the CSV on every cold start.
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+# Bump when the cleaning steps or derived columns change so old caches are rebuilt
+CACHE_VERSION = 1
+
+# Low-cardinality text columns, parsed and stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = [
+    'AIRLINE', 'AIRLINE_DOT', 'AIRLINE_CODE', 'ORIGIN', 'ORIGIN_CITY',
+    'DEST', 'DEST_CITY', 'CANCELLATION_CODE',
+]
+
+DELAY_CAUSE_COLUMNS = [
+    'DELAY_DUE_CARRIER', 'DELAY_DUE_WEATHER', 'DELAY_DUE_NAS',
+    'DELAY_DUE_SECURITY', 'DELAY_DUE_LATE_AIRCRAFT',
+]
+
+# Grain of the delay cube and the additive measures stored per cell
+CUBE_KEYS = ['AIRLINE', 'MONTH', 'ROUTE']
+CUBE_MEASURES = ['COUNT', 'ARR_DELAY_SUM', 'ARR_DELAY_SUMSQ', 'CAUSE_COUNT'] + DELAY_CAUSE_COLUMNS
+
+
+def file_fingerprint(path):
+    """
+    Returns the size, modification time and SHA-256 digest of a file.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b''):
+            digest.update(block)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+
+
+def cache_paths(csv_path, cache_dir=None, artifact=None):
+    """
+    Returns the (data, manifest) paths of the columnar cache for a CSV file.
+    Derived tables (e.g. the delay cube) are stored as named artifacts that
+    share the manifest of the cleaned frame; the manifest lists the
+    artifacts written for the current source under 'artifacts'.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), '.cache')
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    name = stem if artifact is None else f"{stem}.{artifact}"
+    return os.path.join(cache_dir, name + '.parquet'), os.path.join(cache_dir, stem + '.json')
+
+
+def _read_manifest(manifest_path):
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(manifest_path, manifest):
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _cache_is_valid(manifest, csv_path, manifest_path):
+    """
+    Checks a cache manifest against the source file. Size and mtime are
+    checked first; the content hash is only recomputed when the mtime moved
+    (e.g. the file was copied or touched), and a matching hash refreshes the
+    stored mtime so the next start is cheap again.
+    """
+    if manifest is None or manifest.get('version') != CACHE_VERSION:
+        return False
+    stat = os.stat(csv_path)
+    if manifest['size'] != stat.st_size:
+        return False
+    if manifest['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    if manifest['sha256'] != file_fingerprint(csv_path)['sha256']:
+        return False
+    manifest['mtime_ns'] = stat.st_mtime_ns
+    _write_manifest(manifest_path, manifest)
+    return True
+
+
+def route_column(origin, dest):
+    """
+    Builds the categorical ROUTE ("ORIGIN-DEST") column from the ORIGIN and
+    DEST categoricals. Labels are only formatted once per distinct pair
+    instead of concatenating millions of strings.
+    """
+    origin = origin.astype('category')
+    dest = dest.astype('category')
+    n_dest = max(len(dest.cat.categories), 1)
+    pair_codes = origin.cat.codes.to_numpy(np.int64) * n_dest + dest.cat.codes.to_numpy(np.int64)
+    # A missing ORIGIN or DEST gives a missing route, like the string concat did
+    missing = (origin.cat.codes.to_numpy() < 0) | (dest.cat.codes.to_numpy() < 0)
+    uniques, codes = np.unique(np.where(missing, -1, pair_codes), return_inverse=True)
+    codes = codes.reshape(-1)
+    if len(uniques) and uniques[0] == -1:
+        codes = codes - 1
+        uniques = uniques[1:]
+    labels = [
+        f"{origin.cat.categories[pair // n_dest]}-{dest.cat.categories[pair % n_dest]}"
+        for pair in uniques
+    ]
+    return pd.Series(pd.Categorical.from_codes(codes, labels), index=origin.index, name='ROUTE')
+
+
+def clean_flights(df):
+    """
+    Drops rows without arrival/departure delays and derives the MONTH and
+    ROUTE columns used by the dashboard and the notebook.
+    """
+    df = df.dropna(subset=['ARR_DELAY', 'DEP_DELAY'])
+    df = df.reset_index(drop=True)
+    # A few hundred distinct dates over millions of flights: parse each date once
+    df['FL_DATE'] = on_uniques(df['FL_DATE'], lambda dates: pd.to_datetime(dates, errors='coerce'))
+    df['MONTH'] = df['FL_DATE'].dt.month
+    df['ROUTE'] = route_column(df['ORIGIN'], df['DEST'])
+    return df
+
+
+def read_flights_csv(csv_path, chunksize=None):
+    """
+    Parses the raw flights CSV, reading the text columns straight into categoricals.
+    The whole file is parsed across all cores; with a chunksize, returns an
+    iterator of frames of that many rows instead.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtype = {col: 'category' for col in CATEGORICAL_COLUMNS if col in header}
+    if chunksize is not None:
+        return pd.read_csv(csv_path, on_bad_lines='skip', dtype=dtype, chunksize=chunksize)
+    return read_csv_parallel(csv_path, on_bad_lines='skip', dtype=dtype)
+
+
+def _write_parquet(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_flights(csv_path, cache_dir=None, use_cache=True):
+    """
+    Loads the cleaned flight dataset, going through a Parquet cache next to
+    the CSV (``.cache/`` by default). The cache is written on first load and
+    reused while the source file's size, mtime and content hash still match.
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+
+    if not (use_cache and HAVE_PYARROW):
+        return clean_flights(read_flights_csv(csv_path))
+
+    data_path, manifest_path = cache_paths(csv_path, cache_dir)
+    if os.path.exists(data_path) and _cache_is_valid(_read_manifest(manifest_path), csv_path, manifest_path):
+        return pd.read_parquet(data_path)
+
+    df = clean_flights(read_flights_csv(csv_path))
+
+    # Invalidate the manifest first so stale derived tables are never paired with new data
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    _write_parquet(df, data_path)
+    manifest = file_fingerprint(csv_path)
+    manifest['version'] = CACHE_VERSION
+    _write_manifest(manifest_path, manifest)
+    return df
+
+
+def build_delay_cube(df):
+    """
+    Aggregates the cleaned flights into sufficient statistics at
+    airline x month x route grain: flight count, sum and sum of squares of
+    ARR_DELAY, and the DELAY_DUE_* sums over rows that report every cause
+    (CAUSE_COUNT of them). Every measure is additive, so any filter on the
+    keys is answered by summing cells instead of rescanning the flights.
+    """
+    arr_delay = df['ARR_DELAY'].astype('float64')
+    cause_cols = DELAY_CAUSE_COLUMNS if all(col in df.columns for col in DELAY_CAUSE_COLUMNS) else []
+    complete = df[cause_cols].notna().all(axis=1)
+    cells = pd.DataFrame({
+        'AIRLINE': df['AIRLINE'],
+        'MONTH': df['MONTH'],
+        'ROUTE': df['ROUTE'],
+        'COUNT': arr_delay.notna().astype('int64'),
+        'ARR_DELAY_SUM': arr_delay,
+        'ARR_DELAY_SUMSQ': arr_delay ** 2,
+        'CAUSE_COUNT': complete.astype('int64'),
+    })
+    for col in cause_cols:
+        cells[col] = df[col].where(complete)
+    cube = cells.groupby(CUBE_KEYS, observed=True, dropna=False).sum()
+    return cube.reset_index()
+
+
+def build_delay_histogram(df):
+    """
+    Counts flights per (AIRLINE, ARR_DELAY) value. Delays are whole minutes,
+    so this is a few thousand rows per airline and reproduces the arrival
+    delay histogram exactly when plotted with ``weights='COUNT'``.
+    """
+    hist = df.groupby(['AIRLINE', 'ARR_DELAY'], observed=True).size()
+    return hist.rename('COUNT').reset_index()
+
+
+def merge_cubes(cubes):
+    """
+    Merges partial delay cubes (e.g. built from separate chunks of the CSV).
+    """
+    cube = pd.concat(cubes, ignore_index=True)
+    measures = [col for col in CUBE_MEASURES if col in cube.columns]
+    return cube.groupby(CUBE_KEYS, observed=True, dropna=False)[measures].sum().reset_index()
+
+
+def merge_histograms(hists):
+    """
+    Merges partial delay histograms built by build_delay_histogram.
+    """
+    hist = pd.concat(hists, ignore_index=True)
+    return hist.groupby(['AIRLINE', 'ARR_DELAY'], observed=True)['COUNT'].sum().reset_index()
+
+
+def rollup(cube, by):
+    """
+    Rolls the cube up to the given key column(s) and derives the ARR_DELAY
+    mean, sample standard deviation and 95% confidence interval of the mean
+    from the stored sums.
+    """
+    measures = [col for col in CUBE_MEASURES if col in cube.columns]
+    grouped = cube.groupby(by, observed=True)[measures].sum()
+    grouped = grouped[grouped['COUNT'] > 0]
+    (grouped['ARR_DELAY_MEAN'], grouped['ARR_DELAY_STD'],
+     grouped['ARR_DELAY_CI_LOW'], grouped['ARR_DELAY_CI_HIGH']) = mean_ci(
+        grouped['COUNT'], grouped['ARR_DELAY_SUM'], grouped['ARR_DELAY_SUMSQ'])
+    if isinstance(grouped.index, pd.CategoricalIndex):
+        grouped.index = grouped.index.astype(str)
+    return grouped
+
+
+def weighted_kde_factor(counts):
+    """
+    KDE bandwidth factor for a histogram given as (value, count) pairs.
+    scipy normalizes weighted covariance by the effective sample size
+    instead of the row count, so Scott's factor for the real row count is
+    rescaled to give the same bandwidth as a KDE over the raw rows.
+    """
+    counts = np.asarray(counts, dtype='float64')
+    n = counts.sum()
+    if n < 2:
+        return 1.0
+    n_eff = n ** 2 / (counts ** 2).sum()
+    return n ** -0.2 * np.sqrt((1 - 1 / n_eff) / (1 - 1 / n))
+
+
+def load_delay_cube(csv_path, cache_dir=None, use_cache=True):
+    """
+    Returns the (cube, histogram) pair for the flights CSV. Both are stored
+    as Parquet artifacts next to the cleaned-frame cache and share its
+    manifest, so they are rebuilt only when the source file changes. They
+    are added to the manifest only once written, so a crash in between
+    never pairs old artifacts with a new source.
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+
+    if use_cache and HAVE_PYARROW:
+        cube_path, manifest_path = cache_paths(csv_path, cache_dir, artifact='cube')
+        hist_path, _ = cache_paths(csv_path, cache_dir, artifact='hist')
+        manifest = _read_manifest(manifest_path)
+        if (os.path.exists(cube_path) and os.path.exists(hist_path)
+                and {'cube', 'hist'} <= set((manifest or {}).get('artifacts', []))
+                and _cache_is_valid(manifest, csv_path, manifest_path)):
+            return pd.read_parquet(cube_path), pd.read_parquet(hist_path)
+
+    df = load_flights(csv_path, cache_dir=cache_dir, use_cache=use_cache)
+    cube, hist = build_delay_cube(df), build_delay_histogram(df)
+    if use_cache and HAVE_PYARROW:
+        _write_parquet(cube, cube_path)
+        _write_parquet(hist, hist_path)
+        # load_flights left a manifest for the current source; it now vouches for the artifacts too
+        manifest = _read_manifest(manifest_path)
+        if manifest is not None:
+            manifest['artifacts'] = sorted(set(manifest.get('artifacts', [])) | {'cube', 'hist'})
+            _write_manifest(manifest_path, manifest)
+    return cube, hist
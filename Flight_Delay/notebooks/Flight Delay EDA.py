@@ -1,53 +1,117 @@
+import argparse
+import os
+import sys
+
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# flight_store.py lives one level up, next to the dashboard; eda_common at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from eda_common.summary_stats import ci_barplot, group_stats, summarize
+from eda_common.uniques import on_uniques
+from flight_store import (DELAY_CAUSE_COLUMNS, build_delay_cube, build_delay_histogram, clean_flights,
+                          merge_cubes, merge_histograms, read_flights_csv, rollup, weighted_kde_factor)
+
+# Streaming mode reads the CSV in fixed-size chunks and keeps only the mergeable
+# delay cube and delay histogram in memory, so the input size is not bounded by RAM.
+parser = argparse.ArgumentParser(description="Flight Delay EDA")
+parser.add_argument("--stream", action="store_true",
+                    help="read the CSV in chunks and aggregate online instead of loading it whole")
+parser.add_argument("--chunksize", type=int, default=1_000_000,
+                    help="rows per chunk in streaming mode (default: 1,000,000)")
+args, _ = parser.parse_known_args()
+
 # Load dataset
 # The original Kaggle link is a webpage, not a raw file.
 # Please download the 'flights_sample_3m.csv' file from Kaggle and place it in the same directory.
-print("Loading dataset from local file 'flights_sample_3m.csv'...")
-try:
-    # Fix: Added on_bad_lines='skip' to handle potential malformed rows in the CSV
-    df = pd.read_csv("../flights_sample_3m.csv", on_bad_lines='skip')
-    print("Dataset loaded successfully.")
-except FileNotFoundError:
-    print("Error: 'flights_sample_3m.csv' not found.")
-    print("Please download the file from Kaggle and place it in the same directory as this script.")
-    exit()
-
-print(f"\nDataset shape: {df.shape}")
-print(f"Dataset columns: {df.columns.tolist()}")
-
-# Basic info
-print("\nChecking for missing values in key columns...")
-# Fix: Corrected column names from 'ARRIVAL_DELAY'/'DEPARTURE_DELAY' to 'ARR_DELAY'/'DEP_DELAY'
-if 'ARR_DELAY' in df.columns and 'DEP_DELAY' in df.columns:
-    print(df[['ARR_DELAY', 'DEP_DELAY']].isnull().sum())
-    df = df.dropna(subset=['ARR_DELAY', 'DEP_DELAY'])
+if args.stream:
+    print(f"Streaming dataset from local file 'flights_sample_3m.csv' in chunks of {args.chunksize:,} rows...")
+    try:
+        columns = pd.read_csv("../flights_sample_3m.csv", nrows=0).columns.tolist()
+    except FileNotFoundError:
+        print("Error: 'flights_sample_3m.csv' not found.")
+        print("Please download the file from Kaggle and place it in the same directory as this script.")
+        exit()
+    for col in ['ARR_DELAY', 'DEP_DELAY', 'FL_DATE', 'AIRLINE', 'ORIGIN', 'DEST'] + DELAY_CAUSE_COLUMNS:
+        if col not in columns:
+            print(f"Error: '{col}' column not found.")
+            exit()
+
+    # Online aggregation: each chunk is cleaned, reduced to a partial cube and
+    # histogram, and merged into the running totals before the next chunk is read.
+    n_rows = n_clean = 0
+    missing = pd.Series(0, index=['ARR_DELAY', 'DEP_DELAY'])
+    cube = delay_hist = None
+    for i, chunk in enumerate(read_flights_csv("../flights_sample_3m.csv", chunksize=args.chunksize), start=1):
+        n_rows += len(chunk)
+        missing += chunk[['ARR_DELAY', 'DEP_DELAY']].isnull().sum()
+        chunk = clean_flights(chunk)
+        n_clean += len(chunk)
+        chunk_cube, chunk_hist = build_delay_cube(chunk), build_delay_histogram(chunk)
+        cube = chunk_cube if cube is None else merge_cubes([cube, chunk_cube])
+        delay_hist = chunk_hist if delay_hist is None else merge_histograms([delay_hist, chunk_hist])
+        print(f"  Chunk {i}: {n_rows:,} rows read so far.")
+    print("Dataset streamed successfully.")
+
+    print(f"\nDataset shape: ({n_rows}, {len(columns)})")
+    print(f"Dataset columns: {columns}")
+    print("\nChecking for missing values in key columns...")
+    print(missing)
     print("Rows with missing ARR_DELAY or DEP_DELAY values have been removed.")
-    print(f"New dataset shape: {df.shape}")
+    print(f"Remaining rows: {n_clean}")
 else:
-    print("Error: 'ARR_DELAY' or 'DEP_DELAY' column not found.")
-    # Exit or handle the missing columns appropriately
-    exit()
-
-# Convert dates if needed
-# Fix: 'MONTH' column is not available, extracting month from 'FL_DATE'
-print("\nConverting date column and extracting month...")
-if 'FL_DATE' in df.columns:
-    df['FL_DATE'] = pd.to_datetime(df['FL_DATE'], errors='coerce')
-    df['MONTH'] = df['FL_DATE'].dt.month
-else:
-    print("Error: 'FL_DATE' column not found. Cannot extract month.")
-    exit()
-# The 'DAY_OF_WEEK' column is not available and has been removed.
+    print("Loading dataset from local file 'flights_sample_3m.csv'...")
+    try:
+        # Fix: Added on_bad_lines='skip' to handle potential malformed rows in the CSV
+        df = pd.read_csv("../flights_sample_3m.csv", on_bad_lines='skip')
+        print("Dataset loaded successfully.")
+    except FileNotFoundError:
+        print("Error: 'flights_sample_3m.csv' not found.")
+        print("Please download the file from Kaggle and place it in the same directory as this script.")
+        exit()
+
+    print(f"\nDataset shape: {df.shape}")
+    print(f"Dataset columns: {df.columns.tolist()}")
+
+    # Basic info
+    print("\nChecking for missing values in key columns...")
+    # Fix: Corrected column names from 'ARRIVAL_DELAY'/'DEPARTURE_DELAY' to 'ARR_DELAY'/'DEP_DELAY'
+    if 'ARR_DELAY' in df.columns and 'DEP_DELAY' in df.columns:
+        print(df[['ARR_DELAY', 'DEP_DELAY']].isnull().sum())
+        df = df.dropna(subset=['ARR_DELAY', 'DEP_DELAY'])
+        print("Rows with missing ARR_DELAY or DEP_DELAY values have been removed.")
+        print(f"New dataset shape: {df.shape}")
+    else:
+        print("Error: 'ARR_DELAY' or 'DEP_DELAY' column not found.")
+        # Exit or handle the missing columns appropriately
+        exit()
+
+    # Convert dates if needed
+    # Fix: 'MONTH' column is not available, extracting month from 'FL_DATE'
+    print("\nConverting date column and extracting month...")
+    if 'FL_DATE' in df.columns:
+        # Each distinct date string is parsed once and broadcast to its flights
+        df['FL_DATE'] = on_uniques(df['FL_DATE'], lambda dates: pd.to_datetime(dates, errors='coerce'))
+        df['MONTH'] = df['FL_DATE'].dt.month
+    else:
+        print("Error: 'FL_DATE' column not found. Cannot extract month.")
+        exit()
+    # The 'DAY_OF_WEEK' column is not available and has been removed.
 
 # Airline delay averages
 print("\nGenerating Average Arrival Delay by Airline chart...")
 # Fix: Corrected column name to 'ARR_DELAY'
-airline_delays = df.groupby('AIRLINE')['ARR_DELAY'].mean().sort_values(ascending=False)
+# Means and 95% confidence intervals come from per-airline sums, not from resampling flights
+if args.stream:
+    airline_delays = rollup(cube, 'AIRLINE')
+else:
+    airline_delays = summarize(group_stats(df, 'AIRLINE', 'ARR_DELAY')).add_prefix('ARR_DELAY_')
+airline_delays = airline_delays.sort_values('ARR_DELAY_MEAN', ascending=False)
 plt.figure(figsize=(10, 5))
-sns.barplot(x=airline_delays.index, y=airline_delays.values, hue=airline_delays.index, legend=False)
+ci_barplot(airline_delays['ARR_DELAY_MEAN'], airline_delays['ARR_DELAY_CI_LOW'], airline_delays['ARR_DELAY_CI_HIGH'],
+           hue=airline_delays.index, legend=False)
 plt.title("Average Arrival Delay by Airline")
 plt.ylabel("Avg Delay (minutes)")
 plt.xlabel("Airline")
@@ -60,8 +124,12 @@ print("Chart displayed: Average Arrival Delay by Airline.")
 print("\nGenerating Total Delay by Cause chart...")
 # Fix: Corrected column names to match the dataset
 delay_cols = ['DELAY_DUE_CARRIER', 'DELAY_DUE_WEATHER', 'DELAY_DUE_NAS', 'DELAY_DUE_SECURITY', 'DELAY_DUE_LATE_AIRCRAFT']
-df_delay = df[delay_cols].dropna()
-df_delay_sum = df_delay.sum().sort_values(ascending=False)
+if args.stream:
+    # The cube only sums causes over rows that report all of them, like dropna() below
+    df_delay_sum = cube[delay_cols].sum().sort_values(ascending=False)
+else:
+    df_delay = df[delay_cols].dropna()
+    df_delay_sum = df_delay.sum().sort_values(ascending=False)
 plt.figure(figsize=(8, 5))
 # Renamed x-tick labels for clarity
 sns.barplot(x=df_delay_sum.index, y=df_delay_sum.values, hue=df_delay_sum.index, legend=False)
@@ -75,7 +143,10 @@ print("Chart displayed: Total Delay by Cause.")
 # Monthly delay trend
 print("\nGenerating Average Arrival Delay by Month chart...")
 # Fix: Corrected column name to 'ARR_DELAY'
-monthly_avg_delay = df.groupby('MONTH')['ARR_DELAY'].mean()
+if args.stream:
+    monthly_avg_delay = rollup(cube, 'MONTH')['ARR_DELAY_MEAN']
+else:
+    monthly_avg_delay = df.groupby('MONTH')['ARR_DELAY'].mean()
 plt.figure(figsize=(10, 5))
 plt.plot(monthly_avg_delay, marker='o')
 plt.title("Average Arrival Delay by Month")
@@ -88,13 +159,19 @@ print("Chart displayed: Average Arrival Delay by Month.")
 
 # Most delayed routes
 print("\nGenerating Top 10 Most Delayed Routes chart...")
-# Fix: Corrected column names to 'ORIGIN' and 'DEST'
-df['ROUTE'] = df['ORIGIN'] + "-" + df['DEST']
-# Fix: Corrected column name to 'ARR_DELAY'
-route_delays = df.groupby('ROUTE')['ARR_DELAY'].mean().sort_values(ascending=False).head(10)
+if args.stream:
+    # ROUTE was derived per chunk by clean_flights
+    route_delays = rollup(cube, 'ROUTE')
+else:
+    # Fix: Corrected column names to 'ORIGIN' and 'DEST'
+    df['ROUTE'] = df['ORIGIN'] + "-" + df['DEST']
+    # Fix: Corrected column name to 'ARR_DELAY'
+    route_delays = summarize(group_stats(df, 'ROUTE', 'ARR_DELAY')).add_prefix('ARR_DELAY_')
+route_delays = route_delays.sort_values('ARR_DELAY_MEAN', ascending=False).head(10)
 
 plt.figure(figsize=(10, 6))
-sns.barplot(x=route_delays.values, y=route_delays.index, hue=route_delays.index, legend=False)
+ci_barplot(route_delays['ARR_DELAY_MEAN'], route_delays['ARR_DELAY_CI_LOW'], route_delays['ARR_DELAY_CI_HIGH'],
+           orient='h', hue=route_delays.index, legend=False)
 plt.title("Top 10 Most Delayed Routes")
 plt.xlabel("Avg Arrival Delay")
 plt.tight_layout()
@@ -104,8 +181,13 @@ print("Chart displayed: Top 10 Most Delayed Routes.")
 # Delay distribution
 print("\nGenerating Arrival Delay Distribution histogram...")
 plt.figure(figsize=(10, 5))
-# Fix: Corrected column name to 'ARR_DELAY'
-sns.histplot(df['ARR_DELAY'], bins=100, kde=True)
+if args.stream:
+    # Same 100 bins from the (value, count) pairs; the KDE bandwidth matches the raw rows
+    sns.histplot(x=delay_hist['ARR_DELAY'], weights=delay_hist['COUNT'], bins=100, kde=True,
+                 kde_kws={'bw_method': weighted_kde_factor(delay_hist['COUNT'])})
+else:
+    # Fix: Corrected column name to 'ARR_DELAY'
+    sns.histplot(df['ARR_DELAY'], bins=100, kde=True)
 plt.title("Arrival Delay Distribution")
 plt.xlabel("Arrival Delay (minutes)")
 plt.ylabel("Frequency")
@@ -115,4 +197,3 @@ plt.show()
 print("Chart displayed: Arrival Delay Distribution.")
 
 print("\nFlight Delay EDA completed.")
-
@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+from ipl_store import MatchStore, PlayerStats, content_hash, fall_of_wickets, load_upload, over_summary
 
 # Set Seaborn style
 sns.set(style="darkgrid")
@@ -9,6 +9,57 @@ sns.set(style="darkgrid")
 # Title
 st.title("IPL Cricket EDA Dashboard")
 
+def upload_digest(upload):
+    """
+    Content hash of an uploaded file, computed once per upload rather than on every rerun.
+    """
+    digests = st.session_state.setdefault('upload_digests', {})
+    if upload.file_id not in digests:
+        digests[upload.file_id] = content_hash(upload.getvalue())
+    return digests[upload.file_id]
+
+# Keyed by content hash: reruns, other sessions and re-uploads of the same file share one
+# parsed copy. The upload itself (leading underscore) is not hashed by Streamlit.
+@st.cache_resource(max_entries=8)
+def load_table(kind, digest, _upload):
+    """
+    Parses and cleans an uploaded table, or reads it from the on-disk Parquet cache.
+    """
+    return load_upload(_upload.getvalue(), kind, digest)
+
+# The most recent player aggregates; the next dataset version starts from them
+@st.cache_resource
+def player_stats_base():
+    """
+    Holds the player aggregates of the last dataset version loaded in any session.
+    """
+    return {'stats': PlayerStats()}
+
+@st.cache_resource(max_entries=8)
+def load_player_stats(matches_digest, deliveries_digest, _matches, _deliveries):
+    """
+    Player aggregates for one dataset version. Seasons unchanged since the
+    previous version are reused, so appending a season aggregates only it.
+    """
+    base = player_stats_base()
+    base['stats'] = base['stats'].updated(_deliveries, _matches)
+    return base['stats']
+
+@st.cache_resource(max_entries=4)
+def load_match_store(deliveries_digest, _deliveries):
+    """
+    Sorts the deliveries by match, inning, over and ball once per Deliveries file.
+    """
+    return MatchStore(_deliveries)
+
+@st.cache_data(max_entries=256)
+def match_drilldown(deliveries_digest, match_id):
+    """
+    Per-over summary and fall of wickets of one match, read from its slice of the match store.
+    """
+    balls = match_store.slice(match_id)
+    return over_summary(balls), fall_of_wickets(balls)
+
 # Upload datasets
 st.sidebar.header("Upload Datasets")
 Matches_file = st.sidebar.file_uploader("Upload Matches.csv", type=["csv"])
@@ -16,18 +67,15 @@ Deliveries_file = st.sidebar.file_uploader("Upload Deliveries.csv", type=["csv"]
 
 # Fix: Changed variable names in the if condition to match the defined variables
 if Matches_file is not None and Deliveries_file is not None:
-    Matches = pd.read_csv(Matches_file)
-    Deliveries = pd.read_csv(Deliveries_file)
-
-    # Clean matches data
-    Matches['winner'].fillna('No Result', inplace=True)
-    if 'umpire3' in Matches.columns:
-        Matches.drop(['umpire3'], axis=1, inplace=True)
+    # Cleaned once per distinct file (missing winners filled, umpire3 dropped); shared, so never modified here
+    Matches = load_table('matches', upload_digest(Matches_file), Matches_file)
+    Deliveries = load_table('deliveries', upload_digest(Deliveries_file), Deliveries_file)
 
     st.sidebar.success("Datasets loaded successfully!")
 
     # Tabs for navigation
-    tab1, tab2, tab3, tab4 = st.tabs(["Team Wins", " Toss Analysis", "Player Stats", " Season Insights"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Team Wins", " Toss Analysis", "Player Stats", " Season Insights",
+                                             "Match Drilldown"])
 
     with tab1:
         st.subheader("Most Matches Won by Teams")
@@ -70,24 +118,30 @@ if Matches_file is not None and Deliveries_file is not None:
             st.pyplot(fig4)
 
     with tab3:
+        player_stats = load_player_stats(upload_digest(Matches_file), upload_digest(Deliveries_file),
+                                         Matches, Deliveries)
+        seasons = sorted(player_stats.seasons)
+        selected_season = st.selectbox("Season", ["All Seasons"] + seasons)
+        players = player_stats.table(None if selected_season == "All Seasons" else selected_season)
+
         st.subheader("Top 10 Run Scorers")
-        if 'batsman' in Deliveries.columns and 'batsman_runs' in Deliveries.columns:
-            top_scorers = Deliveries.groupby('batsman')['batsman_runs'].sum().sort_values(ascending=False).head(10)
-            fig5, ax5 = plt.subplots(figsize=(10, 5))
-            sns.barplot(x=top_scorers.index, y=top_scorers.values, palette="crest", hue=top_scorers.index, legend=False, ax=ax5)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            st.pyplot(fig5)
+        top_scorers = players['runs'].sort_values(ascending=False).head(10)
+        fig5, ax5 = plt.subplots(figsize=(10, 5))
+        sns.barplot(x=top_scorers.index, y=top_scorers.values, palette="crest", hue=top_scorers.index, legend=False, ax=ax5)
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+        st.pyplot(fig5)
 
         st.subheader("Top 10 Wicket Takers")
-        if 'bowler' in Deliveries.columns and 'dismissal_kind' in Deliveries.columns:
-            dismissals = Deliveries[Deliveries['dismissal_kind'].notnull()]
-            top_wickets = dismissals.groupby('bowler').size().sort_values(ascending=False).head(10)
-            fig6, ax6 = plt.subplots(figsize=(10, 5))
-            sns.barplot(x=top_wickets.index, y=top_wickets.values, palette="rocket", hue=top_wickets.index, legend=False, ax=ax6)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            st.pyplot(fig6)
+        top_wickets = players['wickets'].sort_values(ascending=False).head(10)
+        fig6, ax6 = plt.subplots(figsize=(10, 5))
+        sns.barplot(x=top_wickets.index, y=top_wickets.values, palette="rocket", hue=top_wickets.index, legend=False, ax=ax6)
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+        st.pyplot(fig6)
+
+        st.subheader("Player Aggregates")
+        st.dataframe(players.sort_values('runs', ascending=False).round(2))
 
     with tab4:
         st.subheader("Matches Played Per Season")
@@ -98,5 +152,44 @@ if Matches_file is not None and Deliveries_file is not None:
             plt.tight_layout()
             st.pyplot(fig7)
 
+    with tab5:
+        st.subheader("Match Drilldown")
+        match_store = load_match_store(upload_digest(Deliveries_file), Deliveries)
+        selected_season = st.selectbox("Season", sorted(Matches['season'].unique()), key='drilldown_season')
+        season_matches = Matches[Matches['season'] == selected_season]
+        labels = {row.id: f"{row.team1} vs {row.team2} ({row.date})" for row in season_matches.itertuples()}
+        match_id = st.selectbox("Match", list(labels), format_func=labels.get)
+        overs, wickets = match_drilldown(upload_digest(Deliveries_file), match_id)
+
+        if overs.empty:
+            st.info("No ball-by-ball data for this match.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("Run-Rate Worm")
+                fig8, ax8 = plt.subplots(figsize=(10, 5))
+                for inning, inning_overs in overs.groupby('inning'):
+                    ax8.plot(inning_overs['over'], inning_overs['score'], marker='o', markersize=3, label=f"Inning {inning}")
+                    fallen = inning_overs[inning_overs['wickets'] > 0]
+                    ax8.scatter(fallen['over'], fallen['score'], color='red', zorder=3)
+                plt.xlabel("Over")
+                plt.ylabel("Runs")
+                plt.legend()
+                plt.tight_layout()
+                st.pyplot(fig8)
+
+            with col2:
+                st.subheader("Manhattan")
+                fig9, ax9 = plt.subplots(figsize=(10, 5))
+                sns.barplot(x=overs['over'], y=overs['runs'], hue=overs['inning'].astype(str), errorbar=None, ax=ax9)
+                plt.xlabel("Over")
+                plt.ylabel("Runs in Over")
+                plt.legend(title="Inning")
+                plt.tight_layout()
+                st.pyplot(fig9)
+
+            st.subheader("Fall of Wickets")
+            st.dataframe(wickets, hide_index=True)
+
 else:
     st.info("Please upload both Matches.csv and Deliveries.csv files from the IPL Kaggle dataset.")
@@ -0,0 +1,289 @@
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+# pyarrow is the Parquet engine behind the upload cache. Without it uploads
+# are still cached in memory by the dashboard, just not across restarts.
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+# Bump when the cleaning steps or stored dtypes change so old caches are rebuilt
+CACHE_VERSION = 1
+
+# Parsed uploads are stored here, one Parquet file per table and content hash
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+# Low-cardinality text columns, stored as dictionary-encoded categoricals. Team
+# columns of Matches stay plain text so they can be compared with each other.
+MATCH_CATEGORICAL_COLUMNS = ['city', 'toss_decision', 'result', 'venue', 'umpire1', 'umpire2']
+DELIVERY_CATEGORICAL_COLUMNS = [
+    'batting_team', 'bowling_team', 'batsman', 'non_striker', 'bowler',
+    'player_dismissed', 'dismissal_kind', 'fielder',
+]
+
+
+def content_hash(data):
+    """
+    Returns the SHA-256 digest of an uploaded file's bytes.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def clean_matches(matches):
+    """
+    Fills missing winners with 'No Result' and drops the mostly empty
+    umpire3 column. Returns a new frame; the input is left untouched.
+    """
+    matches = matches.assign(winner=matches['winner'].fillna('No Result'))
+    return matches.drop(columns=['umpire3'], errors='ignore')
+
+
+def compact(df, categorical_columns):
+    """
+    Stores the given text columns as categoricals and downcasts integer
+    columns to the smallest type that holds them.
+    """
+    df = df.copy()
+    for col in categorical_columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def parse_matches(data):
+    """
+    Parses and cleans the bytes of Matches.csv.
+    """
+    matches = clean_matches(pd.read_csv(io.BytesIO(data)))
+    return compact(matches, MATCH_CATEGORICAL_COLUMNS)
+
+
+def parse_deliveries(data):
+    """
+    Parses the bytes of Deliveries.csv, reading the text columns straight into categoricals.
+    """
+    header = pd.read_csv(io.BytesIO(data), nrows=0).columns
+    dtype = {col: 'category' for col in DELIVERY_CATEGORICAL_COLUMNS if col in header}
+    return compact(pd.read_csv(io.BytesIO(data), dtype=dtype), [])
+
+
+PARSERS = {'matches': parse_matches, 'deliveries': parse_deliveries}
+
+
+def cache_path(kind, digest, cache_dir=None):
+    """
+    Returns the Parquet path of a cached table for a given content hash.
+    """
+    return os.path.join(cache_dir or CACHE_DIR, f"{kind}-v{CACHE_VERSION}-{digest}.parquet")
+
+
+def load_upload(data, kind, digest=None, cache_dir=None, use_cache=True):
+    """
+    Returns the parsed and cleaned 'matches' or 'deliveries' table for the
+    bytes of an uploaded CSV. Tables are stored as Parquet under the hash of
+    the file content, so uploading the same file again, from any session or
+    after a restart, reads the columnar copy instead of parsing the CSV.
+    """
+    digest = digest or content_hash(data)
+    path = cache_path(kind, digest, cache_dir)
+    use_cache = use_cache and HAVE_PYARROW
+    if use_cache and os.path.exists(path):
+        return pd.read_parquet(path)
+
+    df = PARSERS[kind](data)
+    if use_cache:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary name first so a crash never leaves a truncated cache
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    return df
+
+
+# Dismissals credited to the bowler; run outs and the like are not bowling wickets
+BOWLER_WICKETS = ['bowled', 'caught', 'caught and bowled', 'lbw', 'stumped', 'hit wicket']
+
+# Additive per-(season, player) measures; rates are derived from them on demand
+PLAYER_MEASURES = [
+    'runs', 'balls_faced', 'fours', 'sixes', 'dots_faced',
+    'wickets', 'balls_bowled', 'runs_conceded', 'dots_bowled',
+]
+
+
+def player_totals(deliveries):
+    """
+    Sums the PLAYER_MEASURES per player over a set of deliveries. Wides do
+    not count as balls faced, wides and no-balls not as balls bowled, and
+    byes and leg byes are not charged to the bowler. Super overs are left out.
+    """
+    if 'is_super_over' in deliveries.columns:
+        deliveries = deliveries[deliveries['is_super_over'] == 0]
+    runs = deliveries['batsman_runs'].to_numpy()
+    faced = (deliveries['wide_runs'] == 0).to_numpy()
+    legal = faced & (deliveries['noball_runs'] == 0).to_numpy()
+    total = deliveries['total_runs'].to_numpy()
+    batting = pd.DataFrame({
+        'player': deliveries['batsman'].astype(str).to_numpy(),
+        'runs': runs,
+        'balls_faced': faced,
+        'fours': runs == 4,
+        'sixes': runs == 6,
+        'dots_faced': faced & (runs == 0),
+    }).groupby('player').sum()
+    bowling = pd.DataFrame({
+        'player': deliveries['bowler'].astype(str).to_numpy(),
+        'wickets': deliveries['dismissal_kind'].isin(BOWLER_WICKETS).to_numpy(),
+        'balls_bowled': legal,
+        'runs_conceded': total - deliveries['bye_runs'].to_numpy() - deliveries['legbye_runs'].to_numpy(),
+        'dots_bowled': legal & (total == 0),
+    }).groupby('player').sum()
+    totals = batting.join(bowling, how='outer').fillna(0)
+    return totals[PLAYER_MEASURES].astype('int64')
+
+
+def derive_rates(totals):
+    """
+    Adds strike rate, economy and dot-ball percentages to a table of PLAYER_MEASURES.
+    """
+    totals = totals.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        totals['strike_rate'] = totals['runs'] / totals['balls_faced'] * 100
+        totals['dot_pct_batting'] = totals['dots_faced'] / totals['balls_faced'] * 100
+        totals['economy'] = totals['runs_conceded'] / totals['balls_bowled'] * 6
+        totals['dot_pct_bowling'] = totals['dots_bowled'] / totals['balls_bowled'] * 100
+    return totals.replace([np.inf, -np.inf], np.nan)
+
+
+def season_signatures(deliveries, matches):
+    """
+    Fingerprints each season by its match ids and the content of its
+    deliveries: one hash per delivery row (a single vectorized pass with
+    pd.util.hash_pandas_object), combined per season in file order. A
+    corrected run, dismissal or player name changes its season's signature.
+    """
+    season_of = pd.Series(matches['season'].to_numpy(np.float64), index=matches['id'].to_numpy(np.int64))
+    row_seasons = deliveries['match_id'].map(season_of).to_numpy(np.float64)
+    row_hashes = pd.util.hash_pandas_object(deliveries, index=False).to_numpy()
+    order = np.argsort(row_seasons, kind='stable')
+    row_seasons, row_hashes = row_seasons[order], row_hashes[order]
+    signatures = {}
+    for season, ids in matches.groupby('season')['id']:
+        ids = np.sort(ids.to_numpy(np.int64))
+        first, last = np.searchsorted(row_seasons, season, 'left'), np.searchsorted(row_seasons, season, 'right')
+        signatures[int(season)] = hashlib.sha256(ids.tobytes() + row_hashes[first:last].tobytes()).hexdigest()
+    return signatures
+
+
+class PlayerStats:
+    """
+    Per-season player aggregates. Each season's PLAYER_MEASURES are kept as
+    their own table, so updated() only aggregates the seasons that are new or
+    whose matches or deliveries changed, and reuses the tables of all
+    other seasons. Career figures are sums of the season tables.
+    """
+
+    def __init__(self, seasons=None, signatures=None):
+        self.seasons = dict(seasons or {})
+        self.signatures = dict(signatures or {})
+
+    def updated(self, deliveries, matches):
+        """
+        Returns a PlayerStats for the given data, re-aggregating only the
+        seasons whose signature changed. The current object is not modified.
+        """
+        signatures = season_signatures(deliveries, matches)
+        stale = [season for season, signature in signatures.items() if self.signatures.get(season) != signature]
+        seasons = {season: self.seasons[season] for season in signatures if season not in stale}
+        if stale:
+            stale_ids = matches.loc[matches['season'].isin(stale), ['id', 'season']]
+            rows = deliveries[deliveries['match_id'].isin(stale_ids['id'])]
+            season_of = pd.Series(stale_ids['season'].to_numpy(), index=stale_ids['id'].to_numpy())
+            for season, season_rows in rows.groupby(rows['match_id'].map(season_of)):
+                seasons[int(season)] = player_totals(season_rows)
+            for season in stale:
+                seasons.setdefault(season, player_totals(rows.iloc[:0]))
+        return PlayerStats(seasons, signatures)
+
+    def table(self, season=None):
+        """
+        Player aggregates with derived rates for one season, or career totals
+        over all seasons when season is None.
+        """
+        if season is not None:
+            return derive_rates(self.seasons[season])
+        if not self.seasons:
+            return derive_rates(pd.DataFrame(columns=PLAYER_MEASURES, dtype='int64'))
+        totals = pd.concat(self.seasons.values()).groupby(level=0).sum()
+        return derive_rates(totals)
+
+
+# Ball-by-ball sort order of the match store
+BALL_ORDER = ['match_id', 'inning', 'over', 'ball']
+
+
+class MatchStore:
+    """
+    Deliveries sorted by match, inning, over and ball, with an offsets table
+    over the sorted match ids, so the deliveries of any match are one
+    contiguous slice found with a binary search.
+    """
+
+    def __init__(self, deliveries):
+        order = np.lexsort([deliveries[col].to_numpy() for col in reversed(BALL_ORDER)])
+        self.deliveries = deliveries.take(order).reset_index(drop=True)
+        match_ids = self.deliveries['match_id'].to_numpy(np.int64)
+        self.match_ids, starts = np.unique(match_ids, return_index=True)
+        self.offsets = np.append(starts, len(match_ids))
+
+    def __len__(self):
+        return len(self.match_ids)
+
+    def slice(self, match_id):
+        """
+        Returns the deliveries of one match in playing order as a view into the store.
+        """
+        i = np.searchsorted(self.match_ids, match_id)
+        if i == len(self.match_ids) or self.match_ids[i] != match_id:
+            return self.deliveries.iloc[:0]
+        return self.deliveries.iloc[self.offsets[i]:self.offsets[i + 1]]
+
+
+def over_summary(balls):
+    """
+    Runs and wickets per over of each inning of one match, with the running
+    score and run rate: the data behind the worm and manhattan charts.
+    """
+    summary = (balls.assign(wicket=balls['player_dismissed'].notna())
+               .groupby(['inning', 'over'], observed=True)
+               .agg(runs=('total_runs', 'sum'), wickets=('wicket', 'sum'))
+               .reset_index())
+    summary['score'] = summary.groupby('inning')['runs'].cumsum()
+    summary['run_rate'] = summary['score'] / summary['over']
+    return summary
+
+
+def fall_of_wickets(balls):
+    """
+    One row per dismissal of one match: inning, wicket number, the score at
+    the fall, the over and ball it fell on, and the batsman out.
+    """
+    score = balls.groupby('inning')['total_runs'].cumsum()
+    fallen = balls['player_dismissed'].notna()
+    wickets = pd.DataFrame({
+        'inning': balls['inning'][fallen],
+        'score': score[fallen],
+        # Overs are numbered from 1 in the data; scorecards write the 2nd ball of the 1st over as 0.2
+        'over': (balls['over'][fallen] - 1).astype(str) + '.' + balls['ball'][fallen].astype(str),
+        'batsman': balls['player_dismissed'][fallen].astype(str),
+        'dismissal_kind': balls['dismissal_kind'][fallen].astype(str),
+    })
+    wickets.insert(1, 'wicket', wickets.groupby('inning').cumcount() + 1)
+    return wickets.reset_index(drop=True)
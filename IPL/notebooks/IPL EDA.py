@@ -1,7 +1,14 @@
+import os
+import sys
+
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# ipl_store.py lives one level up, next to the dashboard
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ipl_store import PlayerStats
+
 # Set Seaborn style
 sns.set(style="darkgrid")
 print("Seaborn style set to 'darkgrid'.")
@@ -91,10 +98,15 @@ if 'toss_winner' in matches.columns and 'winner' in matches.columns:
         plt.show()
         print("Displayed: Toss Decision Trends")
 
+# Per-player career aggregates (runs, balls, strike rate, wickets, economy, ...), built once
+print("\nBuilding player aggregates...")
+players = PlayerStats().updated(deliveries, matches).table()
+print(players.sort_values('runs', ascending=False).head(10).round(2))
+
 # 5. Top 10 Run Scorers
 if 'batsman' in deliveries.columns and 'batsman_runs' in deliveries.columns:
     print("\nGenerating Top 10 Run Scorers chart...")
-    top_scorers = deliveries.groupby('batsman')['batsman_runs'].sum().sort_values(ascending=False).head(10)
+    top_scorers = players['runs'].sort_values(ascending=False).head(10)
     plt.figure(figsize=(10, 5))
     # Fix: Added hue=top_scorers.index and legend=False to address FutureWarning
     sns.barplot(x=top_scorers.index, y=top_scorers.values, palette="crest", hue=top_scorers.index, legend=False)
@@ -109,8 +121,8 @@ if 'batsman' in deliveries.columns and 'batsman_runs' in deliveries.columns:
 # 6. Top 10 Wicket Takers
 if 'bowler' in deliveries.columns and 'dismissal_kind' in deliveries.columns:
     print("\nGenerating Top 10 Wicket Takers chart...")
-    dismissals = deliveries[deliveries['dismissal_kind'].notnull()]
-    top_wickets = dismissals.groupby('bowler').size().sort_values(ascending=False).head(10)
+    # Only dismissals credited to the bowler count as wickets (no run outs)
+    top_wickets = players['wickets'].sort_values(ascending=False).head(10)
     plt.figure(figsize=(10, 5))
     # Fix: Added hue=top_wickets.index and legend=False to address FutureWarning
     sns.barplot(x=top_wickets.index, y=top_wickets.values, palette="rocket", hue=top_wickets.index, legend=False)
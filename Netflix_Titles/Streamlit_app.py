@@ -1,32 +1,73 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from eda_common.uniques import on_uniques
+from title_store import load_titles
+
 # Title
 st.title("Netflix Titles EDA Dashboard")
 
-# Load dataset. Reading the cleaned CSV.
-df = pd.read_csv("Netflix_Titles/netflix_titles.csv")
-df.fillna({'country': 'Unknown', 'director': 'Unknown', 'cast': 'Unknown'}, inplace=True)
+DATA_PATH = "Netflix_Titles/netflix_titles.csv"
 
-# Convert dates to datetime objects
-df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-df['year_added'] = df['date_added'].dt.year
-df['month_added'] = df['date_added'].dt.month
-df['genre'] = df['listed_in'].str.split(', ')
+def extract_number(values):
+    """
+    Leading number of each duration string ("90 min", "2 Seasons") as a float.
+    """
+    return values.str.extract(r'(\d+)', expand=False).astype(float)
+
+# cache_resource keeps one copy of the titles and their index across reruns and sessions
+@st.cache_resource
+def load_data():
+    """
+    Loads and cleans the titles, builds the inverted indexes over type,
+    genre, country, cast and director and the type/release year bitmaps,
+    and loads the full-text search index (built and saved under
+    Netflix_Titles/.cache/ the first time).
+    """
+    return load_titles(DATA_PATH)
+
+# Load dataset. Reading the cleaned CSV.
+titles, index, bitmaps, search_index = load_data()
 
 # Sidebar Filter
 st.sidebar.header("Filter")
 selected_type = st.sidebar.selectbox("Content Type", options=["All", "Movie", "TV Show"])
-if selected_type != "All":
-    df = df[df['type'] == selected_type]
+selected_genres = st.sidebar.multiselect("Genre", index['genre'].labels)
+selected_countries = st.sidebar.multiselect("Country", index['country'].labels)
+selected_cast = st.sidebar.multiselect("Cast", index['cast'].labels)
+selected_directors = st.sidebar.multiselect("Director", index['director'].labels)
+min_year, max_year = int(bitmaps.labels['release_year'].min()), int(bitmaps.labels['release_year'].max())
+selected_years = st.sidebar.slider("Release Year", min_year, max_year, (min_year, max_year))
+
+# Any of the selected values within a filter, all filters together: type and release
+# year from their bitmaps, the multi-valued columns from their posting lists
+selection = bitmaps.select({'type': selected_type}, {'release_year': selected_years})
+multi_valued = {'genre': selected_genres, 'country': selected_countries,
+                'cast': selected_cast, 'director': selected_directors}
+if any(multi_valued.values()):
+    selection &= bitmaps.pack(index.match(**multi_valued))
+rows = bitmaps.positions(selection)
+df = titles.iloc[rows]
+st.write(f"Matching titles: {len(df):,}")
+
+# Full-text search over titles and descriptions, ranked by BM25 within the filters above
+query = st.text_input("Search titles and descriptions", placeholder="e.g. korean zombie")
+if query.strip():
+    hits, scores = search_index.search(query, k=20, rows=rows)
+    results = titles.iloc[hits][['title', 'type', 'release_year', 'listed_in', 'description']]
+    st.dataframe(results.assign(score=scores.round(2)), hide_index=True)
+    if not len(hits):
+        st.markdown("_No titles match the search._")
 
 # Genre Plot
 st.subheader(" Top 10 Genres")
-genre_explode = df.explode('genre')
-genre_count = genre_explode['genre'].value_counts().head(10).reset_index()
+genre_count = index['genre'].counts(rows).head(10).reset_index()
 genre_count.columns = ['Genre', 'Count']
 fig1 = px.bar(genre_count, x='Count', y='Genre', orientation='h', title='Top 10 Genres')
 st.plotly_chart(fig1)
@@ -41,7 +82,7 @@ st.plotly_chart(fig2)
 
 # Country-wise
 st.subheader("Top 10 Countries")
-top_countries = df['country'].value_counts().head(10).reset_index()
+top_countries = index['country'].counts(rows).head(10).reset_index()
 top_countries.columns = ['Country', 'Count']
 fig3 = px.bar(top_countries, x='Country', y='Count', title='Top Countries by Content')
 st.plotly_chart(fig3)
@@ -51,12 +92,12 @@ st.subheader("Duration Analysis")
 
 if selected_type == "Movie":
     # Fixed the SyntaxWarning by using a raw string r'(\d+)'
-    df['duration_min'] = df['duration'].str.extract(r'(\d+)').astype(float)
+    df = df.assign(duration_min=on_uniques(df['duration'], extract_number))
     fig4 = px.histogram(df, x='duration_min', nbins=30, title='Movie Duration Distribution')
     st.plotly_chart(fig4)
 elif selected_type == "TV Show":
     # Fixed the SyntaxWarning by using a raw string r'(\d+)'
-    df['num_seasons'] = df['duration'].str.extract(r'(\d+)').astype(float)
+    df = df.assign(num_seasons=on_uniques(df['duration'], extract_number))
     fig5 = px.histogram(df, x='num_seasons', nbins=10, title='TV Show Season Distribution')
     st.plotly_chart(fig5)
 else:
@@ -1,8 +1,14 @@
+import os
+import sys
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import plotly.express as px
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from eda_common.uniques import on_uniques
+
 # Load dataset
 df = pd.read_csv("../netflix_titles.csv")
 
@@ -14,7 +20,8 @@ print(df.info())
 df.fillna({'country': 'Unknown', 'director': 'Unknown', 'cast': 'Unknown'}, inplace=True)
 
 # Convert dates (Fixed)
-df['date_added'] = pd.to_datetime(df['date_added'], format='mixed')
+# Each distinct date string is parsed once and broadcast to its titles
+df['date_added'] = on_uniques(df['date_added'], lambda dates: pd.to_datetime(dates, format='mixed'))
 df['year_added'] = df['date_added'].dt.year
 df['month_added'] = df['date_added'].dt.month
 
@@ -67,7 +74,7 @@ movies = df[df['type'] == 'Movie']
 tv_shows = df[df['type'] == 'TV Show']
 
 # Movie duration (in minutes) (Fixed SettingWithCopyWarning with .loc)
-movies.loc[:, 'duration'] = movies['duration'].str.replace(' min', '').astype(float)
+movies.loc[:, 'duration'] = on_uniques(movies['duration'], lambda durations: durations.str.replace(' min', '').astype(float))
 plt.figure(figsize=(10, 4))
 sns.histplot(movies['duration'].dropna(), bins=30, kde=True)
 plt.title('Movie Duration Distribution')
@@ -77,7 +84,7 @@ plt.show()
 print("Displayed: Movie Duration Distribution") # Added print statement
 
 # TV Show seasons (Fixed SettingWithCopyWarning with .loc)
-tv_shows.loc[:, 'duration'] = tv_shows['duration'].str.replace(' Season', '').str.replace('s', '').astype(float)
+tv_shows.loc[:, 'duration'] = on_uniques(tv_shows['duration'], lambda durations: durations.str.replace(' Season', '').str.replace('s', '').astype(float))
 plt.figure(figsize=(10, 4))
 sns.countplot(data=tv_shows, x='duration', order=tv_shows['duration'].value_counts().index[:10])
 plt.title('TV Show Season Count Distribution')
@@ -0,0 +1,160 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Bump when tokenization or the stored arrays change so old indexes are rebuilt
+INDEX_VERSION = 1
+
+# BM25 parameters: term-frequency saturation and document-length normalization
+K1 = 1.2
+B = 0.75
+
+# Title words count this many times, so a hit in the title outranks one in the description
+TITLE_WEIGHT = 2
+
+# A prefix expands to at most this many vocabulary terms, the most common first
+MAX_PREFIX_TERMS = 20
+
+# Postings are stored best-scoring first; a query reads at most this many per
+# term, which bounds the cost of very common words on large catalogs
+MAX_POSTINGS_PER_TERM = 50_000
+
+TOKEN_PATTERN = r'\w+'
+
+
+def tokenize(text):
+    """
+    Lower-cased word tokens of a query string.
+    """
+    return pd.Series([text]).str.lower().str.findall(TOKEN_PATTERN).iloc[0]
+
+
+class SearchIndex:
+    """
+    BM25-ranked full-text index over titles and descriptions. The vocabulary
+    is kept sorted, so the terms starting with a prefix are one range found
+    with two binary searches. The postings of each term (document ids and
+    their precomputed BM25 term scores) are one slice of flat arrays, sorted
+    by score, so a query only touches the best postings of its own terms.
+    """
+
+    def __init__(self, vocabulary, indptr, docs, impact, n_docs):
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.docs = docs
+        self.impact = impact
+        self.n_docs = int(n_docs)
+
+    @classmethod
+    def build(cls, titles, descriptions):
+        """
+        Tokenizes every title and description and builds the postings with
+        their BM25 term scores.
+        """
+        text = ((titles.fillna('') + ' ') * TITLE_WEIGHT + descriptions.fillna('')).reset_index(drop=True)
+        tokens = text.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        codes, vocabulary = pd.factorize(tokens, sort=True)
+        n_docs = len(text)
+        keys, tf = np.unique(codes.astype(np.int64) * max(n_docs, 1) + tokens.index.to_numpy(np.int64), return_counts=True)
+        terms, docs = keys // max(n_docs, 1), keys % max(n_docs, 1)
+        doc_len = np.bincount(tokens.index.to_numpy(np.int64), minlength=n_docs)
+        doc_freq = np.bincount(terms, minlength=len(vocabulary))
+        idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = K1 * (1 - B + B * doc_len[docs] / max(doc_len.mean(), 1e-9))
+        impact = (idf[terms] * tf * (K1 + 1) / (tf + norm)).astype('float32')
+        # Within each term, best-scoring documents first
+        order = np.lexsort((-impact, terms))
+        indptr = np.searchsorted(terms[order], np.arange(len(vocabulary) + 1))
+        return cls(np.asarray(vocabulary, dtype=str), indptr, docs[order], impact[order], n_docs)
+
+    def save(self, path, source=None):
+        """
+        Writes the index to an .npz file, with the fingerprint of its source file.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, version=INDEX_VERSION, source=np.asarray(source or [], dtype=np.int64),
+                 vocabulary=self.vocabulary, indptr=self.indptr, docs=self.docs, impact=self.impact,
+                 n_docs=self.n_docs)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, source=None):
+        """
+        Reads an index written by save(); returns None if it is missing, from
+        an older version, or was built from a different source file.
+        """
+        try:
+            with np.load(path) as data:
+                if int(data['version']) != INDEX_VERSION or list(data['source']) != list(source or []):
+                    return None
+                return cls(data['vocabulary'], data['indptr'], data['docs'], data['impact'], data['n_docs'])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def expand(self, prefix):
+        """
+        Vocabulary ids of the terms starting with prefix, most common first,
+        plus the prefix itself when it is a term, so a word that begins many
+        more common ones still matches exactly.
+        """
+        lo = np.searchsorted(self.vocabulary, prefix, side='left')
+        hi = np.searchsorted(self.vocabulary, prefix + '\U0010ffff', side='left')
+        ids = np.arange(lo, hi)
+        doc_freq = self.indptr[ids + 1] - self.indptr[ids]
+        top = ids[np.argsort(-doc_freq, kind='stable')[:MAX_PREFIX_TERMS]]
+        # The exact term sorts first among the terms it prefixes
+        if lo < hi and self.vocabulary[lo] == prefix and lo not in top:
+            top = np.append(top, lo)
+        return top
+
+    def term_id(self, term):
+        i = np.searchsorted(self.vocabulary, term)
+        return i if i < len(self.vocabulary) and self.vocabulary[i] == term else None
+
+    def search(self, query, k=20, rows=None, prefix=True):
+        """
+        Returns the positions and BM25 scores of the k best documents for the
+        query, best first. The last query word also matches as a prefix (for
+        search-as-you-type), and rows, if given, restricts the results to
+        those document positions (e.g. a type or release year filter).
+        """
+        words = tokenize(query)
+        if not words:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        term_ids = [self.term_id(word) for word in words[:-1]]
+        last = self.expand(words[-1]) if prefix else [self.term_id(words[-1])]
+        term_ids = {i for i in term_ids + list(last) if i is not None}
+
+        slices = [slice(self.indptr[i], min(self.indptr[i + 1], self.indptr[i] + MAX_POSTINGS_PER_TERM))
+                  for i in term_ids]
+        if not slices:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        docs = np.concatenate([self.docs[s] for s in slices])
+        impact = np.concatenate([self.impact[s] for s in slices])
+        scores = np.bincount(docs, weights=impact, minlength=self.n_docs)
+        candidates = np.flatnonzero(scores) if rows is None else np.asarray(rows)[scores[rows] > 0]
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return top, scores[top]
+
+
+def load_search_index(csv_path, titles, descriptions, cache_dir=None):
+    """
+    Returns the search index for a titles CSV, read from the .cache folder
+    next to it when it was built from the same file (size and modification
+    time), and otherwise built and saved there.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), '.cache')
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    path = os.path.join(cache_dir, stem + '.search.npz')
+    stat = os.stat(csv_path)
+    source = [stat.st_size, stat.st_mtime_ns]
+    index = SearchIndex.load(path, source)
+    if index is None:
+        index = SearchIndex.build(titles, descriptions)
+        index.save(path, source)
+    return index
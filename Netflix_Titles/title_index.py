@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+# Index name -> column holding its comma-separated values
+FIELDS = {
+    'type': 'type',
+    'genre': 'listed_in',
+    'country': 'country',
+    'cast': 'cast',
+    'director': 'director',
+}
+
+
+class InvertedIndex:
+    """
+    Maps each distinct value of a comma-separated column to the sorted
+    positions of the rows that contain it. The postings are stored as flat
+    integer arrays grouped by value (the CSR layout of the row-by-value
+    incidence matrix), so a value's rows are one slice, counts are the
+    slice lengths, and counts over a subset of rows are one bincount.
+    """
+
+    def __init__(self, values, sep=','):
+        values = pd.Series(values).reset_index(drop=True)
+        self.n_rows = len(values)
+        tokens = values.str.split(sep).explode().str.strip()
+        tokens = tokens[tokens.notna() & (tokens != '')]
+        codes, labels = pd.factorize(tokens, sort=True)
+        # One posting per (value, row), ordered by value and then row
+        keys = np.unique(codes.astype(np.int64) * max(self.n_rows, 1) + tokens.index.to_numpy(np.int64))
+        self.labels = pd.Index(labels)
+        self.posting_values = keys // max(self.n_rows, 1)
+        self.posting_rows = keys % max(self.n_rows, 1)
+        self.indptr = np.searchsorted(self.posting_values, np.arange(len(labels) + 1))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def rows(self, *labels):
+        """
+        Sorted positions of the rows containing any of the given values.
+        """
+        slices = []
+        for label in labels:
+            i = self.labels.get_indexer([label])[0]
+            if i >= 0:
+                slices.append(self.posting_rows[self.indptr[i]:self.indptr[i + 1]])
+        if len(slices) == 1:
+            return slices[0]
+        return np.unique(np.concatenate(slices)) if slices else np.empty(0, dtype=np.int64)
+
+    def counts(self, rows=None):
+        """
+        Number of rows per value, over all rows or only the given row positions,
+        sorted from most to least common.
+        """
+        if rows is None:
+            counts = np.diff(self.indptr)
+        else:
+            member = np.zeros(self.n_rows, dtype=bool)
+            member[rows] = True
+            counts = np.bincount(self.posting_values[member[self.posting_rows]], minlength=len(self.labels))
+        counts = pd.Series(counts, index=self.labels, name='count')
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+
+class TitleIndex:
+    """
+    Inverted indexes over the multi-valued columns of the titles table (see
+    FIELDS), built once. Filters are set intersections of posting lists.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.fields = {name: InvertedIndex(df[col]) for name, col in FIELDS.items() if col in df.columns}
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    def match(self, **criteria):
+        """
+        Sorted positions of the rows matching every criterion. Each criterion
+        maps a field to one value or a list of values, any of which may match;
+        empty criteria are ignored. match(country='South Korea',
+        genre='TV Dramas', cast='Lee Min-ho') finds Korean TV dramas with that
+        actor.
+        """
+        rows = np.arange(self.n_rows)
+        for name, labels in criteria.items():
+            if labels is None or (not isinstance(labels, str) and len(labels) == 0):
+                continue
+            labels = [labels] if isinstance(labels, str) else labels
+            rows = np.intersect1d(rows, self.fields[name].rows(*labels), assume_unique=True)
+        return rows
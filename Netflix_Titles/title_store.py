@@ -0,0 +1,27 @@
+import pandas as pd
+
+from eda_common import read_csv_parallel
+from eda_common.bitmaps import BitmapIndex
+from eda_common.uniques import on_uniques
+from search_index import load_search_index
+from title_index import TitleIndex
+
+
+def load_titles(csv_path, cache_dir=None):
+    """
+    Loads and cleans the titles and builds what the dashboard filters and
+    searches with: the inverted indexes over type, genre, country, cast and
+    director, the type/release year bitmaps and the full-text search index
+    (read from cache_dir, the .cache folder next to the CSV by default, and
+    built and saved there the first time). Returns (titles, index, bitmaps,
+    search_index).
+    """
+    df = read_csv_parallel(csv_path)
+    df.fillna({'country': 'Unknown', 'director': 'Unknown', 'cast': 'Unknown'}, inplace=True)
+
+    # Convert dates to datetime objects, parsing each distinct date string once
+    df['date_added'] = on_uniques(df['date_added'], lambda dates: pd.to_datetime(dates, errors='coerce'))
+    df['year_added'] = df['date_added'].dt.year
+    df['month_added'] = df['date_added'].dt.month
+    bitmaps = BitmapIndex(df, ['type', 'release_year'])
+    return df, TitleIndex(df), bitmaps, load_search_index(csv_path, df['title'], df['description'], cache_dir)
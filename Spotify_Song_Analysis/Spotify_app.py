@@ -1,33 +1,51 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from eda_common.density import density_scatter
+from song_store import SimilarityIndex, load_songs
+
 # Set a wide layout and a title for the Streamlit app
 st.set_page_config(layout="wide", page_title="Spotify Data Analysis")
 
 # Set Seaborn style
 sns.set(style="darkgrid")
 
-@st.cache_data
+@st.cache_resource
 def load_data():
     """
     Loads the Spotify dataset and performs necessary data cleaning.
+    Also accumulates the per-(genre, year) feature moments the correlation
+    heatmap is derived from and the genre/year bitmaps behind the sidebar
+    filters, once per process.
     """
     try:
-        df = pd.read_csv("Spotify_Song_Analysis/Spotify.csv")
+        return load_songs("Spotify_Song_Analysis/Spotify.csv")
     except FileNotFoundError:
         st.error("Error: 'Spotify.csv' not found. Please ensure the file is in the same directory.")
-        return None
-    
-    # Drop duplicates or nulls if any
-    df.dropna(inplace=True)
-    df.drop_duplicates(inplace=True)
-    
-    return df
+        return None, None, None
 
 # Load the data using the cached function
-df = load_data()
+df, moments, bitmaps = load_data()
+
+@st.cache_resource
+def load_similarity_index():
+    """
+    Builds the nearest-neighbour index over the standardized audio features once per process.
+    """
+    return SimilarityIndex.build(df)
+
+@st.cache_data(max_entries=64)
+def find_tracks(query, limit=50):
+    """
+    Row positions of the first songs whose title or artist contains the query.
+    """
+    text = df['track_name'].astype(str) + " - " + df['artist_name'].astype(str)
+    return text.str.contains(query, case=False, regex=False).to_numpy().nonzero()[0][:limit]
 
 # App title and introduction
 st.title("Spotify Data Analysis Dashboard")
@@ -36,19 +54,25 @@ st.markdown("An interactive dashboard to explore music features and popularity."
 if df is not None:
     # Sidebar for filters
     st.sidebar.header("Filters")
-    selected_genre = st.sidebar.selectbox("Select a Genre", ["All"] + sorted(df['genre'].unique()))
+    selected_genres = st.sidebar.multiselect("Select Genres", list(bitmaps.labels['genre']), placeholder="All")
+    year_range = None
+    ranges = {}
+    if 'year' in df.columns:
+        first_year, last_year = int(bitmaps.labels['year'].min()), int(bitmaps.labels['year'].max())
+        year_range = st.sidebar.slider("Release Year", first_year, last_year, (first_year, last_year))
+        ranges['year'] = year_range
     
-    # Filter data based on sidebar selection
-    filtered_df = df
-    if selected_genre != "All":
-        filtered_df = df[df['genre'] == selected_genre]
+    # Filter data based on sidebar selection: OR the genre bitmaps, AND the year range,
+    # then take only the columns the charts plot (at most those four columns are copied per rerun)
+    selection = bitmaps.select({'genre': selected_genres}, ranges)
+    filtered_df = df[['genre', 'popularity', 'tempo', 'energy']].iloc[bitmaps.rows(selection)]
 
     # Display basic info
-    st.write(f"Displaying data for: **{selected_genre}** genre.")
-    st.write(f"Number of songs: {len(filtered_df)}")
+    st.write(f"Displaying data for: **{', '.join(selected_genres) or 'All'}** genre.")
+    st.write(f"Number of songs: {bitmaps.count(selection)}")
     
     # Tabs for navigation
-    tab1, tab2 = st.tabs(["Overview & Correlation", "Feature Distribution"])
+    tab1, tab2, tab3 = st.tabs(["Overview & Correlation", "Feature Distribution", "Similar Songs"])
 
     with tab1:
         st.header("Overview and Correlation Analysis")
@@ -56,8 +80,8 @@ if df is not None:
         
         with col1:
             st.subheader("Correlation Matrix")
-            # Calculate correlation for the filtered data
-            corr = filtered_df[['popularity', 'tempo', 'energy', 'valence', 'loudness', 'danceability']].corr()
+            # Correlation of the filtered data, merged from the precomputed per-(genre, year) moments
+            corr = moments.corr(selected_genres, year_range)
             fig, ax = plt.subplots(figsize=(10, 8))
             sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax)
             st.pyplot(fig)
@@ -89,3 +113,37 @@ if df is not None:
             sns.histplot(filtered_df['energy'], bins=50, kde=True, color='orange', ax=ax4)
             plt.xlabel("Energy")
             st.pyplot(fig4)
+
+        # Every filtered song is binned into a grid and drawn as one image, so no sampling is needed
+        st.subheader("Features vs Popularity")
+        by_genre = st.checkbox("Color by genre", value=True)
+        col1, col2 = st.columns(2)
+        for col, feature in zip((col1, col2), ('tempo', 'energy')):
+            with col:
+                fig5, ax5 = plt.subplots(figsize=(10, 6))
+                density_scatter(filtered_df[feature], filtered_df['popularity'],
+                                hue=filtered_df['genre'] if by_genre else None, ax=ax5)
+                if by_genre:
+                    ax5.legend(title='Genre', bbox_to_anchor=(1.05, 1), loc='upper left')
+                plt.title(f"{feature.capitalize()} vs Popularity")
+                plt.xlabel(feature.capitalize())
+                plt.ylabel("Popularity")
+                st.pyplot(fig5)
+
+    with tab3:
+        st.header("Similar Songs")
+        st.markdown("Find the songs closest to a track across all genres, by its standardized audio features.")
+        query = st.text_input("Search for a song or artist")
+        if query:
+            matches = find_tracks(query)
+            if len(matches) == 0:
+                st.info("No songs match that search.")
+            else:
+                position = st.selectbox("Song", matches, format_func=lambda i: (
+                    f"{df['track_name'].iat[i]} - {df['artist_name'].iat[i]} ({df['genre'].iat[i]})"))
+                k = st.slider("Number of similar songs", 5, 50, 10)
+                index = load_similarity_index()
+                positions, distances = index.similar(position, k)
+                similar = df.iloc[positions][['track_name', 'artist_name', 'genre'] + index.features].copy()
+                similar.insert(0, 'distance', distances)
+                st.dataframe(similar.reset_index(drop=True))
@@ -1,7 +1,14 @@
+import os
+import sys
+
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from eda_common.density import density_scatter
+
 # Load dataset
 print("Loading dataset 'Spotify.csv'...")
 try:
@@ -45,8 +52,8 @@ print("Displayed: Top 10 Genres by Average Popularity chart.")
 # Tempo vs Popularity
 print("\nGenerating Tempo vs Popularity scatter plot...")
 plt.figure(figsize=(12, 6))
-# Using a sample of the data for faster plotting with matplotlib
-sns.scatterplot(data=df.sample(n=1000, random_state=1), x='tempo', y='popularity', hue='genre', s=20)
+# Every song, binned into a grid and drawn as one image colored by the genre mix of each cell
+density_scatter(df['tempo'], df['popularity'], hue=df['genre'])
 plt.title("Tempo vs Popularity")
 plt.xlabel("Tempo")
 plt.ylabel("Popularity")
@@ -58,8 +65,8 @@ print("Displayed: Tempo vs Popularity scatter plot.")
 # Energy vs Popularity
 print("\nGenerating Energy vs Popularity scatter plot...")
 plt.figure(figsize=(12, 6))
-# Using a sample of the data for faster plotting with matplotlib
-sns.scatterplot(data=df.sample(n=1000, random_state=1), x='energy', y='popularity', hue='genre', s=20)
+# Every song, binned into a grid and drawn as one image colored by the genre mix of each cell
+density_scatter(df['energy'], df['popularity'], hue=df['genre'])
 plt.title("Energy vs Popularity")
 plt.xlabel("Energy")
 plt.ylabel("Popularity")
@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+
+from eda_common.bitmaps import BitmapIndex
+
+# Audio features shown in the correlation heatmap
+CORR_FEATURES = ['popularity', 'tempo', 'energy', 'valence', 'loudness', 'danceability']
+
+
+class FeatureMoments:
+    """
+    Count, sum and cross-product matrix of a set of features per (genre,
+    year) bucket, accumulated in one vectorized pass. The statistics are
+    additive, so the covariance or correlation of any set of genres and
+    years is derived from the bucket sums in O(features^2) without touching
+    the rows, and moments built from separate pieces of data can be merged.
+
+    Features are shifted by a reference mean before accumulating so the
+    cross products stay well conditioned.
+    """
+
+    def __init__(self, keys, count, sums, cross, shift, features):
+        self.keys = keys
+        self.count = count
+        self.sums = sums
+        self.cross = cross
+        self.shift = shift
+        self.features = list(features)
+
+    @classmethod
+    def build(cls, df, features=CORR_FEATURES, by=('genre', 'year'), shift=None):
+        """
+        Accumulates the moments of df[features] per combination of the by columns.
+        """
+        by = [col for col in by if col in df.columns]
+        values = df[features].to_numpy(dtype='float64')
+        shift = values.mean(axis=0) if shift is None else np.asarray(shift, dtype='float64')
+        values = values - shift
+        if by:
+            codes, keys = pd.MultiIndex.from_frame(df[by]).factorize()
+            keys = keys.to_frame(index=False, name=by)
+        else:
+            codes, keys = np.zeros(len(df), dtype=np.int64), pd.DataFrame(index=[0])
+        n_buckets, n_features = len(keys), len(features)
+        count = np.bincount(codes, minlength=n_buckets).astype('float64')
+        sums = np.column_stack([np.bincount(codes, weights=values[:, i], minlength=n_buckets)
+                                for i in range(n_features)])
+        cross = np.empty((n_buckets, n_features, n_features))
+        for i in range(n_features):
+            for j in range(i, n_features):
+                cross[:, i, j] = cross[:, j, i] = np.bincount(
+                    codes, weights=values[:, i] * values[:, j], minlength=n_buckets)
+        return cls(keys, count, sums, cross, shift, features)
+
+    def _reshift(self, shift):
+        # Moments about the new shift: x - new = (x - old) + delta
+        delta = self.shift - shift
+        sums = self.sums + self.count[:, None] * delta
+        cross = (self.cross + self.sums[:, :, None] * delta[None, None, :]
+                 + delta[None, :, None] * self.sums[:, None, :]
+                 + self.count[:, None, None] * np.outer(delta, delta))
+        return sums, cross
+
+    def merge(self, other):
+        """
+        Combines the moments of two disjoint sets of rows, adding the
+        statistics of buckets present in both.
+        """
+        other_sums, other_cross = other._reshift(self.shift)
+        keys = pd.concat([self.keys, other.keys], ignore_index=True)
+        if len(keys.columns):
+            codes, unique = pd.MultiIndex.from_frame(keys).factorize()
+            merged_keys = unique.to_frame(index=False, name=list(keys.columns))
+        else:
+            codes, merged_keys = np.zeros(len(keys), dtype=np.int64), pd.DataFrame(index=[0])
+        n = len(merged_keys)
+
+        def add(a, b):
+            stacked = np.concatenate([a, b])
+            out = np.zeros((n,) + stacked.shape[1:])
+            np.add.at(out, codes, stacked)
+            return out
+
+        return FeatureMoments(merged_keys, add(self.count, other.count), add(self.sums, other_sums),
+                              add(self.cross, other_cross), self.shift, self.features)
+
+    def _mask(self, genres=None, years=None):
+        mask = np.ones(len(self.keys), dtype=bool)
+        if genres and 'genre' in self.keys.columns:
+            mask &= self.keys['genre'].isin(genres).to_numpy()
+        if years is not None and 'year' in self.keys.columns:
+            mask &= self.keys['year'].between(*years).to_numpy()
+        return mask
+
+    def total(self, genres=None, years=None):
+        """
+        Merged (count, sums, cross products) over the selected genres and an
+        inclusive (first, last) year range; None selects everything.
+        """
+        mask = self._mask(genres, years)
+        return self.count[mask].sum(), self.sums[mask].sum(axis=0), self.cross[mask].sum(axis=0)
+
+    def covariance(self, genres=None, years=None):
+        """
+        Sample covariance matrix of the features over the selection.
+        """
+        n, sums, cross = self.total(genres, years)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (cross - np.outer(sums, sums) / n) / (n - 1)
+        return pd.DataFrame(cov, index=self.features, columns=self.features)
+
+    def corr(self, genres=None, years=None):
+        """
+        Pearson correlation matrix of the features over the selection, as DataFrame.corr() returns it.
+        """
+        cov = self.covariance(genres, years).to_numpy()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.clip(cov / np.outer(std, std), -1, 1)
+        return pd.DataFrame(corr, index=self.features, columns=self.features)
+
+
+# Audio features the similar-songs search compares on (after standardizing)
+SIMILARITY_FEATURES = ['acousticness', 'danceability', 'energy', 'instrumentalness', 'liveness',
+                       'loudness', 'speechiness', 'tempo', 'valence']
+
+# Rows per block when assigning songs to cells, bounding the distance matrix memory
+ASSIGN_BLOCK = 20_000
+
+
+def _nearest_centroid(vectors, centroids):
+    """
+    Index of the closest centroid for each vector, computed blockwise.
+    """
+    c_norm = (centroids ** 2).sum(axis=1)
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        block = vectors[start:start + ASSIGN_BLOCK]
+        labels[start:start + ASSIGN_BLOCK] = np.argmin(c_norm - 2 * block @ centroids.T, axis=1)
+    return labels
+
+
+class SimilarityIndex:
+    """
+    Partitioned flat index over standardized audio features. The songs are
+    clustered into about sqrt(n) cells with k-means and stored grouped by
+    cell, so a query computes exact distances only for the songs in the few
+    cells whose centroids are closest to it instead of the whole catalog.
+    """
+
+    def __init__(self, mean, scale, centroids, positions, indptr, vectors, features):
+        self.mean = mean
+        self.scale = scale
+        self.centroids = centroids
+        self.positions = positions
+        self.indptr = indptr
+        self.vectors = vectors
+        self.features = list(features)
+        # Slot of each row position in the cell-ordered arrays
+        self.slots = np.empty_like(positions)
+        self.slots[positions] = np.arange(len(positions))
+
+    @classmethod
+    def build(cls, df, features=None, n_cells=None, n_iter=10, sample_size=50_000, seed=0):
+        """
+        Standardizes the features of every row and partitions them with
+        k-means, trained on a random sample of the rows.
+        """
+        if features is None:
+            features = [col for col in SIMILARITY_FEATURES if col in df.columns]
+        values = df[features].to_numpy(dtype='float64')
+        mean, scale = values.mean(axis=0), values.std(axis=0)
+        scale[scale == 0] = 1
+        vectors = ((values - mean) / scale).astype('float32')
+
+        rng = np.random.default_rng(seed)
+        n_cells = max(1, min(n_cells or int(np.sqrt(len(vectors))), len(vectors)))
+        sample = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_cells, replace=False)]
+        for _ in range(n_iter):
+            labels = _nearest_centroid(sample, centroids)
+            counts = np.bincount(labels, minlength=n_cells)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            # Empty cells keep their previous centroid
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+
+        labels = _nearest_centroid(vectors, centroids)
+        positions = np.argsort(labels, kind='stable')
+        indptr = np.searchsorted(labels[positions], np.arange(n_cells + 1))
+        return cls(mean, scale, centroids, positions, indptr, vectors[positions], features)
+
+    def transform(self, values):
+        """
+        Standardized feature vector(s) of raw feature values.
+        """
+        return ((np.asarray(values, dtype='float64') - self.mean) / self.scale).astype('float32')
+
+    def query(self, vector, k=10, n_probe=8, exclude=None):
+        """
+        Row positions and Euclidean distances of the k songs closest to a
+        standardized feature vector, closest first, searching the n_probe
+        nearest cells. exclude drops one row position (the query song).
+        """
+        cell_dist = ((self.centroids - vector) ** 2).sum(axis=1)
+        n_probe = min(n_probe, len(self.centroids))
+        cells = np.argpartition(cell_dist, n_probe - 1)[:n_probe]
+        slots = np.concatenate([np.arange(self.indptr[c], self.indptr[c + 1]) for c in cells])
+        dist = ((self.vectors[slots] - vector) ** 2).sum(axis=1)
+        positions = self.positions[slots]
+        if exclude is not None:
+            keep = positions != exclude
+            positions, dist = positions[keep], dist[keep]
+        if len(dist) > k:
+            top = np.argpartition(dist, k - 1)[:k]
+            positions, dist = positions[top], dist[top]
+        order = np.argsort(dist, kind='stable')
+        return positions[order], np.sqrt(dist[order])
+
+    def similar(self, position, k=10, n_probe=8):
+        """
+        The k songs most similar to the song at a row position, excluding itself.
+        """
+        return self.query(self.vectors[self.slots[position]], k, n_probe, exclude=position)
+
+
+def load_songs(csv_path):
+    """
+    Loads the songs without missing values or duplicate rows, accumulates
+    the per-(genre, year) moments of CORR_FEATURES the correlation heatmap
+    is derived from, and builds the genre/year bitmaps behind the sidebar
+    filters. Returns (songs, moments, bitmaps).
+    """
+    df = pd.read_csv(csv_path)
+
+    # Drop duplicates or nulls if any
+    df.dropna(inplace=True)
+    df.drop_duplicates(inplace=True)
+
+    filter_columns = [col for col in ('genre', 'year') if col in df.columns]
+    return df, FeatureMoments.build(df, CORR_FEATURES), BitmapIndex(df, filter_columns)
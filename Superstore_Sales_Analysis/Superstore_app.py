@@ -1,42 +1,83 @@
+import calendar
+import os
+import sys
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sales_store import HIERARCHIES, SLICERS, TIME_LEVELS, TIME_SPLITS, OrderStore
+
 # Set a wide layout and a title for the Streamlit app
 st.set_page_config(layout="wide", page_title="Superstore Sales Analysis")
 
-@st.cache_data
+@st.cache_resource
 def load_data():
     """
-    Loads the Superstore dataset, performs necessary data type conversions,
-    and handles caching for improved performance.
+    Opens the columnar order store, which is created from the Superstore CSV
+    on first start and afterwards grows by appended batches of new orders.
     """
-    # Load data with 'latin-1' encoding to avoid UnicodeDecodeError
-    df = pd.read_csv("Superstore_Sales_Analysis/Sample Superstore.csv", encoding='latin-1')
-    
-    # Convert 'Order Date' column to datetime objects
-    df['Order Date'] = pd.to_datetime(df['Order Date'])
-    
-    # Extract month and year from the date
-    df['Month'] = df['Order Date'].dt.month_name()
-    df['Year'] = df['Order Date'].dt.year
-    
-    return df
+    return OrderStore.open("Superstore_Sales_Analysis/Sample Superstore.csv")
 
 # Load the data using the cached function
-df = load_data()
+store = load_data()
+
+@st.cache_resource
+def load_cube():
+    """
+    Reads the product, geography and time rollups that every chart and drilldown reads from.
+    The store keeps them up to date, so the order lines themselves are never loaded.
+    """
+    return store.cube()
+
+cube = load_cube()
+
+@st.cache_resource
+def load_pyramid():
+    """
+    Reads the day/week/month/quarter/year sales pyramid the trend chart zooms through.
+    """
+    return store.pyramid()
+
+pyramid = load_pyramid()
+
+# Append a daily batch of new orders; only the batch is parsed and aggregated
+st.sidebar.header("Append Orders")
+new_orders = st.sidebar.file_uploader("New order lines (CSV)", type="csv")
+if new_orders is not None and st.sidebar.button("Append to store"):
+    try:
+        store.append(pd.read_csv(new_orders, encoding='latin-1'))
+    except ValueError as error:
+        st.sidebar.error(f"Batch rejected: {error}")
+    else:
+        load_cube.clear()
+        load_pyramid.clear()
+        cube = load_cube()
+        pyramid = load_pyramid()
+        st.sidebar.success(f"Appended {new_orders.name}; the store now holds {len(store)} order lines.")
+
+def level_label(level, value):
+    """
+    Display label of a hierarchy member (month and quarter numbers are spelled out).
+    """
+    if level == 'Month':
+        return calendar.month_abbr[value]
+    if level == 'Quarter':
+        return f"Q{value}"
+    return str(value)
 
 # App title and introduction
 st.title("Superstore Sales & Profit EDA Dashboard")
 st.markdown("An interactive dashboard to explore sales and profit trends across different categories, regions, and segments.")
 
 # Create tabs for better organization
-tab1, tab2, tab3 = st.tabs(["Sales & Profit Overview", "Trends", "Sub-Category Performance"])
+tab1, tab2, tab3, tab4 = st.tabs(["Sales & Profit Overview", "Trends", "Sub-Category Performance", "Drilldown"])
 
 with tab1:
     st.subheader("Sales and Profit by Category")
-    category_group = df.groupby('Category')[['Sales', 'Profit']].sum().sort_values(by='Sales', ascending=False)
+    category_group = cube.totals('Category')[['Sales', 'Profit']].sort_values(by='Sales', ascending=False)
     
     fig, ax = plt.subplots(figsize=(8, 5))
     category_group.plot(kind='bar', ax=ax)
@@ -45,7 +86,7 @@ with tab1:
     st.pyplot(fig)
 
     st.subheader("Sales & Profit by Customer Segment")
-    seg_perf = df.groupby('Segment')[['Sales', 'Profit']].sum()
+    seg_perf = cube.totals('Segment')[['Sales', 'Profit']]
     
     fig, ax = plt.subplots(figsize=(8, 4))
     seg_perf.plot(kind='bar', ax=ax)
@@ -55,7 +96,7 @@ with tab1:
 
 with tab2:
     st.subheader("Profit by Region")
-    region_profit = df.groupby('Region')['Profit'].sum().sort_values()
+    region_profit = cube.totals('Region')['Profit'].sort_values()
     
     fig, ax = plt.subplots(figsize=(8, 5))
     region_profit.plot(kind='barh', color='skyblue', ax=ax)
@@ -63,22 +104,82 @@ with tab2:
     plt.xlabel("Profit ($)")
     st.pyplot(fig)
     
-    st.subheader("Monthly Sales Trend")
-    monthly_sales = df.groupby(df['Order Date'].dt.to_period('M'))['Sales'].sum()
-    monthly_sales.index = monthly_sales.index.to_timestamp()
+    st.subheader("Sales Trend")
+    # Every granularity and date range is read from the precomputed time pyramid
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        granularity = st.select_slider("Granularity", list(TIME_LEVELS), value='Month')
+    with col2:
+        trend_measure = st.selectbox("Trend measure", ['Sales', 'Profit', 'Quantity'])
+    with col3:
+        split = st.selectbox("Split by", ["None"] + TIME_SPLITS)
+    first_day, last_day = (day.date() for day in pyramid.date_range)
+    start, end = st.slider("Date range", min_value=first_day, max_value=last_day,
+                           value=(first_day, last_day), format="YYYY-MM-DD")
+
+    trend = pyramid.series(granularity, start, end, by=None if split == "None" else split)[trend_measure]
+    if split != "None":
+        trend = trend.unstack(split, fill_value=0)
     
     fig, ax = plt.subplots(figsize=(12, 5))
-    monthly_sales.plot(ax=ax)
-    plt.title("Monthly Sales Trend")
-    plt.ylabel("Sales ($)")
+    trend.plot(ax=ax)
+    plt.title(f"{trend_measure} Trend by {granularity}")
+    plt.ylabel(trend_measure + (" ($)" if trend_measure != 'Quantity' else ""))
+    plt.xlabel("Order Date")
     st.pyplot(fig)
 
 with tab3:
     st.subheader("Profit by Sub-Category")
-    subcat = df.groupby('Sub-Category')[['Sales', 'Profit']].sum().sort_values(by='Profit')
+    subcat = cube.totals('Sub-Category')[['Sales', 'Profit']].sort_values(by='Profit')
     
     fig, ax = plt.subplots(figsize=(10, 6))
     subcat['Profit'].plot(kind='barh', ax=ax, color=['red' if p < 0 else 'green' for p in subcat['Profit']])
     plt.title("Profit by Sub-Category")
     plt.xlabel("Profit ($)")
     st.pyplot(fig)
+
+with tab4:
+    st.subheader("Drill Down and Roll Up")
+    hierarchy = st.radio("Hierarchy", list(HIERARCHIES), horizontal=True)
+    levels = HIERARCHIES[hierarchy]
+    # The drill path (values of the levels above the one shown) is kept per hierarchy
+    path = st.session_state.setdefault(f"drill_path_{hierarchy}", [])
+
+    # Slice by the slicer columns that are not levels of this hierarchy
+    filters = {}
+    slicers = [col for col in SLICERS if col not in levels]
+    for col, slicer in zip(st.columns(len(slicers)), slicers):
+        with col:
+            options = sorted(cube.totals(slicer).index)
+            selected = st.multiselect(slicer, options, placeholder="All")
+            if selected:
+                filters[slicer] = selected
+
+    level = levels[len(path)]
+    children = cube.drill(hierarchy, tuple(path), filters)
+    measure = st.selectbox("Measure", ['Sales', 'Profit', 'Quantity', 'Discount', 'Margin'])
+    breadcrumb = " › ".join(["All"] + [level_label(lvl, value) for lvl, value in zip(levels, path)])
+    st.markdown(f"**{breadcrumb}** — by {level}")
+
+    # Time levels keep their calendar order; the others are ranked by the measure
+    if hierarchy != 'Time':
+        children = children.sort_values(measure, ascending=False)
+    shown = children[measure].head(25)
+    fig, ax = plt.subplots(figsize=(10, max(3, 0.35 * len(shown))))
+    ax.barh([level_label(level, value) for value in shown.index], shown.values, color='steelblue')
+    ax.invert_yaxis()
+    plt.xlabel(measure)
+    plt.title(f"{measure} by {level}" + (" (top 25)" if len(children) > len(shown) else ""))
+    st.pyplot(fig)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if len(path) < len(levels) - 1 and len(children):
+            child = st.selectbox(f"Drill into {level}", children.index,
+                                 format_func=lambda value: level_label(level, value))
+            st.button("Drill down", on_click=path.append, args=(child,))
+    with col2:
+        if path:
+            st.button("Roll up", on_click=path.pop)
+
+    st.dataframe(children.drop(columns='DISCOUNT_WEIGHT'))
@@ -1,29 +1,30 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Shared helpers (eda_common) live at the repository root, sales_store.py one level up
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sales_store import OrderStore
+
 # Load data
-# Ensure 'Sample Superstore.csv' is in the same directory as this script.
-# Changed encoding to 'latin-1' to resolve the UnicodeDecodeError.
+# The order store is a validated columnar copy of 'Sample Superstore.csv' (read with
+# 'latin-1' encoding), created on the first run; new orders are appended to it
+# with OrderStore.append instead of rewriting a cleaned CSV.
 print("Loading data...")
-df = pd.read_csv("../Sample Superstore.csv", encoding='latin-1')
-print("Data loaded successfully.")
-print("\nInitial Dataset Preview:\n", df.head())
-
-# --- Data Preprocessing ---
-print("\nPerforming data preprocessing...")
-# Convert 'Order Date' column to datetime objects for time-series analysis
-df['Order Date'] = pd.to_datetime(df['Order Date'])
+store = OrderStore.open("../Sample Superstore.csv")
+print(f"Data loaded successfully: {len(store)} order lines.")
 
-# Extract month and year from the date for later plotting
-df['Month'] = df['Order Date'].dt.month_name()
-df['Year'] = df['Order Date'].dt.year
-print("Data preprocessing complete.")
+# The stored rollups are kept up to date by every append, so the charts below
+# read them instead of loading and grouping the order lines again
+cube = store.cube()
+print("\nTotals by Region:\n", cube.totals('Region')[['Lines', 'Sales', 'Profit', 'Quantity']])
 
 # --- Category-wise Sales & Profit ---
 print("\nGenerating Sales and Profit by Category chart...")
-# Group by 'Category' to calculate total sales and profit
-category_group = df.groupby('Category')[['Sales', 'Profit']].sum().sort_values(by='Sales', ascending=False)
+# Total sales and profit per 'Category'
+category_group = cube.totals('Category')[['Sales', 'Profit']].sort_values(by='Sales', ascending=False)
 category_group.plot(kind='bar', figsize=(8, 5), title="Sales & Profit by Category")
 plt.tight_layout()
 plt.show()
@@ -31,8 +32,8 @@ print("Displayed: Sales and Profit by Category")
 
 # --- Region-wise Profit ---
 print("\nGenerating Profit by Region chart...")
-# Group by 'Region' to calculate total profit
-region_profit = df.groupby('Region')['Profit'].sum().sort_values()
+# Total profit per 'Region'
+region_profit = cube.totals('Region')['Profit'].sort_values()
 region_profit.plot(kind='barh', color='skyblue', title="Profit by Region")
 plt.tight_layout()
 plt.show()
@@ -40,8 +41,8 @@ print("Displayed: Profit by Region")
 
 # --- Segment-wise Performance ---
 print("\nGenerating Sales and Profit by Customer Segment chart...")
-# Group by 'Segment' to analyze sales and profit for different customer segments
-seg_perf = df.groupby('Segment')[['Sales', 'Profit']].sum()
+# Sales and profit for the different customer segments
+seg_perf = cube.totals('Segment')[['Sales', 'Profit']]
 seg_perf.plot(kind='bar', figsize=(8, 4), title="Sales & Profit by Customer Segment")
 plt.tight_layout()
 plt.show()
@@ -49,9 +50,8 @@ print("Displayed: Sales and Profit by Customer Segment")
 
 # --- Monthly Sales Trend ---
 print("\nGenerating Monthly Sales Trend chart...")
-# Group by month and year to plot the monthly sales trend over the years
-monthly_sales = df.groupby(df['Order Date'].dt.to_period('M'))['Sales'].sum()
-monthly_sales.index = monthly_sales.index.to_timestamp()
+# Monthly level of the stored time pyramid (also kept per day, week, quarter and year)
+monthly_sales = store.pyramid().series('Month')['Sales']
 monthly_sales.plot(figsize=(12, 5), title="Monthly Sales Trend")
 plt.ylabel("Sales")
 plt.tight_layout()
@@ -60,8 +60,8 @@ print("Displayed: Monthly Sales Trend")
 
 # --- Top/Bottom Sub-Categories ---
 print("\nGenerating Top/Bottom Sub-Categories chart...")
-# Group by 'Sub-Category' and sort by profit to highlight profitable and unprofitable items
-subcat = df.groupby('Sub-Category')[['Sales', 'Profit']].sum().sort_values(by='Profit')
+# Sales and profit per 'Sub-Category', sorted by profit to highlight profitable and unprofitable items
+subcat = cube.totals('Sub-Category')[['Sales', 'Profit']].sort_values(by='Profit')
 fig, ax = plt.subplots(figsize=(10, 6))
 # Use a conditional list comprehension to color bars based on profit (green for profit, red for loss)
 subcat['Profit'].plot(kind='barh', ax=ax, color=['red' if p < 0 else 'green' for p in subcat['Profit']])
@@ -72,6 +72,4 @@ print("Displayed: Profit by Sub-Category")
 
 # === Done ===
 print("\nEDA Completed.")
-
-df.to_csv("Superstore_cleaned.csv", index=False)
-print("saved Successfully")
+print(f"Order store: {len(store)} order lines in {store.directory}")
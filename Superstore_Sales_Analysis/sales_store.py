@@ -0,0 +1,472 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from eda_common.uniques import on_uniques
+
+# pyarrow is the Parquet engine behind the order store
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+# Bump when the stored columns or aggregates change so the rollups of old stores are rebuilt
+STORE_VERSION = 2
+
+# Columns of an order line and how each is checked and stored
+ORDER_SCHEMA = {
+    'Row ID': 'int',
+    'Order ID': 'str',
+    'Order Date': 'date',
+    'Ship Date': 'date',
+    'Ship Mode': 'str',
+    'Customer ID': 'str',
+    'Customer Name': 'str',
+    'Segment': 'str',
+    'Country': 'str',
+    'City': 'str',
+    'State': 'str',
+    'Postal Code': 'number',
+    'Region': 'str',
+    'Product ID': 'str',
+    'Category': 'str',
+    'Sub-Category': 'str',
+    'Product Name': 'str',
+    'Sales': 'number',
+    'Quantity': 'int',
+    'Discount': 'number',
+    'Profit': 'number',
+}
+
+# Columns an order line cannot be missing (Postal Code is blank for a few cities)
+REQUIRED_COLUMNS = [col for col in ORDER_SCHEMA if col != 'Postal Code']
+
+# Drill paths, from the top level down
+HIERARCHIES = {
+    'Product': ['Category', 'Sub-Category', 'Product Name'],
+    'Geography': ['Region', 'State', 'City'],
+    'Time': ['Year', 'Quarter', 'Month'],
+}
+
+# Columns every stored aggregate is also split by, so any drilldown can be
+# sliced by them (the top level of each hierarchy, plus the customer segment)
+SLICERS = ['Category', 'Region', 'Year', 'Segment']
+
+# Additive measures stored per cell; DISCOUNT_WEIGHT is sum(Discount * Sales)
+MEASURES = ['Lines', 'Sales', 'Profit', 'Quantity', 'DISCOUNT_WEIGHT']
+
+# Time pyramid levels, finest first, and their pandas period frequencies (weeks start on Monday)
+TIME_LEVELS = {'Day': 'D', 'Week': 'W', 'Month': 'M', 'Quarter': 'Q', 'Year': 'Y'}
+
+# Columns the time pyramid is split by
+TIME_SPLITS = ['Category', 'Region']
+TIME_MEASURES = ['Lines', 'Sales', 'Profit', 'Quantity']
+
+
+def add_time_levels(df):
+    """
+    Adds the Year, Quarter and Month (number) columns of the time hierarchy
+    from 'Order Date', parsing each distinct date once if it is still text.
+    """
+    dates = df['Order Date']
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = on_uniques(dates, pd.to_datetime)
+    return df.assign(**{'Order Date': dates, 'Year': dates.dt.year,
+                        'Quarter': dates.dt.quarter, 'Month': dates.dt.month})
+
+
+def derive_measures(table):
+    """
+    Adds the ratio measures of aggregated rows: the sales-weighted average
+    discount and the profit margin.
+    """
+    sales = table['Sales'].where(table['Sales'] != 0)
+    return table.assign(Discount=table['DISCOUNT_WEIGHT'] / sales, Margin=table['Profit'] / sales)
+
+
+def _view_keys(hierarchy, depth):
+    """
+    Key columns of the stored aggregate of a hierarchy at a depth (1 = top level).
+    """
+    keys = list(SLICERS)
+    keys += [level for level in HIERARCHIES[hierarchy][:depth] if level not in keys]
+    return keys
+
+
+class SalesCube:
+    """
+    Precomputed rollups of the order lines along the product, geography and
+    time hierarchies. Every level of every hierarchy is stored as one small
+    aggregate table, also split by the SLICERS, so drilling down, rolling up
+    or slicing reads one stored table instead of grouping the order lines.
+    All measures are sums, so the tables of two batches of orders merge by
+    adding matching cells.
+    """
+
+    def __init__(self, views):
+        self.views = views
+
+    @classmethod
+    def build(cls, df):
+        """
+        Aggregates the order lines into the leaf table of each hierarchy and
+        rolls every higher level up from the leaf table.
+        """
+        df = add_time_levels(df)
+        lines = df.assign(Lines=1, DISCOUNT_WEIGHT=df['Discount'] * df['Sales'])
+        views = {}
+        for hierarchy, levels in HIERARCHIES.items():
+            leaf = lines.groupby(_view_keys(hierarchy, len(levels)), dropna=False)[MEASURES].sum().reset_index()
+            views[(hierarchy, len(levels))] = leaf
+            for depth in range(len(levels) - 1, 0, -1):
+                views[(hierarchy, depth)] = (leaf.groupby(_view_keys(hierarchy, depth), dropna=False)[MEASURES]
+                                             .sum().reset_index())
+        return cls(views)
+
+    def merge(self, other):
+        """
+        Cube of the orders of both cubes, adding the cells they share.
+        """
+        views = {}
+        for key, view in self.views.items():
+            combined = pd.concat([view, other.views[key]], ignore_index=True)
+            views[key] = combined.groupby(_view_keys(*key), dropna=False)[MEASURES].sum().reset_index()
+        return SalesCube(views)
+
+    def _view_for(self, columns):
+        """
+        Smallest stored table that has all the given columns.
+        """
+        candidates = [view for view in self.views.values() if set(columns) <= set(view.columns)]
+        if not candidates:
+            raise KeyError(f"No stored aggregate has the columns {sorted(columns)}")
+        return min(candidates, key=len)
+
+    def totals(self, by, filters=None):
+        """
+        Measures grouped by one or more columns of the hierarchies or slicers,
+        over the cells matching filters ({column: value or list of values}).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        filters = filters or {}
+        view = self._view_for(by + list(filters))
+        mask = np.ones(len(view), dtype=bool)
+        for column, value in filters.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= view[column].isin(values).to_numpy()
+        table = view[mask].groupby(by)[MEASURES].sum()
+        return derive_measures(table)
+
+    def drill(self, hierarchy, path=(), filters=None):
+        """
+        Children of a node of a hierarchy: the measures of the next level down
+        within path (the values of the levels above, e.g. ('Furniture',
+        'Chairs')), optionally sliced by filters. An empty path gives the top
+        level; dropping the last element of path rolls up.
+        """
+        levels = HIERARCHIES[hierarchy]
+        if len(path) >= len(levels):
+            raise ValueError(f"{hierarchy} has only {len(levels)} levels")
+        criteria = dict(zip(levels, path))
+        criteria.update(filters or {})
+        return self.totals(levels[len(path)], criteria)
+
+    def save(self, directory):
+        """
+        Writes every stored table to a Parquet file in directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for (hierarchy, depth), view in self.views.items():
+            view.to_parquet(os.path.join(directory, f"{hierarchy}-{depth}.parquet"), index=False)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Reads a cube written by save().
+        """
+        views = {}
+        for hierarchy, levels in HIERARCHIES.items():
+            for depth in range(1, len(levels) + 1):
+                views[(hierarchy, depth)] = pd.read_parquet(os.path.join(directory, f"{hierarchy}-{depth}.parquet"))
+        return cls(views)
+
+
+class TimePyramid:
+    """
+    Sales, profit and quantity per day, week, month, quarter and year (see
+    TIME_LEVELS), each split by category and region. Every level is stored
+    sorted by period start and rolled up from the day level, so a trend at
+    any granularity over any date range reads a few thousand stored rows
+    instead of grouping the order lines. Levels merge by adding cells.
+    """
+
+    def __init__(self, levels):
+        self.levels = levels
+
+    @staticmethod
+    def _roll(table, freq):
+        periods = table['Period'].dt.to_period(freq).dt.start_time
+        return (table.assign(Period=periods).groupby(['Period'] + TIME_SPLITS)[TIME_MEASURES]
+                .sum().reset_index())
+
+    @classmethod
+    def build(cls, df):
+        """
+        Aggregates the order lines per day and rolls the coarser levels up from the days.
+        """
+        lines = df.assign(Period=df['Order Date'].dt.normalize(), Lines=1)
+        day = lines.groupby(['Period'] + TIME_SPLITS)[TIME_MEASURES].sum().reset_index()
+        return cls({level: day if freq == 'D' else cls._roll(day, freq) for level, freq in TIME_LEVELS.items()})
+
+    def merge(self, other):
+        """
+        Pyramid of the orders of both pyramids, adding the cells they share.
+        """
+        return TimePyramid({level: pd.concat([table, other.levels[level]], ignore_index=True)
+                            .groupby(['Period'] + TIME_SPLITS)[TIME_MEASURES].sum().reset_index()
+                            for level, table in self.levels.items()})
+
+    @property
+    def date_range(self):
+        days = self.levels['Day']['Period']
+        return days.min(), days.max()
+
+    def series(self, level, start=None, end=None, by=None, filters=None):
+        """
+        Measures per period of a level that overlaps start to end (inclusive;
+        periods cut by either end are kept whole), over the cells matching filters ({'Category' or
+        'Region': value or list of values}). With by ('Category' or 'Region')
+        the rows are (period, by value) pairs.
+        """
+        table = self.levels[level]
+        mask = np.ones(len(table), dtype=bool)
+        if start is not None:
+            period_end = table['Period'].dt.to_period(TIME_LEVELS[level]).dt.end_time
+            mask &= (period_end >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (table['Period'] <= pd.Timestamp(end)).to_numpy()
+        for column, value in (filters or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= table[column].isin(values).to_numpy()
+        keys = ['Period'] if by is None else ['Period', by]
+        return table[mask].groupby(keys)[TIME_MEASURES].sum()
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for level, table in self.levels.items():
+            table.to_parquet(os.path.join(directory, f"{level}.parquet"), index=False)
+
+    @classmethod
+    def load(cls, directory):
+        return cls({level: pd.read_parquet(os.path.join(directory, f"{level}.parquet")) for level in TIME_LEVELS})
+
+
+def validate_orders(batch):
+    """
+    Checks a batch of order lines against ORDER_SCHEMA and returns it with
+    the columns in schema order and parsed to their types. Raises
+    ValueError naming the problem: missing or unknown columns, values that
+    do not parse, missing required values, out-of-range quantities or
+    discounts, or repeated Row IDs.
+    """
+    missing = [col for col in ORDER_SCHEMA if col not in batch.columns]
+    unknown = [col for col in batch.columns if col not in ORDER_SCHEMA]
+    if missing or unknown:
+        raise ValueError(f"Order columns do not match the schema: missing {missing}, unknown {unknown}")
+
+    batch = batch[list(ORDER_SCHEMA)].reset_index(drop=True)
+    for col, kind in ORDER_SCHEMA.items():
+        values = batch[col]
+        if kind == 'date':
+            parsed = on_uniques(values, lambda dates: pd.to_datetime(dates, errors='coerce'))
+        elif kind in ('int', 'number'):
+            parsed = pd.to_numeric(values, errors='coerce')
+        else:
+            parsed = values.astype(object).where(values.notna())
+        bad = parsed.isna() & values.notna()
+        if bad.any():
+            raise ValueError(f"{bad.sum()} value(s) of '{col}' are not a valid {kind}, "
+                             f"e.g. {values[bad].iloc[0]!r}")
+        if kind == 'int' and (parsed.dropna() % 1 != 0).any():
+            raise ValueError(f"'{col}' must hold whole numbers")
+        batch[col] = parsed
+
+    incomplete = batch[REQUIRED_COLUMNS].isna().any()
+    if incomplete.any():
+        raise ValueError(f"Missing values in {list(incomplete[incomplete].index)}")
+    if (batch['Quantity'] <= 0).any():
+        raise ValueError("'Quantity' must be positive")
+    if not batch['Discount'].between(0, 1).all():
+        raise ValueError("'Discount' must be a fraction between 0 and 1")
+    if batch['Row ID'].duplicated().any():
+        raise ValueError("'Row ID' values repeat within the batch")
+    return batch.astype({'Row ID': 'int64', 'Quantity': 'int64'})
+
+
+class OrderStore:
+    """
+    Append-only columnar store of the order lines, kept in a directory as
+    one Parquet part per ingested batch, next to the rollups of all parts
+    (the SalesCube and the TimePyramid). Appending a batch validates it,
+    writes it as a new part and merges the rollups of the batch into the
+    stored ones, so a daily refresh costs time in proportion to the new
+    orders and the (small) rollups, not the history.
+
+    manifest.json lists the committed parts and rollups and is replaced
+    last, so a failed append leaves the previous state intact.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+
+    @staticmethod
+    def default_dir(csv_path):
+        return os.path.join(os.path.dirname(os.path.abspath(csv_path)), '.cache', 'orders')
+
+    @classmethod
+    def open(cls, csv_path, directory=None):
+        """
+        Opens the store seeded from an orders CSV, creating it from the CSV
+        the first time. When the CSV changed since, its orders replace the
+        seed part; batches appended since are kept. A store written in an
+        older format has its rollups rebuilt from its parts.
+        """
+        if not HAVE_PYARROW:
+            raise ImportError("The order store needs pyarrow to read and write Parquet")
+        directory = directory or cls.default_dir(csv_path)
+        stat = os.stat(csv_path)
+        source = [stat.st_size, stat.st_mtime_ns]
+        try:
+            store = cls(directory)
+        except (OSError, ValueError):
+            store = None
+        if (store is not None and store.manifest.get('version') == STORE_VERSION
+                and store.manifest.get('source') == source):
+            return store
+        if store is not None and store.manifest.get('version') != STORE_VERSION:
+            # A store of an older format keeps its parts; only the rollups are rebuilt from them
+            # (version 1 named its rollups directory 'cube')
+            store.manifest.setdefault('rollups', store.manifest.get('cube'))
+            if store.manifest.get('source') == source:
+                store._rebuild(store.manifest['parts'], source)
+                return store
+
+        orders = validate_orders(pd.read_csv(csv_path, encoding='latin-1'))
+        if store is not None:
+            store._replace_seed(orders, source)
+            return store
+
+        # No committed store (the manifest is written last): start from the CSV alone
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        orders.to_parquet(os.path.join(directory, 'part-00000.parquet'), index=False)
+        SalesCube.build(orders).save(os.path.join(directory, 'rollups-00000'))
+        TimePyramid.build(orders).save(os.path.join(directory, 'rollups-00000'))
+        _write_manifest(directory, {
+            'version': STORE_VERSION, 'source': source, 'parts': ['part-00000.parquet'],
+            'rollups': 'rollups-00000', 'rows': len(orders), 'max_row_id': int(orders['Row ID'].max()),
+        })
+        return cls(directory)
+
+    def _replace_seed(self, orders, source):
+        """
+        Writes the orders of a changed seed CSV as a new first part in place
+        of the old seed part, keeping the appended parts, and rebuilds the
+        rollups from all of them. Raises ValueError if the new seed reaches
+        the Row IDs of appended orders.
+        """
+        appended = self.manifest['parts'][1:]
+        if appended:
+            first_appended = int(min(pd.read_parquet(os.path.join(self.directory, part), columns=['Row ID'])
+                                     ['Row ID'].min() for part in appended))
+            if orders['Row ID'].max() >= first_appended:
+                raise ValueError(f"The seed CSV changed and now has Row IDs from {first_appended}, "
+                                 f"which belong to appended orders")
+        seed = f"part-{_next_number(self.manifest):05d}.parquet"
+        orders.to_parquet(os.path.join(self.directory, seed), index=False)
+        self._rebuild([seed] + appended, source)
+
+    def _rebuild(self, parts, source):
+        """
+        Rebuilds the rollups from the given parts and commits them as the
+        store's contents, then deletes the parts and rollups no longer listed.
+        """
+        old = self.manifest
+        rollups = f"rollups-{_next_number(old):05d}"
+        orders = pd.concat([pd.read_parquet(os.path.join(self.directory, part)) for part in parts],
+                           ignore_index=True)
+        SalesCube.build(orders).save(os.path.join(self.directory, rollups))
+        TimePyramid.build(orders).save(os.path.join(self.directory, rollups))
+        manifest = {
+            'version': STORE_VERSION, 'source': source, 'parts': parts, 'rollups': rollups,
+            'rows': len(orders), 'max_row_id': int(orders['Row ID'].max()),
+        }
+        _write_manifest(self.directory, manifest)
+        self.manifest = manifest
+        for part in set(old['parts']) - set(parts):
+            os.remove(os.path.join(self.directory, part))
+        shutil.rmtree(os.path.join(self.directory, old['rollups']), ignore_errors=True)
+
+    def __len__(self):
+        return self.manifest['rows']
+
+    def orders(self, columns=None):
+        """
+        Every stored order line (optionally only some columns), oldest batch first.
+        """
+        paths = [os.path.join(self.directory, part) for part in self.manifest['parts']]
+        return pd.concat([pd.read_parquet(path, columns=columns) for path in paths], ignore_index=True)
+
+    def cube(self):
+        return SalesCube.load(os.path.join(self.directory, self.manifest['rollups']))
+
+    def pyramid(self):
+        return TimePyramid.load(os.path.join(self.directory, self.manifest['rollups']))
+
+    def append(self, batch):
+        """
+        Validates a batch of new order lines and appends it. Row IDs must be
+        new (above every stored Row ID), so a batch cannot be ingested twice.
+        """
+        batch = validate_orders(batch)
+        if len(batch) == 0:
+            return
+        if batch['Row ID'].min() <= self.manifest['max_row_id']:
+            raise ValueError(f"Row IDs must be above {self.manifest['max_row_id']}, "
+                             f"the last one already stored")
+
+        number = _next_number(self.manifest)
+        part = f"part-{number:05d}.parquet"
+        rollups = f"rollups-{number:05d}"
+        batch.to_parquet(os.path.join(self.directory, part), index=False)
+        self.cube().merge(SalesCube.build(batch)).save(os.path.join(self.directory, rollups))
+        self.pyramid().merge(TimePyramid.build(batch)).save(os.path.join(self.directory, rollups))
+
+        old_rollups = self.manifest['rollups']
+        manifest = dict(self.manifest, parts=self.manifest['parts'] + [part], rollups=rollups,
+                        rows=self.manifest['rows'] + len(batch),
+                        max_row_id=max(self.manifest['max_row_id'], int(batch['Row ID'].max())))
+        _write_manifest(self.directory, manifest)
+        self.manifest = manifest
+        shutil.rmtree(os.path.join(self.directory, old_rollups), ignore_errors=True)
+
+
+def _next_number(manifest):
+    """
+    Number for the next part or rollups directory, above every one the manifest lists.
+    """
+    names = manifest['parts'] + [manifest['rollups']]
+    return max(int(name.split('-')[1].split('.')[0]) for name in names) + 1
+
+
+def _write_manifest(directory, manifest):
+    tmp_path = os.path.join(directory, 'manifest.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, 'manifest.json'))
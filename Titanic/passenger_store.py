@@ -0,0 +1,22 @@
+import pandas as pd
+
+# Columns of the dashboard's sidebar filters and outcome counts, indexed as row bitmaps
+FILTER_COLUMNS = ['Pclass', 'Sex', 'Survived']
+
+
+def load_passengers(csv_path):
+    """
+    Loads the Titanic passengers and cleans them: missing ages are filled
+    with the median age, Cabin is dropped and passengers without a port of
+    embarkation are removed (in the files that have those columns).
+    """
+    df = pd.read_csv(csv_path)
+
+    # Handle missing values
+    df['Age'] = df['Age'].fillna(df['Age'].median())
+    if 'Cabin' in df.columns:
+        df.drop(columns='Cabin', inplace=True)
+    if 'Embarked' in df.columns:
+        df.dropna(subset=['Embarked'], inplace=True)
+
+    return df
@@ -1,8 +1,14 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from eda_common.bitmaps import BitmapIndex
+from passenger_store import FILTER_COLUMNS, load_passengers
+
 # Set a wide layout and a title for the Streamlit app
 st.set_page_config(layout="wide", page_title="Titanic Survival Analysis")
 
@@ -12,21 +18,20 @@ def load_data():
     Loads and cleans the Titanic dataset.
     Caches the data to improve performance on subsequent runs.
     """
-    # Load the dataset
-    df = pd.read_csv("Titanic/titanic.csv")
-    
-    # Handle missing values
-    df['Age'] = df['Age'].fillna(df['Age'].median())
-    if 'Cabin' in df.columns:
-        df.drop(columns='Cabin', inplace=True)
-    if 'Embarked' in df.columns:
-        df.dropna(subset=['Embarked'], inplace=True)
-    
-    return df
+    return load_passengers("Titanic/titanic.csv")
 
 # Load the cleaned data
 df = load_data()
 
+@st.cache_resource
+def load_bitmaps():
+    """
+    Builds one row bitmap per passenger class, gender and outcome for the sidebar filters.
+    """
+    return BitmapIndex(df, FILTER_COLUMNS)
+
+bitmaps = load_bitmaps()
+
 # App title and introduction
 st.title("Titanic Survival EDA Dashboard")
 st.markdown("An interactive dashboard to explore survival patterns on the Titanic.")
@@ -36,12 +41,9 @@ st.sidebar.header("Filter")
 selected_pclass = st.sidebar.selectbox("Select Passenger Class", options=["All", 1, 2, 3])
 selected_gender = st.sidebar.selectbox("Select Gender", options=["All", "male", "female"])
 
-filtered_df = df.copy()
-
-if selected_pclass != "All":
-    filtered_df = filtered_df[filtered_df['Pclass'] == selected_pclass]
-if selected_gender != "All":
-    filtered_df = filtered_df[filtered_df['Sex'] == selected_gender]
+# AND the bitmaps of the selected values; the frame is only indexed once, at the end
+selection = bitmaps.select({'Pclass': selected_pclass, 'Sex': selected_gender})
+filtered_df = df.iloc[bitmaps.rows(selection)]
 
 # Create tabs for better organization
 tab1, tab2, tab3 = st.tabs(["Survival Overview", "Gender & Class", "Age Analysis"])
@@ -50,7 +52,7 @@ with tab1:
     st.subheader("Overall Survival Distribution")
     
     # Pie Chart
-    survived_counts = filtered_df['Survived'].value_counts()
+    survived_counts = bitmaps.counts('Survived', selection)
     fig1, ax1 = plt.subplots()
     ax1.pie(
         survived_counts, 
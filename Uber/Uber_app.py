@@ -1,44 +1,122 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import folium
-from folium.plugins import HeatMap
-from streamlit_folium import folium_static
-import calendar
+from folium.raster_layers import ImageOverlay
+from folium.utilities import image_to_url
+from streamlit_folium import st_folium
+import io
+
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from eda_common.density import map_window, raster_counts, shade, viewport_bounds, window_bounds
+from trip_store import TripStore
+from uber_dataset import UberDataset
 
 st.set_page_config(layout="wide")
 
+# Initial map view; the pickup raster follows the view as the user pans and zooms
+MAP_CENTER = [40.75, -73.95]
+MAP_ZOOM = 12
+MAP_WIDTH, MAP_HEIGHT = 1000, 600
+
+# Monthly extracts go in Uber/data/; the single combined file is the fallback
+DATA_SOURCE = 'Uber/data' if os.path.isdir('Uber/data') else 'Uber/Uber_Data.csv'
+
+# cache_resource hands every rerun the same objects instead of unpickling copies
+@st.cache_resource
+def load_dataset():
+    """
+    Creates the dataset over the monthly Uber files; files are ingested by refresh().
+    """
+    return UberDataset(DATA_SOURCE)
+
+@st.cache_resource(max_entries=1)
+def load_data(version):
+    """
+    Indexes the loaded trips by (day, hour) so each filter is a constant-time
+    slice. Rebuilt only when the set of loaded files changes.
+    """
+    return TripStore(dataset.frame())
+
+@st.cache_data(max_entries=1)
+def count_plots(version):
+    """
+    Renders the Hour and Weekday trip count plots once, as PNG images.
+    """
+    images = []
+    for counts, rotate in [(store.hour_counts, False), (store.weekday_counts, True)]:
+        fig, ax = plt.subplots()
+        sns.barplot(x=counts.index.astype(str), y=counts.values, color=sns.color_palette()[0], ax=ax)
+        ax.set_xlabel(counts.index.name)
+        ax.set_ylabel("count")
+        if rotate:
+            plt.xticks(rotation=45)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight')
+        plt.close(fig)
+        images.append(buf.getvalue())
+    return images
+
 st.title(" Uber NYC Trip Explorer")
-df = pd.read_csv('Uber/Uber_Data.csv')
-df['Date/Time'] = pd.to_datetime(df['Date/Time'])
-df['Hour'] = df['Date/Time'].dt.hour
-df['DayOfWeek'] = df['Date/Time'].dt.dayofweek
-df['Day'] = df['Date/Time'].dt.day
-df['Weekday'] = df['DayOfWeek'].apply(lambda x: calendar.day_name[x])
+dataset = load_dataset()
+# Only files added or changed since the last run are parsed
+dataset.refresh()
+store = load_data(dataset.version)
 
 # Sidebar Filters
 st.sidebar.header(" Filter Options")
-selected_day = st.sidebar.selectbox("Select Day", sorted(df['Day'].unique()))
+selected_day = st.sidebar.selectbox("Select Day", store.days)
 selected_hour = st.sidebar.slider("Select Hour", 0, 23, 12)
 
-filtered_df = df[(df['Day'] == selected_day) & (df['Hour'] == selected_hour)]
+@st.cache_data(max_entries=128)
+def pickup_overlay(version, day, hour, window):
+    """
+    Bins every pickup of the selected day and hour into the screen pixels of
+    the map window and returns the shaded raster as a PNG data URL, its
+    bounds and the number of pickups. The payload depends on the window
+    size, not on the number of trips.
+    """
+    filtered_df = store.slice(day, hour)
+    counts = raster_counts(filtered_df['Lat'], filtered_df['Lon'], window)
+    return image_to_url(shade(counts)), window_bounds(window), len(filtered_df)
+
+# Current map view (center, zoom, bounds), updated from the map after each pan or zoom
+view = st.session_state.setdefault('pickup_view', {
+    'center': MAP_CENTER,
+    'zoom': MAP_ZOOM,
+    'bounds': viewport_bounds(*MAP_CENTER, MAP_ZOOM, MAP_WIDTH, MAP_HEIGHT),
+})
+window = map_window(*view['bounds'], view['zoom'])
+image_url, image_bounds, n_pickups = pickup_overlay(dataset.version, selected_day, selected_hour, window)
 
 # Display Map
 st.subheader(f" Pickup Map for Day {selected_day}, Hour {selected_hour}")
-pickup_map = folium.Map(location=[40.75, -73.95], zoom_start=12)
-heat_data = filtered_df[['Lat', 'Lon']].dropna().values.tolist()
-HeatMap(heat_data[:10000]).add_to(pickup_map)
-folium_static(pickup_map)
+pickup_map = folium.Map(location=view['center'], zoom_start=view['zoom'])
+ImageOverlay(image_url, bounds=image_bounds, name="Pickups").add_to(pickup_map)
+map_state = st_folium(pickup_map, width=MAP_WIDTH, height=MAP_HEIGHT,
+                      returned_objects=['center', 'zoom', 'bounds'], key='pickup_map')
+st.caption(f"Density of all {n_pickups:,} pickups, binned at zoom level {window[0]}.")
+
+# Re-render the raster only once the view leaves the padded window it was binned for
+south_west = ((map_state or {}).get('bounds') or {}).get('_southWest') or {}
+if south_west.get('lat') is not None:
+    north_east = map_state['bounds']['_northEast']
+    view = {
+        'center': [map_state['center']['lat'], map_state['center']['lng']],
+        'zoom': map_state['zoom'],
+        'bounds': (south_west['lat'], south_west['lng'], north_east['lat'], north_east['lng']),
+    }
+    st.session_state['pickup_view'] = view
+    if map_window(*view['bounds'], view['zoom']) != window:
+        st.rerun()
 
 # Plots
+hour_plot, weekday_plot = count_plots(dataset.version)
 st.subheader(" Trips by Hour of Day")
-fig, ax = plt.subplots()
-sns.countplot(x='Hour', data=df, ax=ax)
-st.pyplot(fig)
+st.image(hour_plot)
 
 st.subheader(" Trips by Weekday")
-fig2, ax2 = plt.subplots()
-sns.countplot(x='Weekday', data=df, order=calendar.day_name, ax=ax2)
-plt.xticks(rotation=45)
-st.pyplot(fig2)
+st.image(weekday_plot)
@@ -1,28 +1,30 @@
-import pandas as pd
+import os
+import sys
+
 import seaborn as sns
 import matplotlib.pyplot as plt
 import folium
-from folium.plugins import HeatMap
+from folium.raster_layers import ImageOverlay
 import calendar
 
+# uber_dataset.py lives one level up, next to the dashboard; eda_common at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from eda_common.density import map_window, raster_counts, shade, viewport_bounds, window_bounds
+from uber_dataset import UberDataset
+
 # Load Dataset
+# Monthly extracts (one CSV per month) go in ../data/; the combined file is the fallback.
+# Each file is parsed with its own Date/Time format and gets the time features and a Month column.
 print("Loading dataset...")
-df = pd.read_csv('../Uber_Data.csv')
+source = '../data' if os.path.isdir('../data') else '../Uber_Data.csv'
+# Threads rather than processes: this script has no __main__ guard for spawned workers
+dataset = UberDataset(source, processes=False)
+for path in dataset.refresh():
+    print(f"Loaded {path}")
+df = dataset.frame()
 print("Dataset loaded successfully.")
-
-# Convert 'Date/Time' column to datetime objects with the correct format
-print("\nConverting 'Date/Time' column...")
-df['Date/Time'] = pd.to_datetime(df['Date/Time'], format='%m/%d/%Y %H:%M:%S')
-print("Date/Time conversion complete.")
-
-# Feature Engineering
-print("Extracting time-based features...")
-df['Hour'] = df['Date/Time'].dt.hour
-df['DayOfWeek'] = df['Date/Time'].dt.dayofweek
-df['Day'] = df['Date/Time'].dt.day
-df['Month'] = df['Date/Time'].dt.month
-df['Weekday'] = df['DayOfWeek'].apply(lambda x: calendar.day_name[x])
-print("Features extracted successfully.")
+print("Time-based features extracted successfully.")
 
 # === Plotting and Analysis ===
 
@@ -45,7 +47,8 @@ print("Displayed: Trips by Day of Week")
 
 # Heatmap: Hour vs Day of Week
 print("\nGenerating Heatmap: Hour vs Day of Week...")
-heatmap_data = df.groupby(['Hour', 'DayOfWeek']).size().unstack()
+# Merged from the per-month partial counts kept by the dataset
+heatmap_data = dataset.hour_weekday_counts()
 plt.figure(figsize=(12,6))
 sns.heatmap(heatmap_data, cmap='YlGnBu')
 plt.title('Heatmap: Hour vs Day of Week')
@@ -55,8 +58,11 @@ print("Displayed: Heatmap: Hour vs Day of Week")
 # Folium Map of Pickup Locations
 print("\nGenerating Folium Map of Pickup Locations...")
 pickup_map = folium.Map(location=[40.75, -73.95], zoom_start=12)
-heat_data = df[['Lat', 'Lon']].dropna().values.tolist()
-HeatMap(heat_data[:10000]).add_to(pickup_map)
+# Bin every pickup into screen pixels at zoom 12 over a window three screens wide,
+# so the saved map shows all trips without embedding them as points
+window = map_window(*viewport_bounds(40.75, -73.95, 12, 1024, 768), 12, pad=1.0)
+pickup_density = shade(raster_counts(df['Lat'], df['Lon'], window))
+ImageOverlay(pickup_density, bounds=window_bounds(window), name="Pickups").add_to(pickup_map)
 # Display the map. It will not be saved as a file.
 print("Map prepared for display.")
 pickup_map.save('nyc_pickup_map.html')
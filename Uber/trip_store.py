@@ -0,0 +1,55 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from eda_common.uniques import on_uniques
+
+# Days of the month are 1-31, so (day, hour) keys fit in 32 * 24 slots
+N_DAYS = 32
+N_HOURS = 24
+
+
+def add_time_features(df, date_format='%m/%d/%Y %H:%M:%S'):
+    """
+    Parses 'Date/Time' with an explicit format and derives the Hour,
+    DayOfWeek, Day and Weekday columns. Pickup times repeat (minute
+    resolution), so each distinct timestamp string is parsed only once.
+    Weekday is a categorical built from the day-of-week codes rather than a
+    per-row lookup.
+    """
+    df['Date/Time'] = on_uniques(df['Date/Time'], lambda times: pd.to_datetime(times, format=date_format))
+    df['Hour'] = df['Date/Time'].dt.hour
+    df['DayOfWeek'] = df['Date/Time'].dt.dayofweek
+    df['Day'] = df['Date/Time'].dt.day
+    df['Weekday'] = pd.Categorical.from_codes(df['DayOfWeek'], categories=list(calendar.day_name))
+    return df
+
+
+class TripStore:
+    """
+    Trips sorted by (Day, Hour) with an offsets table, so the trips of any
+    day and hour are a contiguous, zero-copy slice. The Hour and Weekday
+    trip counts are computed once when the store is built.
+    """
+
+    def __init__(self, df):
+        key = df['Day'].to_numpy(np.int64) * N_HOURS + df['Hour'].to_numpy(np.int64)
+        order = np.argsort(key, kind='stable')
+        self.trips = df.take(order).reset_index(drop=True)
+        counts = np.bincount(key, minlength=N_DAYS * N_HOURS)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.days = np.flatnonzero(counts.reshape(N_DAYS, N_HOURS).sum(axis=1)).tolist()
+        self.hour_counts = pd.Series(np.bincount(df['Hour'], minlength=N_HOURS), name='Trips').rename_axis('Hour')
+        self.weekday_counts = (df['Weekday'].value_counts()
+                               .reindex(list(calendar.day_name), fill_value=0).rename_axis('Weekday'))
+
+    def __len__(self):
+        return len(self.trips)
+
+    def slice(self, day, hour):
+        """
+        Returns the trips of one day of the month and hour as a view into the store.
+        """
+        key = day * N_HOURS + hour
+        return self.trips.iloc[self.offsets[key]:self.offsets[key + 1]]
@@ -0,0 +1,138 @@
+import glob
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from eda_common import read_csv_parallel
+from trip_store import add_time_features
+
+# Date/Time layouts seen in the monthly Uber extracts, tried in order
+DATETIME_FORMATS = ['%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M']
+
+
+def resolve_paths(source):
+    """
+    Expands a directory (all CSV files in it), a glob pattern or a single
+    file path into a sorted list of CSV paths.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    if glob.has_magic(source):
+        return sorted(glob.glob(source))
+    return [source]
+
+
+def detect_datetime_format(values, sample_size=1000):
+    """
+    Returns the first of DATETIME_FORMATS that parses a sample of the
+    values, or None to let pandas infer the format.
+    """
+    sample = values.dropna().head(sample_size)
+    for fmt in DATETIME_FORMATS:
+        try:
+            pd.to_datetime(sample, format=fmt)
+            return fmt
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def ingest_file(path, parallel=False):
+    """
+    Parses one Uber extract with its own Date/Time format, adds the time
+    features and the Month partition column, and computes its trip counts
+    per (Month, Hour, DayOfWeek). With parallel=True the CSV itself is
+    parsed across all cores.
+    """
+    df = read_csv_parallel(path) if parallel else pd.read_csv(path)
+    add_time_features(df, date_format=detect_datetime_format(df['Date/Time']))
+    df['Month'] = df['Date/Time'].dt.to_period('M')
+    counts = df.groupby(['Month', 'Hour', 'DayOfWeek']).size().rename('Trips')
+    return df, counts
+
+
+class UberDataset:
+    """
+    A set of Uber trip files (typically one per month) loaded concurrently
+    in a worker pool. Each file is kept as its own partition together with
+    its per-month trip counts; refresh() only ingests files that are new or
+    have changed since the last call, and the counts of all partitions are
+    merged on demand.
+
+    One dataset may be shared by concurrent sessions: refresh() runs under a
+    lock and swaps in a new partitions dict with a single assignment, so the
+    readers always see one complete set of files and never a dict that is
+    being changed.
+    """
+
+    def __init__(self, source, workers=None, processes=True):
+        self.source = source
+        self.workers = workers
+        # Plain scripts cannot start worker processes on spawn-based platforms
+        # without a __main__ guard; they pass processes=False to use threads.
+        self.processes = processes
+        self.partitions = {}
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def version(self):
+        """
+        Identifies the loaded files and their modification times.
+        """
+        return tuple(sorted((path, part['mtime_ns']) for path, part in self.partitions.items()))
+
+    def refresh(self):
+        """
+        Ingests files that are new or changed and drops partitions whose file
+        disappeared. Returns the list of paths that were (re)loaded.
+        """
+        with self._refresh_lock:
+            paths = resolve_paths(self.source)
+            if not paths or not all(os.path.exists(path) for path in paths):
+                raise FileNotFoundError(self.source)
+            mtimes = {path: os.stat(path).st_mtime_ns for path in paths}
+            current = self.partitions
+            stale = [path for path in paths
+                     if path not in current or current[path]['mtime_ns'] != mtimes[path]]
+            if not stale and set(current) == set(mtimes):
+                return []
+
+            if len(stale) == 1:
+                # A single file gets the whole machine through the parallel CSV reader instead
+                results = [ingest_file(stale[0], parallel=self.processes)]
+            elif stale:
+                pool_class = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+                with pool_class(max_workers=self.workers) as pool:
+                    results = list(pool.map(ingest_file, stale))
+            else:
+                results = []
+            # Files that disappeared are left out of the new dict
+            partitions = {path: current[path] for path in paths if path not in stale}
+            for path, (df, counts) in zip(stale, results):
+                partitions[path] = {'mtime_ns': mtimes[path], 'frame': df, 'counts': counts}
+            self.partitions = partitions
+            return stale
+
+    def frame(self):
+        """
+        Returns all trips as one frame, in file order.
+        """
+        partitions = self.partitions
+        frames = [partitions[path]['frame'] for path in sorted(partitions)]
+        return pd.concat(frames, ignore_index=True)
+
+    def counts(self):
+        """
+        Merges the per-file trip counts into one Series indexed by
+        (Month, Hour, DayOfWeek).
+        """
+        partial = [part['counts'] for part in self.partitions.values()]
+        return pd.concat(partial).groupby(level=['Month', 'Hour', 'DayOfWeek']).sum()
+
+    def hour_weekday_counts(self):
+        """
+        Trips per Hour (rows) and DayOfWeek (columns), merged from the per-month counts.
+        """
+        return self.counts().groupby(level=['Hour', 'DayOfWeek']).sum().unstack()
@@ -1,20 +1,18 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from restaurant_store import load_restaurants
+
 st.set_page_config(layout="wide", page_title="Zomato Restaurant Analysis")
 
 @st.cache_data
 def load_data():
-    df = pd.read_csv("Zomato_Restaurant_Analysis/zomato.csv", encoding='latin-1', dtype={"column_name": str})
-
-    df = df[df['rate'].notnull() & (df['rate'] != 'NEW') & (df['rate'] != '-')]
-    df['rate'] = df['rate'].apply(lambda x: str(x).split('/')[0]).str.strip()
-    df['rate'] = pd.to_numeric(df['rate'], errors='coerce')
-    df = df[df['rate'].notnull()]
-    df['cuisines'] = df['cuisines'].astype(str)
-    return df
+    return load_restaurants("Zomato_Restaurant_Analysis/zomato.csv")
 
 df = load_data()
 
@@ -1,8 +1,14 @@
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
 
+# Shared helpers (eda_common) live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from eda_common.uniques import on_uniques
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
@@ -32,8 +38,9 @@ if 'rate' in df.columns:
     df = df[~df['rate'].astype(str).isin(['NEW', '-', 'nan'])]
     
     # Extract numeric rating from formats like "4.1/5" or "4.1"
-    df['rate'] = df['rate'].astype(str).apply(lambda x: x.split('/')[0]).str.strip()
-    df['rate'] = pd.to_numeric(df['rate'], errors='coerce')
+    # Each distinct rating string is parsed once and broadcast to its rows
+    df['rate'] = on_uniques(df['rate'], lambda rates: pd.to_numeric(
+        rates.astype(str).str.split('/').str[0].str.strip(), errors='coerce'))
     df = df.dropna(subset=['rate'])
     
     final_count = len(df)
@@ -132,7 +139,7 @@ if price_columns:
             # Try to extract numeric values from price column
             if df_price[col].dtype == 'object':
                 # Remove currency symbols and extract numbers
-                df_price[col] = df_price[col].astype(str).str.extract(r'(\d+)').astype(float)
+                df_price[col] = on_uniques(df_price[col], lambda prices: prices.astype(str).str.extract(r'(\d+)', expand=False).astype(float))
             else:
                 df_price[col] = pd.to_numeric(df_price[col], errors='coerce')
             
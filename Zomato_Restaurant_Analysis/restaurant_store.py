@@ -0,0 +1,21 @@
+import pandas as pd
+
+from eda_common import read_csv_parallel
+from eda_common.uniques import on_uniques
+
+
+def load_restaurants(csv_path):
+    """
+    Loads the Zomato listings and keeps the rated ones, with rate parsed
+    from strings such as "4.1/5" to a number and cuisines as strings.
+    """
+    # Multi-line quoted fields (e.g. reviews_list) are kept whole by the parallel reader
+    df = read_csv_parallel(csv_path, encoding='latin-1', dtype={"column_name": str})
+
+    df = df[df['rate'].notnull() & (df['rate'] != 'NEW') & (df['rate'] != '-')]
+    # Ratings repeat a few dozen distinct strings ("4.1/5"); parse each one once
+    df['rate'] = on_uniques(df['rate'], lambda rates: pd.to_numeric(
+        rates.astype(str).str.split('/').str[0].str.strip(), errors='coerce'))
+    df = df[df['rate'].notnull()]
+    df['cuisines'] = df['cuisines'].astype(str)
+    return df
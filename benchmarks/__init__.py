@@ -0,0 +1,8 @@
+"""
+Timings and peak memory of every project's load_data and of the aggregates
+its dashboard and notebook compute, at several data scale factors, with a
+comparison against a saved baseline.
+"""
+
+from .cases import CASES
+from .runner import compare, load_results, run_benchmarks, save_results, select_cases
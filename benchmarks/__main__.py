@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+
+from synthetic_data import DATASETS
+
+from .runner import compare, format_comparison, load_results, run_benchmarks, save_results, select_cases
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Times the dashboards' and notebooks' load and aggregation paths and compares them "
+                    "with a saved baseline.")
+    parser.add_argument('datasets', nargs='*', metavar='dataset',
+                        help=f"datasets to benchmark (default: all of {', '.join(DATASETS)})")
+    parser.add_argument('--match', help="only cases whose name contains this text")
+    parser.add_argument('--scales', type=float, nargs='+', default=[0.1, 1],
+                        help="data scale factors, relative to the real files (default: 0.1 1)")
+    parser.add_argument('--data', help="benchmark the files in this directory (laid out like the repository) "
+                                       "instead of synthetic data")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case (default 3)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run of each case")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic data seed (default 0)")
+    parser.add_argument('--jobs', type=int, default=None, help="data generation processes (default: one per core)")
+    parser.add_argument('--work', default=os.path.join('.cache', 'benchmarks'),
+                        help="directory for generated data and scratch files (default: .cache/benchmarks)")
+    parser.add_argument('--out', default=os.path.join('.cache', 'benchmarks', 'results.json'),
+                        help="results file to write (default: .cache/benchmarks/results.json)")
+    parser.add_argument('--results', help="compare an existing results file instead of running the cases")
+    parser.add_argument('--baseline', default=os.path.join('benchmarks', 'baseline.json'),
+                        help="baseline to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed slowdown or memory growth over the baseline, as a fraction (default 0.2)")
+    parser.add_argument('--save-baseline', action='store_true', help="also write the results as the new baseline")
+    args = parser.parse_args()
+    unknown = [name for name in args.datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"unknown datasets {unknown}; choose from {', '.join(DATASETS)}")
+
+    if args.results:
+        results = load_results(args.results)
+    else:
+        cases = select_cases(args.datasets, args.match)
+        if not cases:
+            parser.error("no benchmark cases match")
+        results = run_benchmarks(cases, args.scales, work_dir=args.work, data_dir=args.data, repeat=args.repeat,
+                                 memory=not args.no_memory, seed=args.seed, jobs=args.jobs)
+        save_results(results, args.out)
+        print(f"Results written to {args.out}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+
+    baseline = load_results(args.baseline)
+    if baseline['environment'] != results['environment']:
+        print("Note: the baseline was measured on a different machine or library versions.")
+    rows = compare(results, baseline, args.threshold)
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"{len(regressions)} of {len(rows)} cases regressed by more than {args.threshold:.0%}.")
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == '__main__':
+    main()
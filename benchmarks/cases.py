@@ -0,0 +1,427 @@
+import os
+import sys
+
+import numpy as np
+
+# The project helper modules (flight_store, trip_store, ...) sit next to each
+# dashboard and are imported by name, as the dashboards do from their folder
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for project in ['Airbnb', 'Flight_Delay', 'IPL', 'Netflix_Titles', 'Spotify_Song_Analysis', 'Superstore_Sales_Analysis',
+                'Titanic', 'Uber', 'Zomato_Restaurant_Analysis']:
+    sys.path.append(os.path.join(REPO_DIR, project))
+
+from eda_common.bitmaps import BitmapIndex
+from eda_common.density import map_window, raster_counts, viewport_bounds
+from eda_common.summary_stats import group_stats, summarize
+from flight_store import (build_delay_cube, build_delay_histogram, clean_flights, load_delay_cube, load_flights,
+                          merge_cubes, merge_histograms, read_flights_csv, rollup)
+from ipl_store import MatchStore, PlayerStats, fall_of_wickets, load_upload, over_summary
+from listing_store import load_listings
+from passenger_store import FILTER_COLUMNS, load_passengers
+from restaurant_store import load_restaurants
+from sales_store import OrderStore
+from song_store import SimilarityIndex, load_songs
+from title_store import load_titles
+from trip_store import TripStore
+from uber_dataset import UberDataset
+
+# Input files, relative to the data directory (the repository layout)
+AIRBNB_CSV = 'Airbnb/AB_NYC_2019.csv'
+FLIGHTS_CSV = 'Flight_Delay/flights_sample_3m.csv'
+MATCHES_CSV = 'IPL/Matches.csv'
+DELIVERIES_CSV = 'IPL/Deliveries.csv'
+NETFLIX_CSV = 'Netflix_Titles/netflix_titles.csv'
+SPOTIFY_CSV = 'Spotify_Song_Analysis/Spotify.csv'
+SUPERSTORE_CSV = 'Superstore_Sales_Analysis/Sample Superstore.csv'
+TITANIC_CSV = 'Titanic/titanic.csv'
+UBER_CSV = 'Uber/Uber_Data.csv'
+ZOMATO_CSV = 'Zomato_Restaurant_Analysis/zomato.csv'
+
+
+class Case:
+    """
+    One benchmark: setup(inputs) does the untimed preparation (loading the
+    frames an aggregate reads, warming a cache) and returns the
+    zero-argument callable whose run time and peak memory are measured.
+    """
+
+    def __init__(self, dataset, name, setup):
+        self.dataset = dataset
+        self.name = name
+        self.setup = setup
+
+
+# Every case, grouped by dataset (the synthetic_data name of its input files)
+CASES = []
+
+
+def case(dataset, name):
+    """
+    Registers the decorated setup function as a benchmark case.
+    """
+    def register(setup):
+        CASES.append(Case(dataset, name, setup))
+        return setup
+    return register
+
+
+# The load_data cases call the loaders the dashboards' load_data wrap, from the
+# project modules. On-disk caches go to scratch directories, never next to the input files.
+
+@case('airbnb', 'load_data')
+def airbnb_load_data(inputs):
+    path = inputs.path(AIRBNB_CSV)
+    return lambda: load_listings(path)
+
+
+@case('airbnb', 'borough price stats')
+def airbnb_borough_prices(inputs):
+    df, _ = inputs.shared('airbnb', lambda: load_listings(inputs.path(AIRBNB_CSV)))
+    return lambda: summarize(group_stats(df[df['price'] < 500], 'neighbourhood_group', 'price'))
+
+
+@case('airbnb', 'map area query')
+def airbnb_area_query(inputs):
+    df, listing_index = inputs.shared('airbnb', lambda: load_listings(inputs.path(AIRBNB_CSV)))
+
+    def query():
+        listings = df.iloc[listing_index.bbox(*viewport_bounds(40.73, -73.99, 13, 1000, 450))]
+        return listings['price'].describe(), listings['room_type'].value_counts(normalize=True)
+    return query
+
+
+@case('flights', 'load_data')
+def flights_load_data(inputs):
+    path = inputs.path(FLIGHTS_CSV)
+    # A fresh cache directory per run: the first start, which parses the CSV and writes the caches
+    return lambda: load_delay_cube(path, cache_dir=inputs.scratch())
+
+
+@case('flights', 'load_data (cached)')
+def flights_load_cached(inputs):
+    path = inputs.path(FLIGHTS_CSV)
+    cache_dir = inputs.scratch()
+    load_delay_cube(path, cache_dir=cache_dir)
+    return lambda: load_delay_cube(path, cache_dir=cache_dir)
+
+
+def flights_cube(inputs):
+    return inputs.shared('flights.cube', lambda: load_delay_cube(inputs.path(FLIGHTS_CSV), use_cache=False))[0]
+
+
+@case('flights', 'airline means')
+def flights_airline_means(inputs):
+    cube = flights_cube(inputs)
+    return lambda: rollup(cube, 'AIRLINE').sort_values('ARR_DELAY_MEAN', ascending=False)
+
+
+@case('flights', 'route means')
+def flights_route_means(inputs):
+    cube = flights_cube(inputs)
+    return lambda: rollup(cube, 'ROUTE').sort_values('ARR_DELAY_MEAN', ascending=False).head(10)
+
+
+@case('flights', 'monthly means')
+def flights_monthly_means(inputs):
+    cube = flights_cube(inputs)
+    return lambda: rollup(cube, 'MONTH')['ARR_DELAY_MEAN']
+
+
+@case('flights', 'airline filter')
+def flights_airline_filter(inputs):
+    cube = flights_cube(inputs)
+    bitmaps = BitmapIndex(cube, ['AIRLINE'])
+    airline = cube['AIRLINE'].value_counts().index[0]
+
+    def select():
+        filtered_cube = cube.iloc[bitmaps.rows(bitmaps.select({'AIRLINE': airline}))]
+        return int(filtered_cube['COUNT'].sum()), rollup(filtered_cube, 'ROUTE')
+    return select
+
+
+@case('flights', 'notebook streamed cube')
+def flights_streamed_cube(inputs):
+    path = inputs.path(FLIGHTS_CSV)
+
+    def stream():
+        cube = delay_hist = None
+        for chunk in read_flights_csv(path, chunksize=1_000_000):
+            chunk = clean_flights(chunk)
+            chunk_cube, chunk_hist = build_delay_cube(chunk), build_delay_histogram(chunk)
+            cube = chunk_cube if cube is None else merge_cubes([cube, chunk_cube])
+            delay_hist = chunk_hist if delay_hist is None else merge_histograms([delay_hist, chunk_hist])
+        return cube, delay_hist
+    return stream
+
+
+@case('flights', 'notebook route means')
+def flights_notebook_route_means(inputs):
+    df = inputs.shared('flights.frame', lambda: load_flights(inputs.path(FLIGHTS_CSV), use_cache=False))
+    return lambda: (summarize(group_stats(df, 'ROUTE', 'ARR_DELAY'))
+                    .sort_values('MEAN', ascending=False).head(10))
+
+
+def ipl_load(inputs):
+    with open(inputs.path(MATCHES_CSV), 'rb') as f:
+        matches = f.read()
+    with open(inputs.path(DELIVERIES_CSV), 'rb') as f:
+        deliveries = f.read()
+    return matches, deliveries
+
+
+@case('ipl', 'load_data')
+def ipl_load_data(inputs):
+    # The dashboard parses uploaded bytes; reading the files is not part of it
+    matches, deliveries = ipl_load(inputs)
+    return lambda: (load_upload(matches, 'matches', use_cache=False),
+                    load_upload(deliveries, 'deliveries', use_cache=False))
+
+
+def ipl_tables(inputs):
+    def parse():
+        matches, deliveries = ipl_load(inputs)
+        return load_upload(matches, 'matches', use_cache=False), load_upload(deliveries, 'deliveries', use_cache=False)
+    return inputs.shared('ipl', parse)
+
+
+@case('ipl', 'player stats')
+def ipl_player_stats(inputs):
+    matches, deliveries = ipl_tables(inputs)
+    return lambda: PlayerStats().updated(deliveries, matches).table()
+
+
+@case('ipl', 'team wins')
+def ipl_team_wins(inputs):
+    matches, _ = ipl_tables(inputs)
+    return lambda: matches['winner'].value_counts()
+
+
+@case('ipl', 'match drilldown')
+def ipl_match_drilldown(inputs):
+    _, deliveries = ipl_tables(inputs)
+    match_store = MatchStore(deliveries)
+    match_id = match_store.match_ids[len(match_store) // 2]
+
+    def drilldown():
+        balls = match_store.slice(match_id)
+        return over_summary(balls), fall_of_wickets(balls)
+    return drilldown
+
+
+@case('netflix', 'load_data')
+def netflix_load_data(inputs):
+    path = inputs.path(NETFLIX_CSV)
+    # A fresh cache directory per run builds the search index, as on the first start
+    return lambda: load_titles(path, inputs.scratch())
+
+
+@case('netflix', 'load_data (cached)')
+def netflix_load_cached(inputs):
+    path = inputs.path(NETFLIX_CSV)
+    cache_dir = inputs.scratch()
+    load_titles(path, cache_dir)
+    return lambda: load_titles(path, cache_dir)
+
+
+def netflix_tables(inputs):
+    return inputs.shared('netflix', lambda: load_titles(inputs.path(NETFLIX_CSV), inputs.scratch()))
+
+
+@case('netflix', 'genre counts')
+def netflix_genre_counts(inputs):
+    _, index, bitmaps, _ = netflix_tables(inputs)
+
+    def counts():
+        rows = bitmaps.positions(bitmaps.select({'type': 'Movie'}))
+        return index['genre'].counts(rows).head(10), index['country'].counts(rows).head(10)
+    return counts
+
+
+@case('netflix', 'notebook genre explode')
+def netflix_genre_explode(inputs):
+    titles = netflix_tables(inputs)[0]
+
+    def explode():
+        df = titles.assign(genre=titles['listed_in'].str.split(', '))
+        return df.explode('genre')['genre'].value_counts().reset_index()
+    return explode
+
+
+@case('netflix', 'title search')
+def netflix_title_search(inputs):
+    _, _, bitmaps, search_index = netflix_tables(inputs)
+    rows = bitmaps.positions(bitmaps.select({'type': 'Movie'}))
+    return lambda: search_index.search('love story', k=20, rows=rows)
+
+
+@case('spotify', 'load_data')
+def spotify_load_data(inputs):
+    path = inputs.path(SPOTIFY_CSV)
+    return lambda: load_songs(path)
+
+
+def spotify_tables(inputs):
+    return inputs.shared('spotify', lambda: load_songs(inputs.path(SPOTIFY_CSV)))
+
+
+@case('spotify', 'genre popularity')
+def spotify_genre_popularity(inputs):
+    df = spotify_tables(inputs)[0]
+    return lambda: df.groupby('genre')['popularity'].mean().sort_values(ascending=False).head(10)
+
+
+@case('spotify', 'feature correlation')
+def spotify_feature_correlation(inputs):
+    _, moments, bitmaps = spotify_tables(inputs)
+    genres = list(bitmaps.labels['genre'][:5])
+    return lambda: moments.corr(genres, (2010, 2019))
+
+
+@case('spotify', 'similarity index')
+def spotify_similarity_index(inputs):
+    df = spotify_tables(inputs)[0]
+    return lambda: SimilarityIndex.build(df)
+
+
+@case('spotify', 'similar songs')
+def spotify_similar_songs(inputs):
+    df = spotify_tables(inputs)[0]
+    index = inputs.shared('spotify.similarity', lambda: SimilarityIndex.build(df))
+    return lambda: index.similar(len(df) // 2, 10)
+
+
+@case('superstore', 'load_data')
+def superstore_load_data(inputs):
+    path = inputs.path(SUPERSTORE_CSV)
+
+    # A fresh store per run: the first start, which validates the CSV and writes the store and its rollups
+    def load():
+        store = OrderStore.open(path, directory=os.path.join(inputs.scratch(), 'orders'))
+        return store.cube(), store.pyramid()
+    return load
+
+
+@case('superstore', 'load_data (cached)')
+def superstore_load_cached(inputs):
+    path = inputs.path(SUPERSTORE_CSV)
+    directory = os.path.join(inputs.scratch(), 'orders')
+    OrderStore.open(path, directory=directory)
+
+    def load():
+        store = OrderStore.open(path, directory=directory)
+        return store.cube(), store.pyramid()
+    return load
+
+
+def superstore_rollups(inputs):
+    def load():
+        store = OrderStore.open(inputs.path(SUPERSTORE_CSV), directory=os.path.join(inputs.scratch(), 'orders'))
+        return store.cube(), store.pyramid()
+    return inputs.shared('superstore', load)
+
+
+@case('superstore', 'category totals')
+def superstore_category_totals(inputs):
+    cube, _ = superstore_rollups(inputs)
+    return lambda: [cube.totals(by) for by in ['Category', 'Segment', 'Region', 'Sub-Category']]
+
+
+@case('superstore', 'drilldown')
+def superstore_drilldown(inputs):
+    cube, _ = superstore_rollups(inputs)
+    category = cube.totals('Category')['Sales'].idxmax()
+    return lambda: cube.drill('Product', (category,), {'Region': ['West']})
+
+
+@case('superstore', 'monthly trend')
+def superstore_monthly_trend(inputs):
+    _, pyramid = superstore_rollups(inputs)
+    return lambda: pyramid.series('Month', by='Category')
+
+
+def titanic_load(path):
+    # The dashboard's load_data and load_bitmaps together
+    df = load_passengers(path)
+    return df, BitmapIndex(df, FILTER_COLUMNS)
+
+
+@case('titanic', 'load_data')
+def titanic_load_data(inputs):
+    path = inputs.path(TITANIC_CSV)
+    return lambda: titanic_load(path)
+
+
+@case('titanic', 'survival filter')
+def titanic_survival_filter(inputs):
+    _, bitmaps = inputs.shared('titanic', lambda: titanic_load(inputs.path(TITANIC_CSV)))
+    return lambda: bitmaps.counts('Survived', bitmaps.select({'Pclass': 3, 'Sex': 'female'}))
+
+
+@case('titanic', 'notebook survival by class')
+def titanic_survival_by_class(inputs):
+    df, _ = inputs.shared('titanic', lambda: titanic_load(inputs.path(TITANIC_CSV)))
+    return lambda: df.groupby(['Pclass', 'Sex'])['Survived'].mean().unstack()
+
+
+def uber_load(path):
+    dataset = UberDataset(path)
+    dataset.refresh()
+    return dataset, TripStore(dataset.frame())
+
+
+@case('uber', 'load_data')
+def uber_load_data(inputs):
+    path = inputs.path(UBER_CSV)
+    return lambda: uber_load(path)
+
+
+def uber_tables(inputs):
+    return inputs.shared('uber', lambda: uber_load(inputs.path(UBER_CSV)))
+
+
+@case('uber', 'notebook hour counts')
+def uber_hour_counts(inputs):
+    df = uber_tables(inputs)[1].trips
+    return lambda: df['Hour'].value_counts().sort_index()
+
+
+@case('uber', 'hour x weekday counts')
+def uber_hour_weekday_counts(inputs):
+    dataset, _ = uber_tables(inputs)
+    return dataset.hour_weekday_counts
+
+
+@case('uber', 'pickup raster')
+def uber_pickup_raster(inputs):
+    _, store = uber_tables(inputs)
+    window = map_window(*viewport_bounds(40.75, -73.95, 12, 1000, 600), 12)
+    day = store.days[len(store.days) // 2]
+
+    def raster():
+        trips = store.slice(day, 18)
+        return raster_counts(trips['Lat'], trips['Lon'], window)
+    return raster
+
+
+@case('zomato', 'load_data')
+def zomato_load_data(inputs):
+    path = inputs.path(ZOMATO_CSV)
+    return lambda: load_restaurants(path)
+
+
+@case('zomato', 'location counts')
+def zomato_location_counts(inputs):
+    df = inputs.shared('zomato', lambda: load_restaurants(inputs.path(ZOMATO_CSV)))
+    return lambda: df['location'].value_counts().head(10)
+
+
+@case('zomato', 'cuisine explode')
+def zomato_cuisine_explode(inputs):
+    df = inputs.shared('zomato', lambda: load_restaurants(inputs.path(ZOMATO_CSV)))
+    return lambda: df['cuisines'].str.split(', ').explode().value_counts().head(10)
+
+
+@case('zomato', 'rating histogram')
+def zomato_rating_histogram(inputs):
+    df = inputs.shared('zomato', lambda: load_restaurants(inputs.path(ZOMATO_CSV)))
+    return lambda: np.histogram(df['rate'], bins=20)
@@ -0,0 +1,268 @@
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import DATASETS, generate
+
+from .cases import CASES
+
+RESULTS_VERSION = 1
+
+# A case regresses when its median time (or peak memory) grows by more than the
+# threshold over the baseline, and by more than these absolute margins, so that
+# timer noise on millisecond aggregates is not reported
+MIN_SECONDS = 0.005
+MIN_MB = 1.0
+
+
+class Inputs:
+    """
+    The data directory of one scale factor, handed to every case's setup:
+    paths of the input files, scratch directories for the caches and stores
+    a case writes, and frames loaded once and shared by the cases of a dataset.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.scratch_root = None
+        self._shared = {}
+
+    def path(self, relative):
+        return os.path.join(self.directory, relative)
+
+    def scratch(self):
+        """
+        A new empty directory, removed when the current case is done.
+        """
+        return tempfile.mkdtemp(dir=self.scratch_root)
+
+    def shared(self, key, build):
+        """
+        The result of build(), computed on first use and kept until release().
+        """
+        if key not in self._shared:
+            self._shared[key] = build()
+        return self._shared[key]
+
+    def release(self):
+        self._shared.clear()
+
+
+def scale_label(scale):
+    return f"{scale:g}"
+
+
+def prepare_inputs(directory, datasets, scale, seed=0, jobs=None):
+    """
+    Makes sure directory holds synthetic files of the given datasets at a
+    scale factor and seed, generating only those that are missing or were
+    written with other settings. Returns {dataset: rows of its main table}.
+    """
+    manifest_path = os.path.join(directory, 'inputs.json')
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get('scale') != scale or manifest.get('seed') != seed:
+        manifest = {'scale': scale, 'seed': seed, 'rows': {}}
+
+    for name in datasets:
+        paths = [os.path.join(directory, path) for path in DATASETS[name].FILES.values()]
+        if name in manifest['rows'] and all(os.path.exists(path) for path in paths):
+            continue
+        written = generate([name], scale=scale, out_dir=directory, seed=seed, jobs=jobs)
+        manifest['rows'][name] = next(iter(written.values()))
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    return {name: manifest['rows'][name] for name in datasets}
+
+
+def measure(run, repeat=3, memory=True):
+    """
+    Calls run() repeat times and once more under tracemalloc. Returns the
+    median and fastest wall time in seconds and the peak of memory
+    allocated by the call (what it builds and returns, not what the process
+    already held), in MB. Allocations made in worker processes or by
+    Arrow's own memory pool are not seen by tracemalloc.
+    """
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = run()
+        runs.append(time.perf_counter() - started)
+        del result
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+        del result
+    return {
+        'seconds': statistics.median(runs),
+        'min_seconds': min(runs),
+        'runs': runs,
+        'peak_mb': peak_mb,
+    }
+
+
+def environment():
+    """
+    The machine and library versions the results were measured with.
+    """
+    try:
+        import pyarrow
+        arrow_version = pyarrow.__version__
+    except ImportError:
+        arrow_version = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': arrow_version,
+    }
+
+
+def select_cases(datasets=None, match=None):
+    """
+    The registered cases of the given datasets (all by default) whose name contains match.
+    """
+    unknown = [name for name in datasets or [] if name not in DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown datasets {unknown}; choose from {list(DATASETS)}")
+    return [case for case in CASES
+            if (not datasets or case.dataset in datasets) and (not match or match in case.name)]
+
+
+def run_benchmarks(cases, scales=(1,), work_dir='.cache/benchmarks', data_dir=None, repeat=3, memory=True,
+                   seed=0, jobs=None, log=print):
+    """
+    Runs the cases at each scale factor on synthetic data generated (once)
+    under work_dir, or once on the files in data_dir, laid out like the
+    repository. Returns the results document: the environment, the input
+    row counts per scale and one entry per case and scale.
+    """
+    datasets = list(dict.fromkeys(case.dataset for case in cases))
+    if data_dir is not None:
+        runs = [('data', data_dir, None)]
+    else:
+        runs = [(scale_label(scale), os.path.join(work_dir, 'data', f"scale-{scale_label(scale)}"), scale)
+                for scale in scales]
+
+    results = {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'settings': {'repeat': repeat, 'seed': seed, 'memory': memory},
+        'inputs': {},
+        'results': [],
+    }
+    os.makedirs(work_dir, exist_ok=True)
+    for label, directory, scale in runs:
+        if scale is not None:
+            log(f"Preparing inputs at scale {label} in {directory}")
+            results['inputs'][label] = prepare_inputs(directory, datasets, scale, seed, jobs)
+        else:
+            # Given files: datasets that are not all there (the large files are downloaded separately) are skipped
+            missing = [name for name in datasets if not all(
+                os.path.exists(os.path.join(directory, path)) for path in DATASETS[name].FILES.values())]
+            if missing:
+                log(f"Skipping {', '.join(missing)}: input files not found in {directory}")
+            cases = [case for case in cases if case.dataset not in missing]
+        inputs = Inputs(directory)
+        for i, case in enumerate(cases):
+            inputs.scratch_root = tempfile.mkdtemp(prefix='scratch-', dir=work_dir)
+            try:
+                measured = measure(case.setup(inputs), repeat, memory)
+            finally:
+                shutil.rmtree(inputs.scratch_root, ignore_errors=True)
+            results['results'].append({'dataset': case.dataset, 'case': case.name, 'scale': label, **measured})
+            peak = '' if measured['peak_mb'] is None else f"  peak {measured['peak_mb']:9.1f} MB"
+            log(f"  {label:>6}  {case.dataset:<10} {case.name:<28} {measured['seconds']:9.4f} s{peak}")
+            # Frames shared by a dataset's cases are dropped once its last case has run
+            if i + 1 == len(cases) or cases[i + 1].dataset != case.dataset:
+                inputs.release()
+    return results
+
+
+def save_results(results, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        results = json.load(f)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} benchmark results file")
+    return results
+
+
+def compare(results, baseline, threshold=0.2, min_seconds=MIN_SECONDS, min_mb=MIN_MB):
+    """
+    Compares each case and scale of results with the baseline. Returns one
+    row per entry with the baseline and current median time and peak
+    memory, their ratios and a status: 'regression' when either grew by
+    more than threshold (a fraction) and the absolute margin, 'improved'
+    when the time shrank by as much, 'ok', or 'new' without a baseline entry.
+    """
+    previous = {(entry['dataset'], entry['case'], entry['scale']): entry for entry in baseline['results']}
+    rows = []
+    for entry in results['results']:
+        row = {'dataset': entry['dataset'], 'case': entry['case'], 'scale': entry['scale'],
+               'seconds': entry['seconds'], 'peak_mb': entry['peak_mb'],
+               'base_seconds': None, 'base_peak_mb': None, 'time_ratio': None, 'memory_ratio': None, 'status': 'new'}
+        base = previous.get((entry['dataset'], entry['case'], entry['scale']))
+        if base is not None:
+            row['base_seconds'], row['base_peak_mb'] = base['seconds'], base['peak_mb']
+            row['time_ratio'] = entry['seconds'] / base['seconds'] if base['seconds'] else None
+            slower = (entry['seconds'] > base['seconds'] * (1 + threshold)
+                      and entry['seconds'] - base['seconds'] > min_seconds)
+            faster = (entry['seconds'] < base['seconds'] / (1 + threshold)
+                      and base['seconds'] - entry['seconds'] > min_seconds)
+            bigger = False
+            if entry['peak_mb'] is not None and base['peak_mb'] is not None:
+                row['memory_ratio'] = entry['peak_mb'] / base['peak_mb'] if base['peak_mb'] else None
+                bigger = (entry['peak_mb'] > base['peak_mb'] * (1 + threshold)
+                          and entry['peak_mb'] - base['peak_mb'] > min_mb)
+            row['status'] = 'regression' if slower or bigger else 'improved' if faster else 'ok'
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows):
+    """
+    The comparison as a fixed-width text table.
+    """
+    def number(value, spec):
+        return '-' if value is None else format(value, spec)
+
+    lines = [f"{'scale':>6}  {'dataset':<10} {'case':<28} {'base s':>9} {'now s':>9} {'x':>6} "
+             f"{'base MB':>9} {'now MB':>9} {'x':>6}  status"]
+    for row in rows:
+        lines.append(f"{row['scale']:>6}  {row['dataset']:<10} {row['case']:<28} "
+                     f"{number(row['base_seconds'], '9.4f')} {number(row['seconds'], '9.4f')} "
+                     f"{number(row['time_ratio'], '6.2f')} {number(row['base_peak_mb'], '9.1f')} "
+                     f"{number(row['peak_mb'], '9.1f')} {number(row['memory_ratio'], '6.2f')}  {row['status']}")
+    return '\n'.join(lines)
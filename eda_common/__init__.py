@@ -0,0 +1,4 @@
+"""
+Helpers shared by the dashboards and notebooks of the individual EDA projects.
+"""
+from .parallel_csv import read_csv_parallel
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+# Number of set bits in each byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class BitmapIndex:
+    """
+    One packed bitmap (a bit per row, 8 rows per byte) per distinct value of
+    each low-cardinality filter column, built once at load. A sidebar
+    selection is answered by OR-ing the bitmaps of the selected values of a
+    column and AND-ing the columns, which touches n_rows / 8 bytes per
+    bitmap and never the frame itself; the result becomes row positions
+    (or a no-copy slice when nothing is filtered out) only at the end.
+    """
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.n_bytes = (self.n_rows + 7) // 8
+        self.labels = {}
+        self.bitmaps = {}
+        for col in columns:
+            codes, labels = pd.factorize(df[col], sort=True)
+            self.labels[col] = pd.Index(labels)
+            # Sorting the rows by value once lets each bitmap be packed from a contiguous run
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            bitmaps = np.zeros((len(labels), self.n_bytes), dtype=np.uint8)
+            member = np.zeros(self.n_bytes * 8, dtype=bool)
+            for i in range(len(labels)):
+                rows = order[bounds[i]:bounds[i + 1]]
+                member[rows] = True
+                bitmaps[i] = np.packbits(member)
+                member[rows] = False
+            self.bitmaps[col] = bitmaps
+
+    def all(self):
+        """
+        Bitmap with every row set.
+        """
+        bits = np.full(self.n_bytes, 0xFF, dtype=np.uint8)
+        if self.n_rows % 8:
+            bits[-1] = (0xFF << (8 - self.n_rows % 8)) & 0xFF
+        return bits
+
+    def bitmap(self, column, values):
+        """
+        Rows whose column holds any of the values (unknown values match nothing).
+        """
+        values = [values] if np.isscalar(values) else list(values)
+        ids = self.labels[column].get_indexer(values)
+        ids = ids[ids >= 0]
+        if len(ids) == 0:
+            return np.zeros(self.n_bytes, dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[column][ids], axis=0)
+
+    def between(self, column, low, high):
+        """
+        Rows whose column value lies in [low, high]; the labels of an ordered
+        column are sorted, so the range is one contiguous run of bitmaps.
+        """
+        labels = self.labels[column]
+        lo, hi = labels.searchsorted(low, side='left'), labels.searchsorted(high, side='right')
+        if lo >= hi:
+            return np.zeros(self.n_bytes, dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[column][lo:hi], axis=0)
+
+    def select(self, filters=None, ranges=None):
+        """
+        Bitmap of the rows matching every filter ({column: value or list of
+        values}, any of which may match) and every range ({column: (low,
+        high)}). Filters set to None, "All" or an empty list are ignored.
+        """
+        bits = self.all()
+        for column, values in (filters or {}).items():
+            if values is None or (isinstance(values, str) and values == "All"):
+                continue
+            if not np.isscalar(values) and len(values) == 0:
+                continue
+            bits &= self.bitmap(column, values)
+        for column, (low, high) in (ranges or {}).items():
+            bits &= self.between(column, low, high)
+        return bits
+
+    def pack(self, positions):
+        """
+        Bitmap of the given row positions, e.g. to AND in the result of another index.
+        """
+        member = np.zeros(self.n_bytes * 8, dtype=bool)
+        member[positions] = True
+        return np.packbits(member)
+
+    def count(self, bits):
+        """
+        Number of selected rows.
+        """
+        return int(POPCOUNT[bits].sum(dtype=np.int64))
+
+    def counts(self, column, bits=None):
+        """
+        Number of selected rows per value of a column, from the bitmaps alone.
+        """
+        bitmaps = self.bitmaps[column] if bits is None else self.bitmaps[column] & bits
+        return pd.Series(POPCOUNT[bitmaps].sum(axis=1, dtype=np.int64), index=self.labels[column], name='count')
+
+    def mask(self, bits):
+        return np.unpackbits(bits, count=self.n_rows).view(bool)
+
+    def positions(self, bits):
+        """
+        Sorted positions of the selected rows.
+        """
+        return np.flatnonzero(self.mask(bits))
+
+    def rows(self, bits):
+        """
+        Row selection for .iloc or NumPy indexing: the positions of the
+        selected rows, or slice(None) when every row is selected, so the
+        unfiltered case takes no copy.
+        """
+        if self.count(bits) == self.n_rows:
+            return slice(None)
+        return self.positions(bits)
@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# Web map tiles are 256 px squares; a zoom level z spans 256 * 2**z px around the globe
+TILE_SIZE = 256
+
+# Largest raster (in cells) rendered for one map window; bigger windows are binned coarser
+MAX_RASTER_CELLS = 4_000_000
+
+
+# Default grid (columns, rows) of the density scatter, about one cell per screen pixel
+DENSITY_BINS = (400, 300)
+
+
+def _grid_cells(x, y, x_edges, y_edges):
+    """
+    Flat row-major cell id of each point on a regular grid, and the mask of
+    the points that fall inside it.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    nx, ny = len(x_edges) - 1, len(y_edges) - 1
+    ix = np.floor((x - x_edges[0]) / (x_edges[-1] - x_edges[0]) * nx)
+    iy = np.floor((y - y_edges[0]) / (y_edges[-1] - y_edges[0]) * ny)
+    # Points exactly on the last edge belong to the last cell, as in np.histogram2d
+    ix[x == x_edges[-1]] = nx - 1
+    iy[y == y_edges[-1]] = ny - 1
+    inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+    return iy[inside].astype(np.int64) * nx + ix[inside].astype(np.int64), inside
+
+
+def bin_counts(x, y, x_edges, y_edges):
+    """
+    Counts points per cell of a regular grid with np.bincount. Returns an
+    array of shape (len(y_edges) - 1, len(x_edges) - 1); points outside the
+    edges or with missing coordinates are ignored.
+    """
+    nx, ny = len(x_edges) - 1, len(y_edges) - 1
+    cells, _ = _grid_cells(x, y, x_edges, y_edges)
+    return np.bincount(cells, minlength=nx * ny).reshape(ny, nx)
+
+
+def bin_category_counts(x, y, codes, n_categories, x_edges, y_edges):
+    """
+    Like bin_counts, but counts each category separately in one bincount.
+    codes are integer category ids (negative for missing); returns an array
+    of shape (n_categories, len(y_edges) - 1, len(x_edges) - 1).
+    """
+    nx, ny = len(x_edges) - 1, len(y_edges) - 1
+    cells, inside = _grid_cells(x, y, x_edges, y_edges)
+    codes = np.asarray(codes, dtype=np.int64)[inside]
+    keys = codes[codes >= 0] * (nx * ny) + cells[codes >= 0]
+    return np.bincount(keys, minlength=n_categories * nx * ny).reshape(n_categories, ny, nx)
+
+
+def shade(counts, cmap='inferno', min_alpha=0.35):
+    """
+    Turns a grid of counts into an RGBA uint8 image on a log scale. Empty
+    cells are fully transparent so the image can be laid over a base map.
+    """
+    counts = np.asarray(counts, dtype='float64')
+    peak = counts.max() if counts.size else 0
+    level = np.log1p(counts) / np.log1p(peak) if peak > 0 else np.zeros_like(counts)
+    rgba = matplotlib.colormaps[cmap](level)
+    rgba[..., 3] = np.where(counts > 0, min_alpha + (1 - min_alpha) * level, 0)
+    return (rgba * 255).round().astype(np.uint8)
+
+
+def shade_categories(counts, colors, min_alpha=0.35):
+    """
+    Turns per-category count grids (n_categories, rows, columns) into an RGBA
+    uint8 image: each cell is the count-weighted mix of the category colors,
+    with opacity on a log scale of the cell's total count.
+    """
+    counts = np.asarray(counts, dtype='float64')
+    total = counts.sum(axis=0)
+    peak = total.max() if total.size else 0
+    level = np.log1p(total) / np.log1p(peak) if peak > 0 else np.zeros_like(total)
+    rgba = np.zeros(total.shape + (4,))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rgba[..., :3] = np.nan_to_num(np.tensordot(counts, np.asarray(colors)[:, :3], axes=(0, 0))
+                                      / total[..., None])
+    rgba[..., 3] = np.where(total > 0, min_alpha + (1 - min_alpha) * level, 0)
+    return (rgba * 255).round().astype(np.uint8)
+
+
+def _axis_edges(values, n_bins):
+    """
+    Bin edges spanning the values. Integer values with fewer distinct steps
+    than bins (e.g. a 0-100 popularity score) get one bin per integer, so
+    the image has no empty stripes between them.
+    """
+    lo, hi = values.min(), values.max()
+    if hi - lo < n_bins and np.all(values == np.round(values)):
+        return np.arange(lo - 0.5, hi + 1)
+    # A constant axis still needs a non-empty range
+    return np.linspace(lo, hi if hi > lo else lo + 1, n_bins + 1)
+
+
+def density_scatter(x, y, hue=None, bins=DENSITY_BINS, cmap='inferno', palette=None, ax=None):
+    """
+    Scatter plot of every point drawn as one shaded image: the points are
+    binned into a bins=(columns, rows) grid spanning their range and the
+    grid is drawn with imshow, so drawing costs the same for any number of
+    rows. Without hue the cells are colored by log count; with hue (e.g. a
+    genre column) each cell mixes the category colors by count, and the
+    categories get legend entries as with sns.scatterplot.
+    """
+    ax = plt.gca() if ax is None else ax
+    xv = np.asarray(x, dtype='float64')
+    yv = np.asarray(y, dtype='float64')
+    known = np.isfinite(xv) & np.isfinite(yv)
+    if not known.any():
+        return ax
+    x_edges = _axis_edges(xv[known], bins[0])
+    y_edges = _axis_edges(yv[known], bins[1])
+    x_lo, x_hi, y_lo, y_hi = x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]
+
+    if hue is None:
+        image = shade(bin_counts(xv, yv, x_edges, y_edges), cmap)
+    else:
+        codes, labels = pd.factorize(pd.Series(hue).reset_index(drop=True), sort=True)
+        # Like seaborn, fall back to evenly spaced husl colors when the default cycle is too short
+        if palette is None and len(labels) > len(sns.color_palette()):
+            palette = 'husl'
+        colors = np.asarray(sns.color_palette(palette, len(labels)))
+        image = shade_categories(bin_category_counts(xv, yv, codes, len(labels), x_edges, y_edges), colors)
+        # Empty artists so ax.legend() lists the categories
+        for label, color in zip(labels, colors):
+            ax.scatter([], [], color=color, label=label, s=20)
+    ax.imshow(image, extent=(x_lo, x_hi, y_lo, y_hi), origin='lower', aspect='auto', interpolation='nearest',
+              zorder=1)
+    ax.set_xlim(x_lo, x_hi)
+    ax.set_ylim(y_lo, y_hi)
+    if getattr(x, 'name', None) is not None:
+        ax.set_xlabel(x.name)
+    if getattr(y, 'name', None) is not None:
+        ax.set_ylabel(y.name)
+    return ax
+
+
+def lonlat_to_pixels(lon, lat, zoom):
+    """
+    Projects longitude/latitude to Web Mercator world pixel coordinates at a zoom level.
+    """
+    world = TILE_SIZE * 2 ** zoom
+    lat = np.clip(np.asarray(lat, dtype='float64'), -85.05112878, 85.05112878)
+    x = (np.asarray(lon, dtype='float64') + 180) / 360 * world
+    y = (1 - np.log(np.tan(np.radians(lat)) + 1 / np.cos(np.radians(lat))) / np.pi) / 2 * world
+    return x, y
+
+
+def pixels_to_lonlat(x, y, zoom):
+    """
+    Inverse of lonlat_to_pixels.
+    """
+    world = TILE_SIZE * 2 ** zoom
+    lon = np.asarray(x, dtype='float64') / world * 360 - 180
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(y, dtype='float64') / world))))
+    return lon, lat
+
+
+def viewport_bounds(center_lat, center_lon, zoom, width, height):
+    """
+    Returns the (south, west, north, east) bounds a width x height px map
+    shows when centred on the given point at a zoom level.
+    """
+    x, y = lonlat_to_pixels(center_lon, center_lat, zoom)
+    west, north = pixels_to_lonlat(x - width / 2, y - height / 2, zoom)
+    east, south = pixels_to_lonlat(x + width / 2, y + height / 2, zoom)
+    return float(south), float(west), float(north), float(east)
+
+
+def map_window(south, west, north, east, zoom, pad=0.5):
+    """
+    Returns the raster window for a map viewport: the viewport padded by
+    ``pad`` of its size on every side and snapped outwards to tile edges, as
+    ``(zoom, x0, y0, x1, y1)`` in world pixels. Small pans map to the same
+    window, so its raster can be cached and reused.
+    """
+    zoom = int(round(zoom))
+    x0, y0 = lonlat_to_pixels(west, north, zoom)
+    x1, y1 = lonlat_to_pixels(east, south, zoom)
+    pad_x, pad_y = (x1 - x0) * pad, (y1 - y0) * pad
+    world = TILE_SIZE * 2 ** zoom
+    x0 = max(int(np.floor((x0 - pad_x) / TILE_SIZE)) * TILE_SIZE, 0)
+    y0 = max(int(np.floor((y0 - pad_y) / TILE_SIZE)) * TILE_SIZE, 0)
+    x1 = min(int(np.ceil((x1 + pad_x) / TILE_SIZE)) * TILE_SIZE, world)
+    y1 = min(int(np.ceil((y1 + pad_y) / TILE_SIZE)) * TILE_SIZE, world)
+    return zoom, x0, y0, x1, y1
+
+
+def window_bounds(window):
+    """
+    Returns the [[south, west], [north, east]] bounds of a raster window.
+    """
+    zoom, x0, y0, x1, y1 = window
+    west, north = pixels_to_lonlat(x0, y0, zoom)
+    east, south = pixels_to_lonlat(x1, y1, zoom)
+    return [[float(south), float(west)], [float(north), float(east)]]
+
+
+def raster_counts(lat, lon, window):
+    """
+    Bins every point into the window's screen pixels (row 0 is the north
+    edge). Windows larger than MAX_RASTER_CELLS are binned into square
+    blocks of 2**k pixels instead.
+    """
+    zoom, x0, y0, x1, y1 = window
+    block = 1
+    while ((x1 - x0) // block) * ((y1 - y0) // block) > MAX_RASTER_CELLS:
+        block *= 2
+    x, y = lonlat_to_pixels(lon, lat, zoom)
+    x_edges = np.arange(x0, x1 + 1, block, dtype='float64')
+    y_edges = np.arange(y0, y1 + 1, block, dtype='float64')
+    return bin_counts(x, y, x_edges, y_edges)
@@ -0,0 +1,68 @@
+import matplotlib
+import numpy as np
+from branca.colormap import StepColormap
+from folium.map import Layer
+from jinja2 import Template
+
+
+class CanvasPointLayer(Layer):
+    """
+    Draws many points as circle markers on one shared Leaflet canvas. The
+    coordinates and colour classes are embedded as flat arrays built with
+    NumPy, so the page holds three arrays rather than a marker object per
+    point. Classes come from the edges (index) of a StepColormap; add the
+    colormap to the map as well to show a legend.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function() {
+                var renderer = L.canvas({padding: 0.5});
+                var lat = {{ this.lat|tojson }};
+                var lon = {{ this.lon|tojson }};
+                var cls = {{ this.classes|tojson }};
+                var palette = {{ this.palette|tojson }};
+                var group = L.layerGroup();
+                for (var i = 0; i < lat.length; i++) {
+                    L.circleMarker([lat[i], lon[i]], {
+                        renderer: renderer,
+                        radius: {{ this.radius }},
+                        stroke: false,
+                        fillColor: palette[cls[i]],
+                        fillOpacity: {{ this.opacity }}
+                    }).addTo(group);
+                }
+                return group;
+            })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, lat, lon, values, colormap, radius=2, opacity=0.7, name=None, overlay=True,
+                 control=True, show=True):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = 'CanvasPointLayer'
+        lat = np.asarray(lat, dtype='float64')
+        lon = np.asarray(lon, dtype='float64')
+        values = np.asarray(values, dtype='float64')
+        keep = ~(np.isnan(lat) | np.isnan(lon) | np.isnan(values))
+        edges = np.asarray(colormap.index, dtype='float64')
+        # Class i covers [edges[i], edges[i + 1]); out-of-range values take the end classes
+        classes = np.clip(np.searchsorted(edges, values[keep], side='right') - 1, 0, len(edges) - 2)
+        # Five decimals is about one metre, plenty for a city map
+        self.lat = np.round(lat[keep], 5).tolist()
+        self.lon = np.round(lon[keep], 5).tolist()
+        self.classes = classes.tolist()
+        self.palette = [colormap.rgb_hex_str((lo + hi) / 2) for lo, hi in zip(edges[:-1], edges[1:])]
+        self.radius = radius
+        self.opacity = opacity
+
+
+def step_colormap(edges, cmap='viridis', caption=''):
+    """
+    Builds a branca StepColormap with one colour of a matplotlib colormap per class.
+    """
+    colors = matplotlib.colormaps[cmap](np.linspace(0, 1, len(edges) - 1))
+    return StepColormap([tuple(c) for c in colors], index=list(edges), vmin=edges[0], vmax=edges[-1],
+                        caption=caption)
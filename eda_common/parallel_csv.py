@@ -0,0 +1,139 @@
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Below this size one pd.read_csv call beats starting a process pool
+MIN_PARALLEL_BYTES = 32 * 1024 * 1024
+
+# read_csv options that depend on absolute row positions, change how records
+# are delimited, or return iterators. Reads using any of them stay serial.
+SERIAL_ONLY_OPTIONS = {
+    'header', 'names', 'index_col', 'skiprows', 'skipfooter', 'nrows', 'chunksize',
+    'iterator', 'comment', 'quotechar', 'quoting', 'doublequote', 'escapechar',
+    'lineterminator', 'compression', 'memory_map',
+}
+
+
+def _count_quotes(buf, start, end, block=16 * 1024 * 1024):
+    # mmap has no count(); slice it in blocks to keep the copies small
+    return sum(buf[i:min(i + block, end)].count(b'"') for i in range(start, end, block))
+
+
+def _record_end(buf, pos, in_quotes):
+    """
+    Returns the offset just past the first newline at or after pos that is
+    not inside a quoted field, given whether pos itself is inside quotes.
+    """
+    while True:
+        newline = buf.find(b'\n', pos)
+        if newline < 0:
+            return len(buf)
+        if _count_quotes(buf, pos, newline) % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            return newline + 1
+        pos = newline + 1
+
+
+def split_ranges(buf, n_parts):
+    """
+    Splits a CSV buffer into the header and up to n_parts byte ranges that
+    each start at the beginning of a record.
+
+    Quote parity is tracked from the start of the file, so newlines inside
+    quoted multi-line fields are never used as split points. This assumes
+    RFC 4180 quoting (quotes inside fields doubled), which is what pandas
+    reads by default.
+    """
+    header_end = _record_end(buf, 0, False)
+    size = len(buf)
+    bounds = [header_end]
+    pos, in_quotes = header_end, False
+    for i in range(1, n_parts):
+        target = header_end + (size - header_end) * i // n_parts
+        if target <= pos:
+            continue
+        if _count_quotes(buf, pos, target) % 2:
+            in_quotes = not in_quotes
+        pos = _record_end(buf, target, in_quotes)
+        in_quotes = False
+        if pos >= size:
+            break
+        bounds.append(pos)
+    bounds.append(size)
+    ranges = [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+    return header_end, ranges
+
+
+def _parse_range(path, header_end, start, end, kwargs):
+    with open(path, 'rb') as f:
+        header = f.read(header_end)
+        f.seek(start)
+        body = f.read(end - start)
+    return pd.read_csv(io.BytesIO(header + body), **kwargs)
+
+
+def _is_null_column(series):
+    return len(series) == 0 or series.isna().all()
+
+
+def concat_consistent(frames):
+    """
+    Concatenates frames parsed from separate ranges of one file so the
+    column dtypes match a single read: categoricals are re-coded against the
+    union of their categories, and ranges where a text or date column happens
+    to be entirely missing take that column's dtype instead of float64.
+    """
+    frames = [frame.copy(deep=False) for frame in frames]
+    for col in frames[0].columns:
+        columns = [frame[col] for frame in frames]
+        if any(isinstance(s.dtype, pd.CategoricalDtype) for s in columns):
+            categories = union_categoricals(
+                [s.astype('category') for s in columns], sort_categories=True
+            ).categories
+            for frame, s in zip(frames, columns):
+                frame[col] = s.astype('category').cat.set_categories(categories)
+            continue
+        dtypes = {s.dtype for s in columns if not _is_null_column(s)}
+        if len(dtypes) == 1:
+            target = dtypes.pop()
+            if target.kind not in 'iub':
+                for frame, s in zip(frames, columns):
+                    if s.dtype != target:
+                        frame[col] = s.astype(target)
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_csv_parallel(path, workers=None, **kwargs):
+    """
+    Reads a CSV file with pd.read_csv, parsing newline-aligned byte ranges of
+    the file in a process pool and concatenating the pieces. Small files,
+    file-like objects and options that need a single sequential pass fall
+    back to a plain pd.read_csv call.
+    """
+    workers = workers or os.cpu_count() or 1
+    if (workers < 2 or not isinstance(path, (str, os.PathLike))
+            or SERIAL_ONLY_OPTIONS.intersection(kwargs)):
+        return pd.read_csv(path, **kwargs)
+    size = os.path.getsize(path)
+    if size < MIN_PARALLEL_BYTES:
+        return pd.read_csv(path, **kwargs)
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        # An odd number of quotes means the file does not follow the quoting
+        # rules the splitter relies on; let pandas deal with it in one pass.
+        if _count_quotes(buf, 0, len(buf)) % 2:
+            return pd.read_csv(path, **kwargs)
+        header_end, ranges = split_ranges(buf, workers)
+
+    if len(ranges) < 2:
+        return pd.read_csv(path, **kwargs)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(_parse_range, os.fspath(path), header_end, start, end, kwargs)
+                   for start, end in ranges]
+        frames = [future.result() for future in futures]
+    return concat_consistent(frames)
@@ -0,0 +1,95 @@
+import numpy as np
+
+# Mean Earth radius in metres, used by the Mercator projection and haversine distances
+EARTH_RADIUS = 6_371_008.8
+
+
+def mercator(lat, lon):
+    """
+    Projects latitude/longitude in degrees to spherical Web Mercator metres.
+    """
+    lat = np.radians(np.clip(np.asarray(lat, dtype='float64'), -85.05112878, 85.05112878))
+    x = EARTH_RADIUS * np.radians(np.asarray(lon, dtype='float64'))
+    y = EARTH_RADIUS * np.log(np.tan(np.pi / 4 + lat / 2))
+    return x, y
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in metres between points given in degrees.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype='float64')) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
+class GridIndex:
+    """
+    Bucket index over points on a square grid in Web Mercator metres. Points
+    are sorted by cell, row-major, so the cells of one grid row that overlap
+    a query box are a single contiguous run found with two binary searches.
+    A query touches one run per grid row it covers and then filters exact
+    coordinates within those candidates, which keeps queries fast whether
+    the index holds one city or many.
+
+    Query results are positions into the arrays the index was built from,
+    suitable for DataFrame.iloc.
+    """
+
+    def __init__(self, lat, lon, cell_size=250):
+        self.lat = np.asarray(lat, dtype='float64')
+        self.lon = np.asarray(lon, dtype='float64')
+        self.cell_size = cell_size
+        x, y = mercator(self.lat, self.lon)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        self.x0 = np.nanmin(x) if valid.any() else 0.0
+        self.y0 = np.nanmin(y) if valid.any() else 0.0
+        ix = ((x[valid] - self.x0) // cell_size).astype(np.int64)
+        iy = ((y[valid] - self.y0) // cell_size).astype(np.int64)
+        self.n_cols = int(ix.max()) + 1 if len(ix) else 1
+        keys = iy * self.n_cols + ix
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.positions = np.flatnonzero(valid)[order]
+        self.n_rows = int(self.keys[-1] // self.n_cols) + 1 if len(self.keys) else 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _candidates(self, x_min, y_min, x_max, y_max):
+        ix0 = max(int((x_min - self.x0) // self.cell_size), 0)
+        ix1 = min(int((x_max - self.x0) // self.cell_size), self.n_cols - 1)
+        iy0 = max(int((y_min - self.y0) // self.cell_size), 0)
+        iy1 = min(int((y_max - self.y0) // self.cell_size), self.n_rows - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return np.empty(0, dtype=np.int64)
+        rows = np.arange(iy0, iy1 + 1, dtype=np.int64) * self.n_cols
+        starts = np.searchsorted(self.keys, rows + ix0, side='left')
+        ends = np.searchsorted(self.keys, rows + ix1, side='right')
+        runs = [self.positions[start:end] for start, end in zip(starts, ends) if end > start]
+        return np.concatenate(runs) if runs else np.empty(0, dtype=np.int64)
+
+    def bbox(self, south, west, north, east):
+        """
+        Positions of the points inside a (south, west, north, east) box, in index order.
+        """
+        x_min, y_min = mercator(south, west)
+        x_max, y_max = mercator(north, east)
+        candidates = self._candidates(x_min, y_min, x_max, y_max)
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return candidates[inside]
+
+    def radius(self, lat, lon, meters):
+        """
+        Positions of the points within a great-circle distance of (lat, lon), in index order.
+        """
+        x, y = mercator(lat, lon)
+        # Mercator stretches distances by 1 / cos(latitude); widen the box to
+        # cover the circle at its most poleward edge.
+        edge_lat = min(abs(lat) + np.degrees(meters / EARTH_RADIUS), 85.05112878)
+        reach = meters / np.cos(np.radians(edge_lat))
+        candidates = self._candidates(x - reach, y - reach, x + reach, y + reach)
+        distance = haversine(lat, lon, self.lat[candidates], self.lon[candidates])
+        return candidates[distance <= meters]
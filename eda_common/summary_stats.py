@@ -0,0 +1,70 @@
+from statistics import NormalDist
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+
+def group_stats(df, by, value):
+    """
+    Sufficient statistics of a value column per group: COUNT, SUM and SUMSQ
+    (sum of squares). Groups keep their order of appearance, as in seaborn.
+    Stats of disjoint pieces of a frame can be added together.
+    """
+    values = df[value].astype('float64')
+    frame = pd.DataFrame({'COUNT': values.notna().astype('int64'), 'SUM': values, 'SUMSQ': values ** 2})
+    keys = [df[col] for col in ([by] if isinstance(by, str) else by)]
+    return frame.groupby(keys, sort=False, observed=True).sum()
+
+
+def mean_ci(count, total, total_sq, confidence=0.95):
+    """
+    Mean, sample standard deviation and the normal-approximation confidence
+    interval of the mean, from counts, sums and sums of squares. Returns
+    (mean, std, low, high); the interval is NaN where count < 2.
+    """
+    count = np.asarray(count, dtype='float64')
+    total = np.asarray(total, dtype='float64')
+    total_sq = np.asarray(total_sq, dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        variance = np.clip((total_sq - total ** 2 / count) / (count - 1), 0, None)
+        std = np.where(count > 1, np.sqrt(variance), np.nan)
+        half_width = NormalDist().inv_cdf(0.5 + confidence / 2) * std / np.sqrt(count)
+    return mean, std, mean - half_width, mean + half_width
+
+
+def summarize(stats, confidence=0.95):
+    """
+    Adds MEAN, STD, CI_LOW and CI_HIGH columns to a group_stats table.
+    """
+    stats = stats.copy()
+    stats['MEAN'], stats['STD'], stats['CI_LOW'], stats['CI_HIGH'] = mean_ci(
+        stats['COUNT'], stats['SUM'], stats['SUMSQ'], confidence)
+    return stats
+
+
+def ci_barplot(mean, low, high, orient='v', ax=None, **kwargs):
+    """
+    Draws one bar per entry of the mean Series, with error bars from low to
+    high, in the style of sns.barplot but without resampling any rows. Extra
+    keyword arguments go to sns.barplot.
+    """
+    ax = ax or plt.gca()
+    labels = mean.index.astype(str)
+    if orient == 'h':
+        sns.barplot(x=mean.values, y=labels, orient='h', ax=ax, **kwargs)
+    else:
+        sns.barplot(x=labels, y=mean.values, ax=ax, **kwargs)
+    positions = np.arange(len(mean))
+    errors = [mean.values - np.asarray(low), np.asarray(high) - mean.values]
+    # Same error bar colour and width as seaborn's own
+    style = {'fmt': 'none', 'ecolor': '.26', 'elinewidth': plt.rcParams['lines.linewidth']}
+    if orient == 'h':
+        ax.errorbar(mean.values, positions, xerr=errors, **style)
+    else:
+        ax.errorbar(positions, mean.values, yerr=errors, **style)
+    # Label the category axis after the groups, as sns.barplot does for a named column
+    (ax.set_ylabel if orient == 'h' else ax.set_xlabel)(mean.index.name or '')
+    return ax
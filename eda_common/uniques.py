@@ -0,0 +1,21 @@
+import pandas as pd
+
+
+def on_uniques(values, func):
+    """
+    Applies a transform to each distinct value of a Series once and
+    broadcasts the results back to every row through the factorize codes.
+
+    func receives a Series of the distinct values (missing values included,
+    once) and must return a Series or array of the same length, e.g.
+    ``lambda s: pd.to_datetime(s, format='mixed')``. Per-value Python
+    functions can be passed as ``lambda s: s.map(f)``.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    if isinstance(uniques, pd.Categorical):
+        uniques = uniques.astype(object)
+    results = func(pd.Series(uniques))
+    results = results if isinstance(results, pd.Series) else pd.Series(results)
+    broadcast = results.reset_index(drop=True).take(codes)
+    broadcast.index = values.index
+    return broadcast.rename(values.name)
@@ -0,0 +1,6 @@
+"""
+Schema-faithful synthetic versions of the nine project datasets, written
+at any multiple of the real files' size for load and scaling tests.
+"""
+
+from .generate import DATASETS, generate
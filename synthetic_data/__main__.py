@@ -0,0 +1,30 @@
+import argparse
+import time
+
+from .generate import DATASETS, generate
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m synthetic_data',
+        description="Writes synthetic copies of the project datasets, laid out like the repository.")
+    parser.add_argument('datasets', nargs='*', metavar='dataset',
+                        help=f"datasets to generate (default: all of {', '.join(DATASETS)})")
+    parser.add_argument('--scale', type=float, default=1, help="size relative to the real files (default 1)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default 0)")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument('--out', default='synthetic', help="output directory (default: synthetic)")
+    args = parser.parse_args()
+    unknown = [name for name in args.datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"unknown datasets {unknown}; choose from {', '.join(DATASETS)}")
+
+    started = time.perf_counter()
+    written = generate(args.datasets, scale=args.scale, out_dir=args.out, seed=args.seed, jobs=args.jobs)
+    for path, rows in written.items():
+        print(f"{path}: {rows:,} rows")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
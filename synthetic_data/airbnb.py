@@ -0,0 +1,130 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .common import FIRST_NAMES, dataset_rng, pick, random_days, zipf_weights
+
+FILES = {'listings': 'Airbnb/AB_NYC_2019.csv'}
+BASE_ROWS = 48_895
+CHUNK_ROWS = 100_000
+
+COLUMNS = [
+    'id', 'name', 'host_id', 'host_name', 'neighbourhood_group', 'neighbourhood', 'latitude', 'longitude',
+    'room_type', 'price', 'minimum_nights', 'number_of_reviews', 'last_review', 'reviews_per_month',
+    'calculated_host_listings_count', 'availability_365',
+]
+
+# Borough -> (share of listings, centre latitude, centre longitude, spread in degrees, price factor, neighbourhoods)
+BOROUGHS = {
+    'Manhattan': (0.443, 40.765, -73.975, 0.030, 1.45,
+                  ['Harlem', 'Upper West Side', "Hell's Kitchen", 'East Village', 'Upper East Side',
+                   'Midtown', 'East Harlem', 'Chelsea', 'Lower East Side', 'Washington Heights',
+                   'West Village', 'Financial District', 'Murray Hill', 'Chinatown', 'SoHo']),
+    'Brooklyn': (0.411, 40.685, -73.950, 0.035, 0.95,
+                 ['Williamsburg', 'Bedford-Stuyvesant', 'Bushwick', 'Crown Heights', 'Greenpoint',
+                  'Flatbush', 'Clinton Hill', 'Prospect-Lefferts Gardens', 'Park Slope', 'Fort Greene',
+                  'East Flatbush', 'Boerum Hill']),
+    'Queens': (0.116, 40.730, -73.850, 0.045, 0.80,
+               ['Astoria', 'Long Island City', 'Flushing', 'Ridgewood', 'Sunnyside', 'Ditmars Steinway',
+                'Jackson Heights', 'Elmhurst', 'Woodside', 'Jamaica']),
+    'Bronx': (0.022, 40.845, -73.880, 0.030, 0.70,
+              ['Kingsbridge', 'Fordham', 'Longwood', 'Mott Haven', 'Concourse', 'Port Morris']),
+    'Staten Island': (0.008, 40.600, -74.120, 0.030, 0.85,
+                      ['St. George', 'Tompkinsville', 'Stapleton', 'Concord', 'Arrochar']),
+}
+# Room type -> (share, median nightly price)
+ROOM_TYPES = {
+    'Entire home/apt': (0.520, 160),
+    'Private room': (0.457, 70),
+    'Shared room': (0.023, 45),
+}
+LISTING_WORDS = ['Cozy', 'Sunny', 'Spacious', 'Charming', 'Bright', 'Modern', 'Quiet', 'Beautiful', 'Large',
+                 'Private', 'Lovely', 'Renovated']
+LISTING_KINDS = ['room', 'studio', 'apartment', 'loft', 'bedroom', '1BR', '2BR', 'suite']
+FIRST_REVIEW, LAST_SCRAPE = '2011-03-28', '2019-07-08'
+# The host of the largest portfolio holds about 0.7% of listings, most hosts list one
+HOST_EXPONENT = 1.9
+
+
+@lru_cache(maxsize=None)
+def hosts(seed, total):
+    """
+    Host ids, names and listing counts for a dataset of total listings: a
+    heavy-tailed number of listings per host, laid out so row r belongs to
+    the host whose cumulative count first exceeds r. This keeps
+    calculated_host_listings_count consistent with the rows of each host.
+    """
+    rng = dataset_rng(seed, 'airbnb', 'hosts')
+    counts = np.minimum(rng.zipf(HOST_EXPONENT, total), max(1, total // 150))
+    ends = np.cumsum(counts)
+    n_hosts = int(np.searchsorted(ends, total)) + 1
+    counts, ends = counts[:n_hosts], ends[:n_hosts]
+    counts[-1] -= ends[-1] - total
+    ids = np.sort(rng.choice(275_000_000, n_hosts, replace=False) + 2_400)
+    # Shuffle which host owns which block of rows so big hosts are spread across the file
+    order = rng.permutation(n_hosts)
+    names = pick(rng, FIRST_NAMES, n_hosts)
+    return ids[order], names, counts, np.cumsum(counts)
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    n = n_rows
+    host_ids, host_names, host_counts, host_ends = hosts(seed, total)
+    host = np.searchsorted(host_ends, np.arange(start, start + n), side='right')
+
+    boroughs = list(BOROUGHS)
+    borough = rng.choice(len(boroughs), n, p=[BOROUGHS[b][0] for b in boroughs])
+    room_types = list(ROOM_TYPES)
+    room = rng.choice(len(room_types), n, p=[ROOM_TYPES[r][0] for r in room_types])
+
+    neighbourhood = np.empty(n, dtype=object)
+    latitude, longitude, factor = np.empty(n), np.empty(n), np.empty(n)
+    for i, name in enumerate(boroughs):
+        _, lat, lon, spread, price_factor, areas = BOROUGHS[name]
+        rows = borough == i
+        k = int(rows.sum())
+        neighbourhood[rows] = pick(rng, areas, k, p=zipf_weights(len(areas)))
+        latitude[rows] = np.round(lat + rng.normal(0, spread, k), 5)
+        longitude[rows] = np.round(lon + rng.normal(0, spread, k), 5)
+        factor[rows] = price_factor
+
+    # Log-normal prices with a few free and very expensive listings, as in the real data
+    median = np.array([ROOM_TYPES[r][1] for r in room_types])[room] * factor
+    price = np.round(median * rng.lognormal(0, 0.55, n)).astype(int)
+    price[rng.random(n) < 0.0002] = 0
+    luxury = rng.random(n) < 0.001
+    price[luxury] = rng.integers(2_000, 10_000, luxury.sum())
+
+    minimum_nights = pick(rng, [1, 2, 3, 4, 5, 7, 14, 30, 60, 90, 365], n,
+                          p=[0.26, 0.24, 0.16, 0.07, 0.06, 0.05, 0.02, 0.12, 0.01, 0.005, 0.005]).astype(int)
+    reviews = np.where(rng.random(n) < 0.205, 0, np.round(rng.lognormal(2.4, 1.3, n))).astype(int).clip(0, 629)
+    # Most last reviews are recent: the weight of a day grows with the cube of its position in the period
+    n_days = (pd.Timestamp(LAST_SCRAPE) - pd.Timestamp(FIRST_REVIEW)).days + 1
+    last_review = random_days(rng, FIRST_REVIEW, LAST_SCRAPE, n, np.linspace(0.05, 1, n_days) ** 3)
+    last_review = last_review.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    reviews_per_month = np.round(reviews / rng.uniform(2, 90, n), 2).clip(0.01, 58.5)
+    availability = np.where(rng.random(n) < 0.36, 0, rng.integers(1, 366, n))
+
+    df = pd.DataFrame({
+        'id': 2539 + (start + np.arange(n)) * 740 + rng.integers(0, 740, n),
+        'name': pick(rng, LISTING_WORDS, n) + ' ' + pick(rng, LISTING_KINDS, n) + ' in ' + neighbourhood,
+        'host_id': host_ids[host],
+        'host_name': host_names[host],
+        'neighbourhood_group': np.array(boroughs, dtype=object)[borough],
+        'neighbourhood': neighbourhood,
+        'latitude': latitude,
+        'longitude': longitude,
+        'room_type': np.array(room_types, dtype=object)[room],
+        'price': price,
+        'minimum_nights': minimum_nights,
+        'number_of_reviews': reviews,
+        'last_review': np.where(reviews > 0, last_review, None),
+        'reviews_per_month': np.where(reviews > 0, reviews_per_month, np.nan),
+        'calculated_host_listings_count': host_counts[host],
+        'availability_365': availability,
+    }, columns=COLUMNS)
+    # A handful of listings and hosts have no name
+    df.loc[rng.random(n) < 0.0003, 'name'] = None
+    df.loc[rng.random(n) < 0.0004, 'host_name'] = None
+    return {'listings': df}
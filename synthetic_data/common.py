@@ -0,0 +1,112 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = [
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'William', 'Elizabeth',
+    'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Daniel', 'Nancy', 'Matthew', 'Lisa', 'Anthony', 'Betty', 'Mark', 'Sandra', 'Steven', 'Ashley',
+    'Paul', 'Emily', 'Andrew', 'Donna', 'Joshua', 'Michelle', 'Kevin', 'Carol', 'Brian', 'Amanda',
+    'Arjun', 'Priya', 'Rahul', 'Ananya', 'Wei', 'Mei', 'Hiroshi', 'Yuki', 'Carlos', 'Sofia',
+    'Ahmed', 'Fatima', 'Ivan', 'Olga', 'Lucas', 'Chloe', 'Mateo', 'Camila', 'Kwame', 'Amara',
+]
+# FIRST_NAMES alternate between male and female names
+MALE_NAMES = FIRST_NAMES[::2]
+FEMALE_NAMES = FIRST_NAMES[1::2]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+    'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+    'Sharma', 'Patel', 'Singh', 'Kumar', 'Chen', 'Wang', 'Tanaka', 'Sato', 'Silva', 'Santos',
+    'Khan', 'Ali', 'Ivanov', 'Petrov', 'Muller', 'Schmidt', 'Rossi', 'Dubois', 'Mensah', 'Okafor',
+]
+WORDS = [
+    'love', 'night', 'city', 'dream', 'fire', 'heart', 'road', 'summer', 'story', 'light', 'shadow', 'river',
+    'secret', 'home', 'world', 'life', 'time', 'girl', 'boy', 'family', 'friend', 'war', 'king', 'queen',
+    'house', 'game', 'star', 'blue', 'last', 'first', 'lost', 'wild', 'golden', 'dark', 'little', 'great',
+    'young', 'old', 'new', 'good', 'bad', 'sweet', 'cold', 'hot', 'high', 'deep', 'silent', 'broken',
+    'journey', 'mystery', 'island', 'mountain', 'ocean', 'garden', 'forest', 'winter', 'spring', 'moon',
+    'sun', 'rain', 'wind', 'storm', 'dance', 'song', 'voice', 'money', 'power', 'truth', 'lie', 'hope',
+    'chance', 'dinner', 'wedding', 'school', 'college', 'detective', 'doctor', 'soldier', 'chef', 'artist',
+    'thief', 'stranger', 'brother', 'sister', 'mother', 'father', 'village', 'empire', 'kingdom', 'escape',
+    'return', 'revenge', 'rescue', 'danger', 'murder', 'heist', 'comedy', 'drama', 'magic', 'zombie',
+]
+
+
+def dataset_rng(seed, name, *keys):
+    """
+    Random generator for one piece of one dataset (a chunk index, or e.g.
+    'catalog'), derived from the run seed so every piece is reproducible on
+    its own, in any process and in any order.
+    """
+    entropy = [seed, zlib.crc32(name.encode())] + [zlib.crc32(str(key).encode()) for key in keys]
+    return np.random.default_rng(np.random.SeedSequence(entropy))
+
+
+def zipf_weights(n, exponent=1.0):
+    """
+    Normalized weights proportional to 1 / rank**exponent, for skewed popularity.
+    """
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def pick(rng, values, size, p=None):
+    """
+    size draws from values (with replacement), as an array of the values.
+    """
+    values = np.asarray(values, dtype=object)
+    return values[rng.choice(len(values), size=size, p=p)]
+
+
+def person_names(rng, size):
+    return pick(rng, FIRST_NAMES, size) + ' ' + pick(rng, LAST_NAMES, size)
+
+
+def phrases(rng, size, min_words, max_words, capitalize=True):
+    """
+    Random phrases of min_words to max_words words from WORDS.
+    """
+    lengths = rng.integers(min_words, max_words + 1, size)
+    words = pick(rng, WORDS, int(lengths.sum()))
+    ends = np.cumsum(lengths)
+    texts = [' '.join(words[end - n:end]) for n, end in zip(lengths, ends)]
+    if capitalize:
+        texts = [text[:1].upper() + text[1:] for text in texts]
+    return np.asarray(texts, dtype=object)
+
+
+def multi_values(rng, values, size, weights=None, min_k=1, max_k=3, sep=', '):
+    """
+    Comma-separated lists of min_k to max_k distinct values per row (as in
+    Netflix 'listed_in' or Zomato 'cuisines'), drawn with the given weights.
+    """
+    values = np.asarray(values, dtype=object)
+    counts = rng.integers(min_k, max_k + 1, size)
+    draws = rng.choice(len(values), size=(size, max_k), p=weights)
+    out = []
+    for row, k in zip(draws, counts):
+        chosen = list(dict.fromkeys(row[:k]))
+        out.append(sep.join(values[chosen]))
+    return np.asarray(out, dtype=object)
+
+
+def us_date(dates):
+    """
+    Formats datetimes as m/d/YYYY without zero padding ('11/8/2016').
+    """
+    dates = pd.Series(dates)
+    return (dates.dt.month.astype(str) + '/' + dates.dt.day.astype(str) + '/' + dates.dt.year.astype(str)).to_numpy()
+
+
+def random_days(rng, first, last, size, weights=None):
+    """
+    Random calendar days between first and last (inclusive), optionally weighted per day.
+    """
+    days = pd.date_range(first, last, freq='D')
+    if weights is not None:
+        weights = np.asarray(weights, dtype='float64')
+        weights = weights / weights.sum()
+    return days[rng.choice(len(days), size=size, p=weights)]
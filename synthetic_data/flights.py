@@ -0,0 +1,204 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .common import dataset_rng, random_days, zipf_weights
+
+FILES = {'flights': 'Flight_Delay/flights_sample_3m.csv'}
+BASE_ROWS = 3_000_000
+CHUNK_ROWS = 250_000
+
+COLUMNS = [
+    'FL_DATE', 'AIRLINE', 'AIRLINE_DOT', 'AIRLINE_CODE', 'DOT_CODE', 'FL_NUMBER', 'ORIGIN', 'ORIGIN_CITY',
+    'DEST', 'DEST_CITY', 'CRS_DEP_TIME', 'DEP_TIME', 'DEP_DELAY', 'TAXI_OUT', 'WHEELS_OFF', 'WHEELS_ON',
+    'TAXI_IN', 'CRS_ARR_TIME', 'ARR_TIME', 'ARR_DELAY', 'CANCELLED', 'CANCELLATION_CODE', 'DIVERTED',
+    'CRS_ELAPSED_TIME', 'ELAPSED_TIME', 'AIR_TIME', 'DISTANCE', 'DELAY_DUE_CARRIER', 'DELAY_DUE_WEATHER',
+    'DELAY_DUE_NAS', 'DELAY_DUE_SECURITY', 'DELAY_DUE_LATE_AIRCRAFT',
+]
+DELAY_CAUSES = COLUMNS[-5:]
+
+# (name, code, DOT id, share of flights, delay scale)
+AIRLINES = [
+    ('Southwest Airlines Co.', 'WN', 19393, 0.170, 1.05),
+    ('Delta Air Lines Inc.', 'DL', 19790, 0.130, 0.80),
+    ('American Airlines Inc.', 'AA', 19805, 0.130, 1.15),
+    ('SkyWest Airlines Inc.', 'OO', 20304, 0.110, 0.95),
+    ('United Air Lines Inc.', 'UA', 19977, 0.090, 1.10),
+    ('Republic Airline', 'YX', 20452, 0.050, 0.85),
+    ('Envoy Air', 'MQ', 20398, 0.045, 0.95),
+    ('Endeavor Air Inc.', '9E', 20363, 0.040, 0.80),
+    ('JetBlue Airways', 'B6', 20409, 0.035, 1.45),
+    ('PSA Airlines Inc.', 'OH', 20397, 0.040, 1.00),
+    ('Alaska Airlines Inc.', 'AS', 19930, 0.035, 0.85),
+    ('Spirit Air Lines', 'NK', 20416, 0.030, 1.20),
+    ('Mesa Airlines Inc.', 'YV', 20378, 0.025, 1.10),
+    ('Frontier Airlines Inc.', 'F9', 20436, 0.020, 1.40),
+    ('Allegiant Air', 'G4', 20368, 0.020, 1.50),
+    ('Hawaiian Airlines Inc.', 'HA', 19690, 0.010, 0.60),
+    ('Horizon Air', 'QX', 19687, 0.010, 0.75),
+    ('ExpressJet Airlines LLC d/b/a aha!', 'EV', 20366, 0.010, 1.10),
+]
+
+# Busiest airports first: (code, city, latitude, longitude)
+MAJOR_AIRPORTS = [
+    ('ATL', 'Atlanta, GA', 33.64, -84.43), ('DFW', 'Dallas/Fort Worth, TX', 32.90, -97.04),
+    ('DEN', 'Denver, CO', 39.86, -104.67), ('ORD', 'Chicago, IL', 41.98, -87.90),
+    ('LAX', 'Los Angeles, CA', 33.94, -118.41), ('CLT', 'Charlotte, NC', 35.21, -80.94),
+    ('LAS', 'Las Vegas, NV', 36.08, -115.15), ('PHX', 'Phoenix, AZ', 33.43, -112.01),
+    ('MCO', 'Orlando, FL', 28.43, -81.31), ('SEA', 'Seattle, WA', 47.45, -122.31),
+    ('SFO', 'San Francisco, CA', 37.62, -122.38), ('IAH', 'Houston, TX', 29.98, -95.34),
+    ('LGA', 'New York, NY', 40.78, -73.87), ('DTW', 'Detroit, MI', 42.21, -83.35),
+    ('BOS', 'Boston, MA', 42.36, -71.01), ('MSP', 'Minneapolis, MN', 44.88, -93.22),
+    ('EWR', 'Newark, NJ', 40.69, -74.17), ('SLC', 'Salt Lake City, UT', 40.79, -111.98),
+    ('FLL', 'Fort Lauderdale, FL', 26.07, -80.15), ('JFK', 'New York, NY', 40.64, -73.78),
+    ('BWI', 'Baltimore, MD', 39.18, -76.67), ('MDW', 'Chicago, IL', 41.79, -87.75),
+    ('DCA', 'Washington, DC', 38.85, -77.04), ('SAN', 'San Diego, CA', 32.73, -117.19),
+    ('MIA', 'Miami, FL', 25.79, -80.29), ('PHL', 'Philadelphia, PA', 39.87, -75.24),
+    ('TPA', 'Tampa, FL', 27.98, -82.53), ('BNA', 'Nashville, TN', 36.12, -86.68),
+    ('AUS', 'Austin, TX', 30.19, -97.67), ('HOU', 'Houston, TX', 29.65, -95.28),
+    ('PDX', 'Portland, OR', 45.59, -122.60), ('STL', 'St. Louis, MO', 38.75, -90.37),
+    ('DAL', 'Dallas, TX', 32.85, -96.85), ('RDU', 'Raleigh/Durham, NC', 35.88, -78.79),
+    ('HNL', 'Honolulu, HI', 21.32, -157.92), ('SMF', 'Sacramento, CA', 38.70, -121.59),
+    ('MSY', 'New Orleans, LA', 29.99, -90.26), ('SJC', 'San Jose, CA', 37.36, -121.93),
+    ('SAT', 'San Antonio, TX', 29.53, -98.47), ('OAK', 'Oakland, CA', 37.72, -122.22),
+]
+N_AIRPORTS = 380
+STATES = ['AK', 'AL', 'AR', 'AZ', 'CA', 'CO', 'FL', 'GA', 'IA', 'ID', 'IL', 'KS', 'KY', 'LA', 'ME', 'MI', 'MN',
+          'MO', 'MS', 'MT', 'NC', 'ND', 'NE', 'NM', 'NV', 'NY', 'OH', 'OK', 'OR', 'PA', 'SC', 'SD', 'TN', 'TX',
+          'UT', 'VA', 'WA', 'WI', 'WV', 'WY']
+
+
+@lru_cache(maxsize=None)
+def catalog(seed):
+    """
+    Airports (busiest first, Zipf-weighted traffic), their coordinates, the
+    hubs of each airline and the daily traffic weights, shared by all chunks.
+    """
+    rng = dataset_rng(seed, 'flights', 'catalog')
+    n_small = N_AIRPORTS - len(MAJOR_AIRPORTS)
+    letters = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+    majors = {code for code, *_ in MAJOR_AIRPORTS}
+    small_codes = []
+    while len(small_codes) < n_small:
+        code = ''.join(rng.choice(letters, 3))
+        if code not in majors and code not in small_codes:
+            small_codes.append(code)
+    codes = np.array([a[0] for a in MAJOR_AIRPORTS] + small_codes, dtype=object)
+    cities = np.array([a[1] for a in MAJOR_AIRPORTS]
+                      + [f"{code.title()}ville, {rng.choice(STATES)}" for code in small_codes], dtype=object)
+    lat = np.concatenate([[a[2] for a in MAJOR_AIRPORTS], rng.uniform(26, 48, n_small)])
+    lon = np.concatenate([[a[3] for a in MAJOR_AIRPORTS], rng.uniform(-122, -70, n_small)])
+    weights = zipf_weights(N_AIRPORTS, 1.1)
+    # Each airline runs hubs among the 25 busiest airports
+    hubs = np.array([rng.choice(25, 3, replace=False) for _ in AIRLINES])
+    # Fewer flights from April to December 2020, more in summer and December
+    days = pd.date_range('2019-01-01', '2023-08-31', freq='D')
+    day_weights = np.where((days >= '2020-04-01') & (days <= '2020-12-31'), 0.45, 1.0)
+    day_weights = day_weights * np.where(days.month.isin([6, 7, 8, 12]), 1.1, 1.0)
+    return codes, cities, lat, lon, weights, hubs, day_weights
+
+
+def _hhmm(minutes):
+    """
+    Minutes after midnight (any day) as hhmm clock times.
+    """
+    minutes = np.mod(np.round(minutes), 1440)
+    return (minutes // 60) * 100 + minutes % 60
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    codes, cities, lat, lon, weights, hubs, day_weights = catalog(seed)
+    n = n_rows
+    airline = rng.choice(len(AIRLINES), n, p=np.array([a[3] for a in AIRLINES]) / sum(a[3] for a in AIRLINES))
+
+    # Routes: most flights touch one of the airline's hubs, the other end follows airport traffic
+    origin = rng.choice(N_AIRPORTS, n, p=weights)
+    dest = rng.choice(N_AIRPORTS, n, p=weights)
+    at_hub = rng.random(n) < 0.65
+    hub = hubs[airline, rng.integers(0, 3, n)]
+    outbound = rng.random(n) < 0.5
+    origin = np.where(at_hub & outbound, hub, origin)
+    dest = np.where(at_hub & ~outbound, hub, dest)
+    same = origin == dest
+    dest[same] = (dest[same] + 1 + rng.integers(0, N_AIRPORTS - 1, same.sum())) % N_AIRPORTS
+
+    phi1, phi2 = np.radians(lat[origin]), np.radians(lat[dest])
+    dlon = np.radians(lon[dest] - lon[origin])
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlon / 2) ** 2
+    distance = np.maximum(np.round(2 * 3958.8 * np.arcsin(np.sqrt(a))), 50)
+
+    dates = random_days(rng, '2019-01-01', '2023-08-31', n, day_weights)
+    month = dates.month.to_numpy()
+    crs_dep = rng.choice(np.arange(300, 1440, 5), n, p=_departure_profile())
+    crs_elapsed = np.round((distance / 7.7 + 35) / 5) * 5
+
+    # Delays: mostly early or a few minutes late, with a long tail; worse for some airlines and in summer
+    scale = np.array([a[4] for a in AIRLINES])[airline] * np.where(np.isin(month, [6, 7, 12]), 1.3, 1.0)
+    dep_delay = np.round(rng.normal(-4, 5, n) + (rng.random(n) < 0.2 * scale) * rng.exponential(45 * scale, n))
+    taxi_out = np.round(rng.gamma(4, 4.3, n) + 5)
+    taxi_in = np.round(rng.gamma(2.5, 3, n) + 2)
+    air_time = np.round(distance / 8.2 + 12 + rng.normal(0, 6, n)).clip(20)
+    elapsed = taxi_out + air_time + taxi_in
+    arr_delay = dep_delay + elapsed - crs_elapsed
+
+    dep_minutes = crs_dep + dep_delay
+    cancelled = rng.random(n) < 0.026 * np.where(np.isin(month, [1, 2, 12]), 1.6, 0.8)
+    diverted = ~cancelled & (rng.random(n) < 0.0024)
+    flown = ~cancelled
+    landed = flown & ~diverted
+
+    def only(mask, values):
+        # Whole minutes, blank where the flight never got that far (nullable integers also write much faster)
+        return pd.arrays.IntegerArray(np.asarray(values, dtype='int64'), ~mask)
+
+    df = pd.DataFrame({
+        'FL_DATE': dates.strftime('%Y-%m-%d'),
+        'AIRLINE': np.array([a[0] for a in AIRLINES], dtype=object)[airline],
+        'AIRLINE_DOT': np.array([f"{a[0]}: {a[1]}" for a in AIRLINES], dtype=object)[airline],
+        'AIRLINE_CODE': np.array([a[1] for a in AIRLINES], dtype=object)[airline],
+        'DOT_CODE': np.array([a[2] for a in AIRLINES])[airline],
+        'FL_NUMBER': rng.integers(1, 7000, n),
+        'ORIGIN': codes[origin],
+        'ORIGIN_CITY': cities[origin],
+        'DEST': codes[dest],
+        'DEST_CITY': cities[dest],
+        'CRS_DEP_TIME': _hhmm(crs_dep).astype(int),
+        'DEP_TIME': only(flown, _hhmm(dep_minutes)),
+        'DEP_DELAY': only(flown, dep_delay),
+        'TAXI_OUT': only(flown, taxi_out),
+        'WHEELS_OFF': only(flown, _hhmm(dep_minutes + taxi_out)),
+        'WHEELS_ON': only(landed, _hhmm(dep_minutes + taxi_out + air_time)),
+        'TAXI_IN': only(landed, taxi_in),
+        'CRS_ARR_TIME': _hhmm(crs_dep + crs_elapsed).astype(int),
+        'ARR_TIME': only(landed, _hhmm(dep_minutes + elapsed)),
+        'ARR_DELAY': only(landed, arr_delay),
+        'CANCELLED': cancelled.astype(int),
+        'CANCELLATION_CODE': np.where(cancelled, rng.choice(np.array(['A', 'B', 'C', 'D'], dtype=object), n,
+                                                            p=[0.28, 0.46, 0.259, 0.001]), None),
+        'DIVERTED': diverted.astype(int),
+        'CRS_ELAPSED_TIME': crs_elapsed.astype(int),
+        'ELAPSED_TIME': only(landed, elapsed),
+        'AIR_TIME': only(landed, air_time),
+        'DISTANCE': distance.astype(int),
+    }, columns=COLUMNS[:27])
+
+    # Cause minutes are reported for arrivals 15+ minutes late and add up to the delay
+    late = landed & (arr_delay >= 15)
+    shares = rng.dirichlet([3, 0.3, 2, 0.05, 3], n)
+    minutes = np.floor(shares * np.maximum(arr_delay, 0)[:, None])
+    minutes[np.arange(n), shares.argmax(axis=1)] += np.maximum(arr_delay, 0) - minutes.sum(axis=1)
+    for i, col in enumerate(DELAY_CAUSES):
+        df[col] = only(late, minutes[:, i])
+    return {'flights': df}
+
+
+@lru_cache(maxsize=None)
+def _departure_profile():
+    """
+    Share of scheduled departures per 5-minute slot from 05:00 to 23:55:
+    a morning bank, a midday dip and an evening bank.
+    """
+    slots = np.arange(300, 1440, 5) / 60
+    profile = np.exp(-((slots - 8) / 2.2) ** 2) + 0.8 * np.exp(-((slots - 17) / 3) ** 2) + 0.25
+    return profile / profile.sum()
@@ -0,0 +1,107 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import airbnb, flights, ipl, netflix, spotify, superstore, titanic, uber, zomato
+from .common import dataset_rng
+
+# Dataset name -> generator module. Each module defines FILES (output key ->
+# path under the output directory, mirroring the repository), BASE_ROWS
+# (rows of its main table at scale 1, the size of the real file), CHUNK_ROWS
+# and generate_chunk(rng, start, n_rows, total, seed) returning a frame per
+# output key for main-table rows start .. start + n_rows of total.
+DATASETS = {
+    'airbnb': airbnb,
+    'flights': flights,
+    'ipl': ipl,
+    'netflix': netflix,
+    'spotify': spotify,
+    'superstore': superstore,
+    'titanic': titanic,
+    'uber': uber,
+    'zomato': zomato,
+}
+
+
+def plan(name, scale):
+    """
+    (chunk index, first row, rows) of every chunk of a dataset at a scale
+    factor. Chunk boundaries only depend on the row count, so the output is
+    the same for any number of workers.
+    """
+    module = DATASETS[name]
+    total = max(1, int(round(module.BASE_ROWS * scale)))
+    return total, [(i, start, min(module.CHUNK_ROWS, total - start))
+                   for i, start in enumerate(range(0, total, module.CHUNK_ROWS))]
+
+
+def render_chunk(name, seed, index, start, n_rows, total):
+    """
+    Generates one chunk and returns its CSV text per output key (with the
+    header only in the first chunk).
+    """
+    module = DATASETS[name]
+    frames = module.generate_chunk(dataset_rng(seed, name, index), start, n_rows, total, seed)
+    return {key: frame.to_csv(index=False, header=index == 0) for key, frame in frames.items()}
+
+
+def generate(names=None, scale=1, out_dir='synthetic', seed=0, jobs=None):
+    """
+    Writes synthetic files for the given datasets (all by default) under
+    out_dir, at scale times the size of the real files. Chunks are generated
+    in a process pool and appended to each file in order, with a bounded
+    number in flight, so memory stays flat at any scale. Each chunk draws
+    from its own generator derived from (seed, dataset, chunk), so the files
+    are identical for a given seed and scale whatever the number of jobs.
+    Returns {path: rows of the main table}.
+    """
+    names = list(DATASETS) if not names else list(names)
+    unknown = [name for name in names if name not in DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown datasets {unknown}; choose from {list(DATASETS)}")
+    jobs = jobs or os.cpu_count() or 1
+
+    tasks, totals = [], {}
+    for name in names:
+        total, chunks = plan(name, scale)
+        totals[name] = total
+        tasks += [(name, seed, index, start, n_rows, total) for index, start, n_rows in chunks]
+
+    handles = {}
+    for name in names:
+        for key, path in DATASETS[name].FILES.items():
+            full_path = os.path.join(out_dir, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            handles[(name, key)] = (full_path, open(full_path + '.tmp', 'w', encoding='utf-8', newline=''))
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pending = deque()
+            queue = iter(tasks)
+            for task in queue:
+                pending.append((task[0], pool.submit(render_chunk, *task)))
+                if len(pending) >= 2 * jobs:
+                    break
+            while pending:
+                name, future = pending.popleft()
+                for key, text in future.result().items():
+                    handles[(name, key)][1].write(text)
+                task = next(queue, None)
+                if task is not None:
+                    pending.append((task[0], pool.submit(render_chunk, *task)))
+    except BaseException:
+        # Leave no partial files behind
+        for full_path, handle in handles.values():
+            handle.close()
+            os.remove(full_path + '.tmp')
+        raise
+    finally:
+        for full_path, handle in handles.values():
+            handle.close()
+
+    written = {}
+    for (name, key), (full_path, _) in handles.items():
+        os.replace(full_path + '.tmp', full_path)
+        if key == next(iter(DATASETS[name].FILES)):
+            written[full_path] = totals[name]
+    return written
@@ -0,0 +1,237 @@
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from .common import LAST_NAMES, dataset_rng, person_names
+
+FILES = {'matches': 'IPL/Matches.csv', 'deliveries': 'IPL/Deliveries.csv'}
+BASE_ROWS = 756
+CHUNK_ROWS = 200
+
+MATCH_COLUMNS = [
+    'id', 'season', 'city', 'date', 'team1', 'team2', 'toss_winner', 'toss_decision', 'result', 'dl_applied',
+    'winner', 'win_by_runs', 'win_by_wickets', 'player_of_match', 'venue', 'umpire1', 'umpire2', 'umpire3',
+]
+DELIVERY_COLUMNS = [
+    'match_id', 'inning', 'batting_team', 'bowling_team', 'over', 'ball', 'batsman', 'non_striker', 'bowler',
+    'is_super_over', 'wide_runs', 'bye_runs', 'legbye_runs', 'noball_runs', 'penalty_runs', 'batsman_runs',
+    'extra_runs', 'total_runs', 'player_dismissed', 'dismissal_kind', 'fielder',
+]
+
+# Team -> (home city, home venue, seasons played)
+TEAMS = {
+    'Mumbai Indians': ('Mumbai', 'Wankhede Stadium', range(2008, 2020)),
+    'Chennai Super Kings': ('Chennai', 'MA Chidambaram Stadium, Chepauk', [*range(2008, 2016), 2018, 2019]),
+    'Royal Challengers Bangalore': ('Bangalore', 'M Chinnaswamy Stadium', range(2008, 2020)),
+    'Kolkata Knight Riders': ('Kolkata', 'Eden Gardens', range(2008, 2020)),
+    'Kings XI Punjab': ('Chandigarh', 'Punjab Cricket Association Stadium, Mohali', range(2008, 2020)),
+    'Rajasthan Royals': ('Jaipur', 'Sawai Mansingh Stadium', [*range(2008, 2016), 2018, 2019]),
+    'Delhi Daredevils': ('Delhi', 'Feroz Shah Kotla', range(2008, 2019)),
+    'Delhi Capitals': ('Delhi', 'Feroz Shah Kotla', [2019]),
+    'Deccan Chargers': ('Hyderabad', 'Rajiv Gandhi International Stadium, Uppal', range(2008, 2013)),
+    'Sunrisers Hyderabad': ('Hyderabad', 'Rajiv Gandhi International Stadium, Uppal', range(2013, 2020)),
+    'Pune Warriors': ('Pune', 'Subrata Roy Sahara Stadium', range(2011, 2014)),
+    'Kochi Tuskers Kerala': ('Kochi', 'Nehru Stadium', [2011]),
+    'Gujarat Lions': ('Rajkot', 'Saurashtra Cricket Association Stadium', [2016, 2017]),
+    'Rising Pune Supergiant': ('Pune', 'Maharashtra Cricket Association Stadium', [2016, 2017]),
+}
+# The 2009 season was played in South Africa
+AWAY_VENUES = {2009: [('Durban', 'Kingsmead'), ('Johannesburg', 'New Wanderers Stadium'),
+                      ('Cape Town', 'Newlands'), ('Centurion', 'SuperSport Park'),
+                      ('Port Elizabeth', "St George's Park")]}
+SEASONS = list(range(2008, 2020))
+SQUAD_SIZE = 22
+
+# Runs off the bat for a legal ball, in the first 15 overs and at the death
+RUNS = np.array([0, 1, 2, 3, 4, 6])
+RUN_PROBS = np.array([0.39, 0.36, 0.065, 0.005, 0.115, 0.065])
+DEATH_RUN_PROBS = np.array([0.30, 0.36, 0.07, 0.005, 0.15, 0.115])
+WICKET_PROB = 0.05
+WIDE_PROB = 0.032
+NOBALL_PROB = 0.004
+LEGBYE_PROB = 0.02
+BYE_PROB = 0.004
+# Dismissal kinds with their shares; fielded ones name a fielder
+DISMISSALS = {
+    'caught': 0.61, 'bowled': 0.16, 'run out': 0.09, 'lbw': 0.06, 'stumped': 0.04,
+    'caught and bowled': 0.03, 'hit wicket': 0.005, 'retired hurt': 0.005,
+}
+FIELDED = ['caught', 'run out', 'stumped']
+# Positions in a playing XI: the last five bowl, the fifth keeps wicket
+BOWLER_SLOTS = [6, 7, 8, 9, 10]
+KEEPER_SLOT = 4
+
+
+@lru_cache(maxsize=None)
+def catalog(seed):
+    """
+    A squad of uniquely named players per team (cricket-style 'V Kohli'
+    names) and a pool of umpires.
+    """
+    rng = dataset_rng(seed, 'ipl', 'catalog')
+    letters = 'ABCDEFGHIJKLMNOPRSTVY'
+    initials = list(letters) + [a + b for a, b in product(letters, repeat=2)]
+    pool = [f"{initial} {last}" for initial, last in product(initials, LAST_NAMES)]
+    chosen = rng.choice(len(pool), SQUAD_SIZE * len(TEAMS), replace=False)
+    squads = {team: [pool[i] for i in chosen[k * SQUAD_SIZE:(k + 1) * SQUAD_SIZE]]
+              for k, team in enumerate(TEAMS)}
+    umpires = list(dict.fromkeys(person_names(rng, 80)))[:40]
+    return squads, umpires
+
+
+def play_innings(rng, batting, bowling, target=None, max_overs=20):
+    """
+    Simulates one innings ball by ball and returns its delivery columns as
+    a dict of lists. It ends after max_overs overs, ten wickets or, when
+    chasing, once the target is passed.
+    """
+    # Draw more deliveries than an innings can need, then cut at the end
+    n = max_overs * 6 + 20
+    wide = rng.random(n) < WIDE_PROB
+    noball = ~wide & (rng.random(n) < NOBALL_PROB)
+    legal = ~(wide | noball)
+    legal_before = np.concatenate([[0], np.cumsum(legal)[:-1]])
+    over = legal_before // 6 + 1
+    death = over > 15
+    runs = np.where(death, rng.choice(RUNS, n, p=DEATH_RUN_PROBS), rng.choice(RUNS, n, p=RUN_PROBS))
+    wicket = legal & (rng.random(n) < WICKET_PROB)
+    runs[wide | wicket] = 0
+    extras_draw = rng.random(n)
+    legbye = legal & ~wicket & (extras_draw < LEGBYE_PROB)
+    bye = legal & ~wicket & ~legbye & (extras_draw < LEGBYE_PROB + BYE_PROB)
+    extra_runs = np.where(legbye | bye, np.where(runs == 4, 4, 1), 0)
+    runs[legbye | bye] = 0
+    wide_runs = np.where(wide, np.where(rng.random(n) < 0.03, 5, 1), 0)
+    extra_runs = extra_runs + wide_runs + noball
+    total = runs + extra_runs
+
+    end = int(np.searchsorted(legal_before, max_overs * 6))
+    wickets = np.cumsum(wicket)
+    if wickets[end - 1] >= 10:
+        end = int(np.searchsorted(wickets, 10)) + 1
+    if target is not None:
+        score = np.cumsum(total)
+        if score[end - 1] >= target:
+            end = int(np.searchsorted(score, target)) + 1
+
+    kinds = list(DISMISSALS)
+    kind = np.array(kinds, dtype=object)[rng.choice(len(kinds), n, p=list(DISMISSALS.values()))]
+    bowlers = rng.permutation(BOWLER_SLOTS)
+    fielder_slot = rng.integers(0, 11, n)
+
+    out = {col: [] for col in DELIVERY_COLUMNS[4:]}
+    striker, non_striker, next_in = 0, 1, 2
+    ball_in_over, current_over = 0, 1
+    for i in range(end):
+        if over[i] != current_over:
+            # New over: the batsmen cross ends
+            striker, non_striker = non_striker, striker
+            current_over, ball_in_over = over[i], 0
+        ball_in_over += 1
+        out['over'].append(int(over[i]))
+        out['ball'].append(ball_in_over)
+        out['batsman'].append(batting[striker])
+        out['non_striker'].append(batting[non_striker])
+        out['bowler'].append(bowling[bowlers[(over[i] - 1) % 5]])
+        out['is_super_over'].append(0)
+        out['wide_runs'].append(int(wide_runs[i]))
+        out['bye_runs'].append(int(extra_runs[i]) if bye[i] else 0)
+        out['legbye_runs'].append(int(extra_runs[i]) if legbye[i] else 0)
+        out['noball_runs'].append(int(noball[i]))
+        out['penalty_runs'].append(0)
+        out['batsman_runs'].append(int(runs[i]))
+        out['extra_runs'].append(int(extra_runs[i]))
+        out['total_runs'].append(int(total[i]))
+        if wicket[i]:
+            out['player_dismissed'].append(batting[striker])
+            out['dismissal_kind'].append(kind[i])
+            if kind[i] == 'stumped':
+                out['fielder'].append(bowling[KEEPER_SLOT])
+            elif kind[i] in FIELDED:
+                out['fielder'].append(bowling[fielder_slot[i]])
+            else:
+                out['fielder'].append(None)
+            striker, next_in = min(next_in, 10), next_in + 1
+        else:
+            out['player_dismissed'].append(None)
+            out['dismissal_kind'].append(None)
+            out['fielder'].append(None)
+            # Odd runs (off the bat or run as byes) swap ends
+            if (runs[i] + (extra_runs[i] if bye[i] or legbye[i] else 0)) % 2:
+                striker, non_striker = non_striker, striker
+    return out, int(total[:end].sum()), int(wickets[end - 1]) if end else 0
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    squads, umpires = catalog(seed)
+    matches, deliveries = [], []
+    for match in range(start, start + n_rows):
+        # Matches are spread evenly over the seasons, each season from early April over about 50 days
+        season_index = match * len(SEASONS) // total
+        season = SEASONS[season_index]
+        first = -(-season_index * total // len(SEASONS))
+        size = -(-(season_index + 1) * total // len(SEASONS)) - first
+        date = pd.Timestamp(season, 4, 5) + pd.Timedelta(days=(match - first) * 50 // max(size, 1))
+
+        teams = [team for team, (_, _, seasons) in TEAMS.items() if season in seasons]
+        team1, team2 = rng.choice(teams, 2, replace=False)
+        if season in AWAY_VENUES:
+            city, venue = AWAY_VENUES[season][rng.integers(len(AWAY_VENUES[season]))]
+        else:
+            city, venue, _ = TEAMS[team1 if rng.random() < 0.5 else team2]
+        toss_winner = team1 if rng.random() < 0.5 else team2
+        toss_decision = 'field' if rng.random() < (0.35 if season < 2013 else 0.75) else 'bat'
+        batting_first = toss_winner if toss_decision == 'bat' else (team2 if toss_winner == team1 else team1)
+        chasing = team2 if batting_first == team1 else team1
+
+        # Core players are picked most often; the XI bats in squad order
+        weights = np.r_[np.full(14, 3.0), np.ones(SQUAD_SIZE - 14)]
+        xi = {team: [squads[team][i] for i in np.sort(rng.choice(SQUAD_SIZE, 11, replace=False,
+                                                                  p=weights / weights.sum()))]
+              for team in (team1, team2)}
+        match_id = match + 1
+        no_result = rng.random() < 0.005
+
+        first_innings, first_total, _ = play_innings(rng, xi[batting_first], xi[chasing],
+                                                     max_overs=int(rng.integers(3, 15)) if no_result else 20)
+        innings = [(1, batting_first, chasing, first_innings)]
+        winner, by_runs, by_wickets, result = None, 0, 0, 'no result'
+        if not no_result:
+            second_innings, second_total, second_wickets = play_innings(rng, xi[chasing], xi[batting_first],
+                                                                        target=first_total + 1)
+            innings.append((2, chasing, batting_first, second_innings))
+            if second_total > first_total:
+                winner, by_wickets, result = chasing, 10 - second_wickets, 'normal'
+            elif second_total < first_total:
+                winner, by_runs, result = batting_first, first_total - second_total, 'normal'
+            else:
+                # Ties went to a super over, which is not simulated here
+                winner, result = (team1 if rng.random() < 0.5 else team2), 'tie'
+
+        best, best_runs = None, -1
+        for inning, bat, bowl, balls in innings:
+            rows = pd.DataFrame(balls, columns=DELIVERY_COLUMNS[4:])
+            rows.insert(0, 'bowling_team', bowl)
+            rows.insert(0, 'batting_team', bat)
+            rows.insert(0, 'inning', inning)
+            rows.insert(0, 'match_id', match_id)
+            deliveries.append(rows)
+            if bat == winner and len(rows):
+                top = rows.groupby('batsman')['batsman_runs'].sum()
+                if top.max() > best_runs:
+                    best, best_runs = top.idxmax(), top.max()
+
+        first_umpire, second_umpire = rng.choice(len(umpires), 2, replace=False)
+        matches.append({
+            'id': match_id, 'season': season, 'city': city, 'date': date.strftime('%Y-%m-%d'),
+            'team1': team1, 'team2': team2, 'toss_winner': toss_winner, 'toss_decision': toss_decision,
+            'result': result, 'dl_applied': int(rng.random() < 0.025 and result == 'normal'),
+            'winner': winner, 'win_by_runs': by_runs, 'win_by_wickets': by_wickets, 'player_of_match': best,
+            'venue': venue, 'umpire1': umpires[first_umpire], 'umpire2': umpires[second_umpire], 'umpire3': None,
+        })
+    return {
+        'matches': pd.DataFrame(matches, columns=MATCH_COLUMNS),
+        'deliveries': pd.concat(deliveries, ignore_index=True)[DELIVERY_COLUMNS],
+    }
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from .common import multi_values, person_names, phrases, pick, random_days
+
+FILES = {'titles': 'Netflix_Titles/netflix_titles.csv'}
+BASE_ROWS = 8_807
+CHUNK_ROWS = 20_000
+
+COLUMNS = ['show_id', 'type', 'title', 'director', 'cast', 'country', 'date_added', 'release_year', 'rating',
+           'duration', 'listed_in', 'description']
+
+# Genre -> number of titles listing it in the real catalogue, per type
+MOVIE_GENRES = {
+    'International Movies': 2752, 'Dramas': 2427, 'Comedies': 1674, 'Documentaries': 869,
+    'Action & Adventure': 859, 'Independent Movies': 756, 'Children & Family Movies': 641,
+    'Romantic Movies': 616, 'Thrillers': 577, 'Music & Musicals': 375, 'Horror Movies': 357,
+    'Stand-Up Comedy': 343, 'Sci-Fi & Fantasy': 243, 'Sports Movies': 219, 'Classic Movies': 116,
+    'LGBTQ Movies': 102, 'Anime Features': 71, 'Cult Movies': 71, 'Faith & Spirituality': 65, 'Movies': 57,
+}
+TV_GENRES = {
+    'International TV Shows': 1351, 'TV Dramas': 763, 'TV Comedies': 581, 'Crime TV Shows': 470,
+    "Kids' TV": 451, 'Docuseries': 395, 'Romantic TV Shows': 370, 'Reality TV': 255, 'British TV Shows': 253,
+    'Anime Series': 176, 'Spanish-Language TV Shows': 174, 'TV Action & Adventure': 168, 'Korean TV Shows': 151,
+    'TV Mysteries': 98, 'Science & Nature TV': 92, 'TV Sci-Fi & Fantasy': 84, 'TV Horror': 75,
+    'Teen TV Shows': 69, 'TV Thrillers': 57, 'Stand-Up Comedy & Talk Shows': 56, 'Classic & Cult TV': 28,
+    'TV Shows': 16,
+}
+COUNTRIES = {
+    'United States': 0.368, 'India': 0.104, 'United Kingdom': 0.080, 'Canada': 0.044, 'France': 0.039,
+    'Japan': 0.032, 'Spain': 0.023, 'South Korea': 0.023, 'Germany': 0.023, 'Mexico': 0.017, 'China': 0.016,
+    'Australia': 0.016, 'Egypt': 0.012, 'Turkey': 0.011, 'Hong Kong': 0.010, 'Nigeria': 0.010,
+    'Italy': 0.010, 'Brazil': 0.010, 'Argentina': 0.009, 'Belgium': 0.009,
+}
+MOVIE_RATINGS = {'TV-MA': 0.33, 'TV-14': 0.23, 'R': 0.13, 'PG-13': 0.08, 'TV-PG': 0.09, 'PG': 0.047,
+                 'TV-Y7': 0.02, 'TV-Y': 0.02, 'TV-G': 0.025, 'NR': 0.012, 'G': 0.007, 'NC-17': 0.001}
+TV_RATINGS = {'TV-MA': 0.44, 'TV-14': 0.27, 'TV-PG': 0.12, 'TV-Y7': 0.075, 'TV-Y': 0.065, 'TV-G': 0.027,
+              'TV-Y7-FV': 0.003}
+# Share of TV shows by number of seasons, from one to ten
+SEASON_SHARES = [0.67, 0.159, 0.074, 0.036, 0.024, 0.012, 0.009, 0.006, 0.003, 0.007]
+# Titles added per year, mostly from 2016 on
+ADDED_YEARS = {2014: 24, 2015: 82, 2016: 429, 2017: 1188, 2018: 1649, 2019: 2016, 2020: 1879, 2021: 1498}
+
+
+def _weights(mapping):
+    weights = np.array(list(mapping.values()), dtype='float64')
+    return weights / weights.sum()
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    n = n_rows
+    is_movie = rng.random(n) < 0.696
+
+    # Added between 2014 and September 2021, most titles released a few years earlier
+    days = pd.date_range('2014-01-01', '2021-09-25', freq='D')
+    days_per_year = days.year.value_counts()
+    day_weights = days.year.map(ADDED_YEARS).to_numpy() / days.year.map(days_per_year).to_numpy()
+    added = random_days(rng, days[0], days[-1], n, day_weights)
+    added_year = added.year.to_numpy()
+    release_year = (added_year - np.round(rng.exponential(3.5, n))).astype(int)
+    classics = rng.random(n) < 0.03
+    release_year[classics] = rng.integers(1925, 1990, classics.sum())
+
+    listed_in = np.where(
+        is_movie,
+        multi_values(rng, list(MOVIE_GENRES), n, _weights(MOVIE_GENRES)),
+        multi_values(rng, list(TV_GENRES), n, _weights(TV_GENRES)),
+    )
+    country = multi_values(rng, list(COUNTRIES), n, _weights(COUNTRIES), max_k=1)
+    co_produced = rng.random(n) < 0.15
+    country[co_produced] = multi_values(rng, list(COUNTRIES), int(co_produced.sum()), _weights(COUNTRIES),
+                                        min_k=2, max_k=4)
+    cast_sizes = rng.integers(1, 16, n)
+    names, ends = person_names(rng, int(cast_sizes.sum())), np.cumsum(cast_sizes)
+    cast = np.array([', '.join(names[end - k:end]) for k, end in zip(cast_sizes, ends)], dtype=object)
+    directors = person_names(rng, n)
+    co_directed = rng.random(n) < 0.07
+    directors[co_directed] = directors[co_directed] + ', ' + person_names(rng, int(co_directed.sum()))
+
+    duration = np.where(
+        is_movie,
+        pd.Series(np.clip(np.round(rng.normal(99, 28, n)), 3, 312).astype(int)).astype(str) + ' min',
+        pd.Series(rng.choice(np.arange(1, 11), n, p=SEASON_SHARES)).map(
+            lambda k: '1 Season' if k == 1 else f"{k} Seasons"),
+    )
+    date_added = added.strftime('%B ') + added.day.astype(str) + added.strftime(', %Y')
+    rating = np.where(is_movie, pick(rng, list(MOVIE_RATINGS), n, _weights(MOVIE_RATINGS)),
+                      pick(rng, list(TV_RATINGS), n, _weights(TV_RATINGS)))
+
+    df = pd.DataFrame({
+        'show_id': 's' + pd.Series(np.arange(start + 1, start + n + 1)).astype(str),
+        'type': np.where(is_movie, 'Movie', 'TV Show'),
+        'title': phrases(rng, n, 1, 4),
+        # Directors are mostly credited on movies only
+        'director': np.where(rng.random(n) < np.where(is_movie, 0.97, 0.08), directors, None),
+        'cast': np.where(rng.random(n) < 0.906, cast, None),
+        'country': np.where(rng.random(n) < 0.906, country, None),
+        'date_added': np.where(rng.random(n) < 0.999, date_added, None),
+        'release_year': release_year,
+        'rating': rating,
+        'duration': duration,
+        'listed_in': listed_in,
+        'description': phrases(rng, n, 12, 24) + '.',
+    }, columns=COLUMNS)
+    return {'titles': df}
@@ -0,0 +1,120 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .common import dataset_rng, person_names, phrases, pick
+
+FILES = {'songs': 'Spotify_Song_Analysis/Spotify.csv'}
+BASE_ROWS = 232_725
+CHUNK_ROWS = 100_000
+
+# SpotifyFeatures.csv columns, plus a release year for the dashboard's year filter and the notebook's trend
+COLUMNS = ['genre', 'artist_name', 'track_name', 'track_id', 'popularity', 'acousticness', 'danceability',
+           'duration_ms', 'energy', 'instrumentalness', 'key', 'liveness', 'loudness', 'mode', 'speechiness',
+           'tempo', 'time_signature', 'valence', 'year']
+
+# Genre -> (share of songs, mean popularity, energy, acousticness, danceability, speechiness, instrumentalness)
+GENRES = {
+    'Comedy': (0.042, 21, 0.68, 0.79, 0.56, 0.85, 0.00),
+    'Soundtrack': (0.040, 34, 0.24, 0.76, 0.29, 0.05, 0.75),
+    'Indie': (0.040, 54, 0.57, 0.33, 0.57, 0.07, 0.11),
+    'Jazz': (0.040, 40, 0.47, 0.49, 0.59, 0.08, 0.34),
+    'Pop': (0.040, 66, 0.64, 0.22, 0.64, 0.11, 0.02),
+    'Electronic': (0.040, 38, 0.74, 0.12, 0.62, 0.09, 0.43),
+    "Children's Music": (0.040, 5, 0.54, 0.37, 0.63, 0.10, 0.05),
+    'Folk': (0.040, 39, 0.46, 0.55, 0.54, 0.05, 0.08),
+    'Hip-Hop': (0.040, 58, 0.64, 0.17, 0.72, 0.21, 0.01),
+    'Rock': (0.040, 59, 0.68, 0.19, 0.54, 0.05, 0.05),
+    'Alternative': (0.040, 51, 0.71, 0.16, 0.54, 0.09, 0.06),
+    'Classical': (0.040, 29, 0.18, 0.87, 0.31, 0.05, 0.60),
+    'Rap': (0.040, 60, 0.65, 0.17, 0.70, 0.19, 0.01),
+    'World': (0.040, 35, 0.49, 0.45, 0.47, 0.05, 0.20),
+    'Soul': (0.040, 47, 0.55, 0.33, 0.62, 0.08, 0.04),
+    'Blues': (0.040, 35, 0.61, 0.33, 0.53, 0.06, 0.09),
+    'R&B': (0.039, 52, 0.57, 0.28, 0.64, 0.11, 0.03),
+    'Anime': (0.039, 24, 0.72, 0.26, 0.47, 0.07, 0.27),
+    'Reggaeton': (0.038, 38, 0.75, 0.20, 0.73, 0.11, 0.01),
+    'Ska': (0.038, 28, 0.83, 0.12, 0.57, 0.07, 0.11),
+    'Reggae': (0.038, 36, 0.61, 0.18, 0.70, 0.12, 0.08),
+    'Dance': (0.038, 57, 0.70, 0.15, 0.64, 0.09, 0.04),
+    'Country': (0.037, 46, 0.65, 0.26, 0.58, 0.04, 0.01),
+    'Opera': (0.036, 14, 0.19, 0.94, 0.29, 0.05, 0.22),
+    'Movie': (0.034, 12, 0.41, 0.57, 0.50, 0.09, 0.11),
+    'A Capella': (0.001, 10, 0.26, 0.83, 0.41, 0.06, 0.02),
+}
+KEYS = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+TIME_SIGNATURES = {'4/4': 0.86, '3/4': 0.10, '5/4': 0.025, '1/4': 0.014, '0/4': 0.001}
+ID_ALPHABET = np.array(list('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'))
+# Songs per artist on average; within a genre, artist popularity is heavily skewed
+SONGS_PER_ARTIST = 16
+
+
+@lru_cache(maxsize=None)
+def artists(seed, total):
+    """
+    Artist names per genre (about total / SONGS_PER_ARTIST in all), most
+    prolific first, and how much more popular than their genre each one is.
+    """
+    rng = dataset_rng(seed, 'spotify', 'artists')
+    names, lift = {}, {}
+    for genre, (share, *_) in GENRES.items():
+        k = max(1, int(total * share / SONGS_PER_ARTIST))
+        names[genre] = np.where(rng.random(k) < 0.6, person_names(rng, k), 'The ' + phrases(rng, k, 1, 2))
+        lift[genre] = np.sort(rng.normal(0, 8, k))[::-1]
+    return names, lift
+
+
+def _beta(rng, mean, concentration, size):
+    """
+    Beta draws with the given means (clipped away from 0 and 1) and a common concentration.
+    """
+    mean = np.clip(mean, 0.01, 0.99)
+    return rng.beta(mean * concentration, (1 - mean) * concentration, size)
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    n = n_rows
+    names, lift = artists(seed, total)
+    genres = list(GENRES)
+    profile = np.array([GENRES[g][1:] for g in genres])
+    shares = np.array([GENRES[g][0] for g in genres])
+    genre = rng.choice(len(genres), n, p=shares / shares.sum())
+    popularity_mean, energy_mean, acoustic_mean, dance_mean, speech_mean, instrumental_mean = profile[genre].T
+
+    # Artists within a genre: a few release most songs (power-law rank)
+    artist = np.empty(n, dtype=object)
+    artist_lift = np.empty(n)
+    for i, name in enumerate(genres):
+        rows = np.flatnonzero(genre == i)
+        rank = np.floor(len(names[name]) * rng.random(len(rows)) ** 3).astype(int)
+        artist[rows] = names[name][rank]
+        artist_lift[rows] = lift[name][rank]
+
+    energy = _beta(rng, energy_mean, 6, n)
+    danceability = _beta(rng, dance_mean, 12, n)
+    popularity = np.clip(np.round(popularity_mean + artist_lift + rng.normal(0, 11, n)), 0, 100).astype(int)
+
+    df = pd.DataFrame({
+        'genre': np.array(genres, dtype=object)[genre],
+        'artist_name': artist,
+        'track_name': phrases(rng, n, 1, 5),
+        'track_id': ID_ALPHABET[rng.integers(0, len(ID_ALPHABET), (n, 22))].view('<U22').ravel(),
+        'popularity': popularity,
+        'acousticness': np.round(np.clip(_beta(rng, acoustic_mean - 0.3 * (energy - energy_mean), 2, n), 0, 0.996), 6),
+        'danceability': np.round(danceability, 3),
+        'duration_ms': np.round(rng.lognormal(np.log(225_000), 0.35, n)).astype(int).clip(15_387, 5_552_917),
+        'energy': np.round(energy, 3),
+        'instrumentalness': np.round(np.where(rng.random(n) < 0.45, 0, _beta(rng, instrumental_mean, 1.5, n)), 6),
+        'key': pick(rng, KEYS, n),
+        'liveness': np.round(_beta(rng, 0.2, 5, n), 4),
+        'loudness': np.round(np.clip(-4 - 16 * (1 - energy) + rng.normal(0, 2.5, n), -52, 3.7), 3),
+        'mode': np.where(rng.random(n) < 0.65, 'Major', 'Minor'),
+        'speechiness': np.round(_beta(rng, speech_mean, 6, n), 4),
+        'tempo': np.round(np.clip(rng.normal(118, 30, n), 30.4, 242.9), 3),
+        'time_signature': pick(rng, list(TIME_SIGNATURES), n, p=list(TIME_SIGNATURES.values())),
+        'valence': np.round(_beta(rng, 0.15 + 0.35 * danceability + 0.25 * energy, 5, n), 4),
+        # Release years skew heavily towards the last decade
+        'year': np.round(2019 - rng.exponential(7, n)).clip(1950, 2019).astype(int),
+    }, columns=COLUMNS)
+    return {'songs': df}
@@ -0,0 +1,188 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .common import FIRST_NAMES, LAST_NAMES, dataset_rng, pick, random_days, us_date, zipf_weights
+
+FILES = {'orders': 'Superstore_Sales_Analysis/Sample Superstore.csv'}
+BASE_ROWS = 9_994
+CHUNK_ROWS = 50_000
+
+COLUMNS = ['Row ID', 'Order ID', 'Order Date', 'Ship Date', 'Ship Mode', 'Customer ID', 'Customer Name',
+           'Segment', 'Country', 'City', 'State', 'Postal Code', 'Region', 'Product ID', 'Category',
+           'Sub-Category', 'Product Name', 'Sales', 'Quantity', 'Discount', 'Profit']
+
+# Busiest cities first: (city, state, region, postal code)
+CITIES = [
+    ('New York City', 'New York', 'East', 10035), ('Los Angeles', 'California', 'West', 90036),
+    ('Philadelphia', 'Pennsylvania', 'East', 19140), ('San Francisco', 'California', 'West', 94122),
+    ('Seattle', 'Washington', 'West', 98105), ('Houston', 'Texas', 'Central', 77095),
+    ('Chicago', 'Illinois', 'Central', 60610), ('Columbus', 'Ohio', 'East', 43229),
+    ('San Diego', 'California', 'West', 92024), ('Springfield', 'Missouri', 'Central', 65807),
+    ('Dallas', 'Texas', 'Central', 75220), ('Jacksonville', 'Florida', 'South', 32216),
+    ('Detroit', 'Michigan', 'Central', 48205), ('Newark', 'Delaware', 'East', 19711),
+    ('Richmond', 'Virginia', 'South', 23223), ('Jackson', 'Mississippi', 'South', 39212),
+    ('Columbia', 'South Carolina', 'South', 29203), ('Aurora', 'Colorado', 'West', 80013),
+    ('Phoenix', 'Arizona', 'West', 85023), ('Long Beach', 'California', 'West', 90805),
+    ('Arlington', 'Virginia', 'South', 22204), ('San Antonio', 'Texas', 'Central', 78207),
+    ('Louisville', 'Kentucky', 'South', 40214), ('Miami', 'Florida', 'South', 33142),
+    ('Rochester', 'New York', 'East', 14609), ('Charlotte', 'North Carolina', 'South', 28205),
+    ('Henderson', 'Kentucky', 'South', 42420), ('Lakewood', 'New Jersey', 'East', 8701),
+    ('Lancaster', 'Pennsylvania', 'East', 17602), ('Fairfield', 'Connecticut', 'East', 6824),
+    ('Milwaukee', 'Wisconsin', 'Central', 53209), ('Denver', 'Colorado', 'West', 80219),
+    ('Baltimore', 'Maryland', 'East', 21215), ('Cleveland', 'Ohio', 'East', 44105),
+    ('Atlanta', 'Georgia', 'South', 30318), ('Minneapolis', 'Minnesota', 'Central', 55407),
+    ('Tampa', 'Florida', 'South', 33614), ('Memphis', 'Tennessee', 'South', 38109),
+    ('Providence', 'Rhode Island', 'East', 2908), ('Salem', 'Oregon', 'West', 97301),
+    ('Portland', 'Oregon', 'West', 97206), ('Oklahoma City', 'Oklahoma', 'Central', 73120),
+    ('Las Vegas', 'Nevada', 'West', 89115), ('Albuquerque', 'New Mexico', 'West', 87105),
+    ('Tucson', 'Arizona', 'West', 85705), ('Omaha', 'Nebraska', 'Central', 68104),
+    ('Indianapolis', 'Indiana', 'Central', 46203), ('Wilmington', 'Delaware', 'East', 19805),
+    ('Washington', 'District of Columbia', 'East', 20016), ('Manchester', 'New Hampshire', 'East', 3103),
+    ('New Orleans', 'Louisiana', 'South', 70119), ('Little Rock', 'Arkansas', 'South', 72209),
+    ('Huntsville', 'Alabama', 'South', 35810), ('Nashville', 'Tennessee', 'South', 37211),
+    ('Des Moines', 'Iowa', 'Central', 50315), ('Wichita', 'Kansas', 'Central', 67212),
+    ('Sioux Falls', 'South Dakota', 'Central', 57103), ('Fargo', 'North Dakota', 'Central', 58103),
+    ('Provo', 'Utah', 'West', 84604), ('Boise', 'Idaho', 'West', 83704), ('Helena', 'Montana', 'West', 59601),
+    ('Cheyenne', 'Wyoming', 'West', 82001), ('Burlington', 'Vermont', 'East', None),
+    ('Portland', 'Maine', 'East', 4101), ('Huntington', 'West Virginia', 'East', 25701),
+    ('Boston', 'Massachusetts', 'East', 2148),
+]
+# Category -> {sub-category: (share of lines, median unit price, median margin at no discount)}
+PRODUCTS = {
+    'Furniture': {'Bookcases': (0.023, 90, 0.10), 'Chairs': (0.062, 105, 0.16),
+                  'Furnishings': (0.096, 12, 0.30), 'Tables': (0.032, 150, 0.12)},
+    'Office Supplies': {'Appliances': (0.047, 25, 0.28), 'Art': (0.080, 4.5, 0.27),
+                        'Binders': (0.152, 6, 0.35), 'Envelopes': (0.025, 9, 0.45),
+                        'Fasteners': (0.022, 3, 0.32), 'Labels': (0.036, 4, 0.45),
+                        'Paper': (0.137, 7.5, 0.45), 'Storage': (0.085, 33, 0.15),
+                        'Supplies': (0.019, 8, 0.15)},
+    'Technology': {'Accessories': (0.078, 30, 0.25), 'Copiers': (0.007, 400, 0.35),
+                   'Machines': (0.012, 180, 0.15), 'Phones': (0.089, 60, 0.24)},
+}
+BRANDS = ['Avery', 'Bush', 'Hon', 'Eldon', 'Fellowes', 'Xerox', 'Acco', 'Global', 'Logitech', 'Staples',
+          'Cisco', 'Canon', 'Hewlett-Packard', 'Samsung', 'Tenex', 'Wilson Jones', 'Newell', 'Sauder', 'Kingston']
+STYLES = ['Deluxe', 'Premium', 'Classic', 'Executive', 'Economy', 'Heavy-Duty', 'Compact', 'Wireless',
+          'Recycled', 'Standard', 'Ergonomic', 'Portable']
+SEGMENTS = {'Consumer': 0.519, 'Corporate': 0.302, 'Home Office': 0.179}
+# Ship mode -> (share, fewest days to ship, most days to ship)
+SHIP_MODES = {'Standard Class': (0.597, 4, 7), 'Second Class': (0.195, 2, 5), 'First Class': (0.154, 1, 4),
+              'Same Day': (0.054, 0, 0)}
+# Discount -> (share, median margin offset): deep discounts sell at a loss
+DISCOUNTS = {0.0: (0.48, 0.0), 0.1: (0.009, -0.17), 0.15: (0.005, -0.29), 0.2: (0.366, -0.16),
+             0.3: (0.023, -0.43), 0.32: (0.003, -0.52), 0.4: (0.021, -0.57), 0.45: (0.001, -0.78),
+             0.5: (0.007, -0.94), 0.6: (0.014, -0.99), 0.7: (0.042, -1.07), 0.8: (0.03, -1.99)}
+QUANTITIES = {1: 0.09, 2: 0.24, 3: 0.241, 4: 0.119, 5: 0.123, 6: 0.057, 7: 0.061, 8: 0.026, 9: 0.026,
+              10: 0.006, 11: 0.003, 12: 0.002, 13: 0.003, 14: 0.003}
+# Lines per order, from one to ten
+ORDER_SIZES = [0.507, 0.244, 0.12, 0.067, 0.032, 0.014, 0.01, 0.003, 0.002, 0.001]
+# Orders per year grow about 25% a year and peak in the autumn
+YEAR_WEIGHTS = {2014: 1.0, 2015: 1.1, 2016: 1.35, 2017: 1.7}
+MONTH_WEIGHTS = [0.5, 0.35, 0.8, 0.75, 0.8, 0.8, 0.8, 0.8, 1.6, 1.0, 1.6, 1.75]
+
+
+def _shares(mapping, index=0):
+    weights = np.array([value[index] if isinstance(value, tuple) else value for value in mapping.values()])
+    return weights / weights.sum()
+
+
+@lru_cache(maxsize=None)
+def catalog(seed, total):
+    """
+    Customers and products for a dataset of total order lines. Both grow
+    with the square root of the number of lines, so repeat customers and
+    products become more common at larger scales, as in a real store.
+    """
+    rng = dataset_rng(seed, 'superstore', 'catalog')
+    growth = np.sqrt(total / BASE_ROWS)
+
+    n_customers = max(20, int(793 * growth))
+    first, last = pick(rng, FIRST_NAMES, n_customers), pick(rng, LAST_NAMES, n_customers)
+    customer_ids = np.array([f"{f[0]}{l[0]}-{number}" for f, l, number in
+                             zip(first, last, rng.choice(np.arange(10000, 100000), n_customers, replace=False))],
+                            dtype=object)
+    customers = pd.DataFrame({
+        'Customer ID': customer_ids,
+        'Customer Name': first + ' ' + last,
+        'Segment': pick(rng, list(SEGMENTS), n_customers, p=_shares(SEGMENTS)),
+    })
+
+    n_products = max(30, int(1862 * growth))
+    subs = [(category, sub, *values) for category, subs in PRODUCTS.items() for sub, values in subs.items()]
+    sub = rng.choice(len(subs), n_products, p=np.array([s[2] for s in subs]) / sum(s[2] for s in subs))
+    numbers = 10_000_000 + rng.choice(max(5_000, 4 * n_products), n_products, replace=False)
+    products = pd.DataFrame({
+        'Product ID': [f"{subs[s][0][:3].upper()}-{subs[s][1][:2].upper()}-{number}"
+                       for s, number in zip(sub, numbers)],
+        'Category': [subs[s][0] for s in sub],
+        'Sub-Category': [subs[s][1] for s in sub],
+        'Product Name': pick(rng, BRANDS, n_products) + ' ' + pick(rng, STYLES, n_products) + ' '
+        + np.array([subs[s][1].rstrip('s') for s in sub], dtype=object),
+        'unit_price': np.round(np.array([subs[s][3] for s in sub]) * rng.lognormal(0, 0.6, n_products), 2),
+        'margin': np.array([subs[s][4] for s in sub]) + rng.normal(0, 0.05, n_products),
+        # Some products sell far more than others
+        'weight': zipf_weights(n_products, 0.4)[rng.permutation(n_products)],
+    })
+    return customers, products
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    customers, products = catalog(seed, total)
+
+    # Orders of one to ten lines, cut to the chunk's lines; every order draws one date, customer and address
+    sizes = rng.choice(np.arange(1, 11), n_rows, p=ORDER_SIZES)
+    sizes = sizes[:int(np.searchsorted(np.cumsum(sizes), n_rows)) + 1]
+    sizes[-1] -= sizes.sum() - n_rows
+    n_orders = len(sizes)
+    order_of_line = np.repeat(np.arange(n_orders), sizes)
+    first_line = start + np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    days = pd.date_range('2014-01-03', '2017-12-30', freq='D')
+    day_weights = days.year.map(YEAR_WEIGHTS).to_numpy() * np.array(MONTH_WEIGHTS)[days.month - 1]
+    order_dates = random_days(rng, days[0], days[-1], n_orders, day_weights)
+    modes = list(SHIP_MODES)
+    mode = rng.choice(len(modes), n_orders, p=_shares(SHIP_MODES))
+    lo, hi = np.array([SHIP_MODES[m][1] for m in modes]), np.array([SHIP_MODES[m][2] for m in modes])
+    ship_dates = order_dates + pd.to_timedelta(rng.integers(lo[mode], hi[mode] + 1), unit='D')
+    # Regular customers order more often, and some cities far more than others
+    customer = rng.choice(len(customers), n_orders, p=zipf_weights(len(customers), 0.3))
+    city = rng.choice(len(CITIES), n_orders, p=zipf_weights(len(CITIES), 1.0))
+    prefix = np.where(rng.random(n_orders) < 0.82, 'CA-', 'US-')
+    order_ids = prefix + order_dates.year.astype(str).to_numpy() + '-' + (100_000 + first_line).astype(str)
+
+    product = rng.choice(len(products), n_rows, p=products['weight'])
+    quantity = rng.choice(list(QUANTITIES), n_rows, p=_shares(QUANTITIES))
+    discount_levels = np.array(list(DISCOUNTS))
+    discount = discount_levels[rng.choice(len(discount_levels), n_rows, p=_shares(DISCOUNTS))]
+    margin_offset = np.array([DISCOUNTS[d][1] for d in discount_levels])[np.searchsorted(discount_levels, discount)]
+    lines = products.iloc[product].reset_index(drop=True)
+    sales = np.round(lines['unit_price'].to_numpy() * quantity * (1 - discount), 4)
+    profit = np.round(sales * (lines['margin'].to_numpy() + margin_offset + rng.normal(0, 0.08, n_rows)), 4)
+
+    buyers = customers.iloc[customer[order_of_line]].reset_index(drop=True)
+    places = [CITIES[i] for i in city[order_of_line]]
+    df = pd.DataFrame({
+        'Row ID': np.arange(start + 1, start + n_rows + 1),
+        'Order ID': order_ids[order_of_line],
+        'Order Date': us_date(order_dates[order_of_line]),
+        'Ship Date': us_date(ship_dates[order_of_line]),
+        'Ship Mode': np.array(modes, dtype=object)[mode[order_of_line]],
+        'Customer ID': buyers['Customer ID'],
+        'Customer Name': buyers['Customer Name'],
+        'Segment': buyers['Segment'],
+        'Country': 'United States',
+        'City': [place[0] for place in places],
+        'State': [place[1] for place in places],
+        'Postal Code': pd.array([place[3] for place in places], dtype='Int64'),
+        'Region': [place[2] for place in places],
+        'Product ID': lines['Product ID'],
+        'Category': lines['Category'],
+        'Sub-Category': lines['Sub-Category'],
+        'Product Name': lines['Product Name'],
+        'Sales': sales,
+        'Quantity': quantity,
+        'Discount': discount,
+        'Profit': profit,
+    }, columns=COLUMNS)
+    return {'orders': df}
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from .common import FEMALE_NAMES, LAST_NAMES, MALE_NAMES, pick
+
+FILES = {'passengers': 'Titanic/titanic.csv'}
+BASE_ROWS = 887
+CHUNK_ROWS = 50_000
+
+COLUMNS = ['Survived', 'Pclass', 'Name', 'Sex', 'Age', 'Siblings/Spouses Aboard', 'Parents/Children Aboard',
+           'Fare']
+
+# Share of passengers per class, and survival rates of (female, male) passengers per class
+CLASS_SHARES = [0.243, 0.207, 0.550]
+SURVIVAL = {1: (0.968, 0.369), 2: (0.921, 0.157), 3: (0.500, 0.137)}
+# Median age and fare per class
+AGES = {1: 37, 2: 29, 3: 24}
+FARES = {1: 60, 2: 14.5, 3: 8.05}
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    n = n_rows
+    pclass = rng.choice([1, 2, 3], n, p=CLASS_SHARES)
+    male = rng.random(n) < 0.645
+    age = np.clip(np.round(np.array([AGES[c] for c in pclass]) + rng.normal(0, 13, n)), 1, 80)
+    infants = rng.random(n) < 0.01
+    age[infants] = np.round(rng.uniform(0.42, 1, infants.sum()), 2)
+    child = age < 13
+
+    # Women and children first; within each group survival falls with the class
+    female_rate, male_rate = np.array([SURVIVAL[c] for c in pclass]).T
+    rate = np.where(male & ~child, male_rate, np.where(child, (female_rate + male_rate) / 2 + 0.1, female_rate))
+    survived = (rng.random(n) < rate).astype(int)
+
+    married = ~child & (age > 20) & (rng.random(n) < 0.35)
+    titles = np.where(male, np.where(child, 'Master.', 'Mr.'), np.where(married, 'Mrs.', 'Miss.'))
+    professionals = ~child & (rng.random(n) < 0.015)
+    titles[professionals] = pick(rng, ['Dr.', 'Rev.', 'Major.', 'Col.'], int(professionals.sum()))
+    surnames = pick(rng, LAST_NAMES, n)
+    first_names = np.where(male, pick(rng, MALE_NAMES, n), pick(rng, FEMALE_NAMES, n))
+    names = titles + ' ' + first_names + ' ' + surnames
+    # Married women are listed under their husband's name with their own in brackets
+    wives = married & ~male
+    k = int(wives.sum())
+    names[wives] = ('Mrs. ' + pick(rng, MALE_NAMES, k) + ' ' + surnames[wives] + ' ('
+                    + first_names[wives] + ' ' + pick(rng, LAST_NAMES, k) + ')')
+
+    siblings = np.where(rng.random(n) < 0.32, rng.choice([1, 1, 1, 2, 3, 4, 5, 8], n), 0)
+    parents = np.where(rng.random(n) < np.where(child, 0.9, 0.15), rng.choice([1, 1, 2, 2, 3, 4, 5, 6], n), 0)
+    group = 1 + siblings + parents
+    fare = np.round(np.array([FARES[c] for c in pclass]) * rng.lognormal(0, 0.5, n) * np.sqrt(group), 4)
+    fare[rng.random(n) < 0.017] = 0
+
+    df = pd.DataFrame({
+        'Survived': survived,
+        'Pclass': pclass,
+        'Name': names,
+        'Sex': np.where(male, 'male', 'female'),
+        'Age': age,
+        'Siblings/Spouses Aboard': siblings,
+        'Parents/Children Aboard': parents,
+        'Fare': fare,
+    }, columns=COLUMNS)
+    return {'passengers': df}
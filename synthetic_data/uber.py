@@ -0,0 +1,72 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .common import pick
+
+FILES = {'trips': 'Uber/Uber_Data.csv'}
+BASE_ROWS = 564_516
+CHUNK_ROWS = 250_000
+
+COLUMNS = ['Date/Time', 'Lat', 'Lon', 'Base']
+
+# Pickups from April to September 2014, growing month on month
+FIRST_DAY, LAST_DAY = '2014-04-01', '2014-09-30'
+MONTH_WEIGHTS = {4: 1.0, 5: 1.15, 6: 1.19, 7: 1.41, 8: 1.47, 9: 1.83}
+# Relative pickups per hour of day, Monday to Friday and at the weekend
+WEEKDAY_HOURS = [0.45, 0.27, 0.18, 0.22, 0.30, 0.50, 0.85, 1.15, 1.10, 0.90, 0.85, 0.88,
+                 0.92, 0.98, 1.20, 1.40, 1.60, 1.75, 1.70, 1.45, 1.35, 1.35, 1.20, 0.80]
+WEEKEND_HOURS = [0.95, 0.80, 0.60, 0.45, 0.30, 0.25, 0.25, 0.35, 0.50, 0.65, 0.75, 0.85,
+                 0.90, 0.95, 1.00, 1.05, 1.10, 1.15, 1.20, 1.20, 1.15, 1.20, 1.25, 1.10]
+# Relative pickups per day of week, Monday first
+DAY_WEIGHTS = [0.86, 1.00, 1.08, 1.10, 1.10, 0.95, 0.75]
+# Pickup hot spots: (share, latitude, longitude, spread in degrees)
+HOTSPOTS = [
+    (0.38, 40.752, -73.985, 0.016),   # Midtown
+    (0.17, 40.725, -73.995, 0.012),   # Village and SoHo
+    (0.08, 40.710, -74.008, 0.006),   # Financial District
+    (0.10, 40.780, -73.965, 0.015),   # Upper East and West Sides
+    (0.08, 40.705, -73.955, 0.020),   # Williamsburg and Downtown Brooklyn
+    (0.04, 40.645, -73.780, 0.006),   # JFK
+    (0.03, 40.773, -73.872, 0.004),   # LaGuardia
+    (0.12, 40.720, -73.900, 0.090),   # The rest of the city
+]
+BASES = {'B02512': 0.063, 'B02598': 0.327, 'B02617': 0.384, 'B02682': 0.205, 'B02764': 0.021}
+
+
+@lru_cache(maxsize=None)
+def minute_profile():
+    """
+    The minutes of the period and their cumulative share of pickups, from
+    the month, day-of-week and hour-of-day profiles.
+    """
+    minutes = pd.date_range(FIRST_DAY, pd.Timestamp(LAST_DAY) + pd.Timedelta('23:59:00'), freq='min')
+    weekend = minutes.dayofweek >= 5
+    hours = np.where(weekend, np.array(WEEKEND_HOURS)[minutes.hour], np.array(WEEKDAY_HOURS)[minutes.hour])
+    weights = hours * np.array(DAY_WEIGHTS)[minutes.dayofweek] * minutes.month.map(MONTH_WEIGHTS).to_numpy()
+    cumulative = np.cumsum(weights)
+    return minutes, cumulative / cumulative[-1]
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    n = n_rows
+    minutes, cumulative = minute_profile()
+    # Row r takes the pickup time at quantile (r + jitter) / total, so the file comes out in time order
+    # (the position of the quantile within its minute gives the seconds)
+    quantiles = (start + np.arange(n) + rng.random(n)) / total
+    minute = np.minimum(np.searchsorted(cumulative, quantiles), len(minutes) - 1)
+    before = np.where(minute > 0, cumulative[minute - 1], 0)
+    seconds = np.clip((quantiles - before) / (cumulative[minute] - before) * 60, 0, 59).astype(int)
+    times = minutes[minute] + pd.to_timedelta(seconds, unit='s')
+
+    spot = rng.choice(len(HOTSPOTS), n, p=[h[0] for h in HOTSPOTS])
+    _, lat, lon, spread = np.array(HOTSPOTS).T
+    df = pd.DataFrame({
+        'Date/Time': (times.month.astype(str) + '/' + times.day.astype(str) + '/' + times.year.astype(str) + ' '
+                      + times.hour.astype(str) + times.strftime(':%M:%S')),
+        'Lat': np.round(lat[spot] + rng.normal(0, 1, n) * spread[spot], 4),
+        'Lon': np.round(lon[spot] + rng.normal(0, 1, n) * spread[spot], 4),
+        'Base': pick(rng, list(BASES), n, p=list(BASES.values())),
+    }, columns=COLUMNS)
+    return {'trips': df}
@@ -0,0 +1,149 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .common import WORDS, dataset_rng, multi_values, phrases, pick, zipf_weights
+
+FILES = {'restaurants': 'Zomato_Restaurant_Analysis/zomato.csv'}
+BASE_ROWS = 51_717
+CHUNK_ROWS = 10_000
+
+COLUMNS = ['url', 'address', 'name', 'online_order', 'book_table', 'rate', 'votes', 'phone', 'location',
+           'rest_type', 'dish_liked', 'cuisines', 'approx_cost(for two people)', 'reviews_list', 'menu_item',
+           'listed_in(type)', 'listed_in(city)']
+
+LOCATIONS = ['BTM', 'HSR', 'Koramangala 5th Block', 'JP Nagar', 'Whitefield', 'Indiranagar', 'Jayanagar',
+             'Marathahalli', 'Bannerghatta Road', 'Bellandur', 'Electronic City', 'Koramangala 1st Block',
+             'Brigade Road', 'Koramangala 7th Block', 'Koramangala 6th Block', 'Sarjapur Road', 'Ulsoor',
+             'Koramangala 4th Block', 'MG Road', 'Banashankari', 'Kalyan Nagar', 'Richmond Road', 'Malleshwaram',
+             'Frazer Town', 'Basavanagudi', 'Residency Road', 'Brookefield', 'New BEL Road', 'Church Street',
+             'Lavelle Road', 'Rajajinagar', 'Cunningham Road', 'Kammanahalli', 'Old Airport Road', 'Yelahanka']
+# Restaurant type -> (share, median cost for two, can book a table)
+REST_TYPES = {
+    'Quick Bites': (0.37, 300, False), 'Casual Dining': (0.21, 700, True), 'Cafe': (0.07, 500, False),
+    'Delivery': (0.05, 350, False), 'Dessert Parlor': (0.04, 300, False), 'Takeaway, Delivery': (0.04, 300, False),
+    'Casual Dining, Bar': (0.03, 1300, True), 'Bakery': (0.02, 300, False), 'Beverage Shop': (0.02, 250, False),
+    'Bar': (0.015, 1100, True), 'Food Court': (0.013, 400, False), 'Sweet Shop': (0.012, 250, False),
+    'Bar, Casual Dining': (0.009, 1300, True), 'Lounge': (0.008, 1500, True), 'Pub': (0.007, 1400, True),
+    'Fine Dining': (0.007, 2000, True), 'Casual Dining, Cafe': (0.007, 800, True),
+    'Beverage Shop, Quick Bites': (0.006, 300, False), 'Microbrewery, Casual Dining': (0.003, 1600, True),
+    'Kiosk': (0.003, 200, False),
+}
+CUISINES = {
+    'North Indian': 21085, 'Chinese': 15547, 'South Indian': 8644, 'Fast Food': 8096, 'Biryani': 6492,
+    'Continental': 5765, 'Desserts': 5633, 'Beverages': 8582, 'Cafe': 3682, 'Italian': 3389, 'Bakery': 3749,
+    'Street Food': 3079, 'Pizza': 2603, 'Burger': 2566, 'Seafood': 2329, 'Ice Cream': 2164, 'Andhra': 2183,
+    'Mughlai': 2118, 'Rolls': 2049, 'American': 2015, 'Kerala': 1776, 'Arabian': 1968, 'Asian': 1576,
+    'Momos': 1588, 'Salad': 1403, 'Juices': 1387, 'Thai': 1170, 'Mexican': 874, 'Healthy Food': 812,
+    'Chettinad': 706, 'Finger Food': 686, 'Sandwich': 682, 'Mangalorean': 638, 'Japanese': 602, 'Tibetan': 546,
+}
+LISTING_TYPES = {'Delivery': 0.50, 'Dine-out': 0.344, 'Desserts': 0.071, 'Cafes': 0.034,
+                 'Drinks & nightlife': 0.022, 'Buffet': 0.017, 'Pubs and bars': 0.012}
+DISHES = ['Biryani', 'Paneer Tikka', 'Butter Chicken', 'Masala Dosa', 'Pasta', 'Pizza', 'Burgers', 'Momos',
+          'Noodles', 'Brownie', 'Mocktails', 'Cocktails', 'Nachos', 'Fries', 'Sandwiches', 'Kebab', 'Waffles',
+          'Filter Coffee', 'Thali', 'Chicken Grill', 'Fish', 'Naan', 'Hot Chocolate', 'Salads', 'Rolls']
+NAME_SUFFIXES = ['Kitchen', 'Cafe', 'Bistro', 'Restaurant', 'Bar', 'Biryani House', 'Dhaba', 'Express',
+                 'Corner', 'Point', 'Grill', 'Bakery', 'Darshini', 'Eatery', 'Brew Co']
+# Search context the scraped URLs carry
+URL_CONTEXT = 'eyJzZSI6eyJlIjpbIjU4Il0sInQiOiJSZXN0YXVyYW50cyJ9fQ=='
+# Restaurants in the real file are listed about 5.9 times (under several areas and listing types)
+LISTINGS_PER_RESTAURANT = 5.9
+
+
+@lru_cache(maxsize=None)
+def catalog(seed, total):
+    """
+    The restaurants behind total listing rows: name, address, type,
+    cuisines, cost, rating and the other attributes that stay the same
+    wherever a restaurant is listed.
+    """
+    rng = dataset_rng(seed, 'zomato', 'catalog')
+    n = max(10, int(total / LISTINGS_PER_RESTAURANT))
+    types = list(REST_TYPES)
+    rest_type = rng.choice(len(types), n, p=np.array([REST_TYPES[t][0] for t in types])
+                           / sum(REST_TYPES[t][0] for t in types))
+    names = phrases(rng, n, 1, 2) + ' ' + pick(rng, NAME_SUFFIXES, n)
+    location = pick(rng, LOCATIONS, n, p=zipf_weights(len(LOCATIONS), 0.7))
+    cuisine_weights = np.array(list(CUISINES.values()), dtype='float64')
+    cost = np.array([REST_TYPES[t][1] for t in types])[rest_type] * rng.lognormal(0, 0.35, n)
+    cost = (np.maximum(np.round(cost / 50) * 50, 40)).astype(int)
+
+    # Ratings: most between 3.3 and 4.3, better for pricier places; some new ones are not rated yet
+    rating = np.clip(np.round(3.6 + 0.25 * np.log(cost / 400) + rng.normal(0, 0.38, n), 1), 1.8, 4.9)
+    rate = np.array([f"{r:.1f}/5" for r in rating], dtype=object)
+    spaced = rng.random(n) < 0.5
+    rate[spaced] = np.array([f"{r:.1f} /5" for r in rating[spaced]], dtype=object)
+    status = rng.random(n)
+    rate[status < 0.043] = 'NEW'
+    rate[(status >= 0.043) & (status < 0.045)] = '-'
+    rate[status >= 0.85] = None
+    rated = (status >= 0.045) & (status < 0.85)
+    votes = np.where(rated, np.round(rng.lognormal(3.5 + 2 * (rating - 3.5), 1.2, n)), 0).astype(int)
+
+    return pd.DataFrame({
+        'name': names,
+        'slug': [name.lower().replace(' ', '-') for name in names],
+        'address': [f"{number}, {street.title()} Road, {area}, Bangalore" for number, street, area in
+                    zip(rng.integers(1, 999, n), pick(rng, WORDS, n), location)],
+        'location': location,
+        'online_order': np.where(rng.random(n) < 0.59, 'Yes', 'No'),
+        'book_table': np.where(np.array([REST_TYPES[t][2] for t in types])[rest_type]
+                               & (rng.random(n) < 0.6), 'Yes', 'No'),
+        'rate': rate,
+        'rating': rating,
+        'votes': votes,
+        'phone': ['080 ' + ' '.join(str(part) for part in parts)
+                  for parts in rng.integers(1000, 9999, (n, 2))],
+        'rest_type': np.array(types, dtype=object)[rest_type],
+        'dish_liked': np.where(votes > 40, multi_values(rng, DISHES, n, min_k=1, max_k=7), None),
+        'cuisines': multi_values(rng, list(CUISINES), n, cuisine_weights / cuisine_weights.sum(), 1, 4),
+        'cost': cost,
+        'weight': zipf_weights(n, 0.5)[rng.permutation(n)],
+    })
+
+
+def _reviews(rng, restaurants):
+    """
+    reviews_list strings in the scraped format: a Python-style list of
+    ('Rated x.0', 'RATED\\n  text') tuples, empty for unrated places.
+    """
+    counts = np.where(restaurants['votes'].to_numpy() > 0, rng.integers(0, 6, len(restaurants)), 0)
+    stars = np.clip(np.round(restaurants['rating'].to_numpy()[:, None] + rng.normal(0, 0.8, (len(restaurants), 5))),
+                    1, 5)
+    texts = phrases(rng, int(counts.sum()), 15, 60)
+    out, used = [], 0
+    for row, k in enumerate(counts):
+        items = [f"('Rated {stars[row, i]:.1f}', 'RATED\\n  {texts[used + i]}.')" for i in range(k)]
+        used += k
+        out.append('[' + ', '.join(items) + ']')
+    return np.array(out, dtype=object)
+
+
+def generate_chunk(rng, start, n_rows, total, seed):
+    restaurants = catalog(seed, total)
+    # Popular restaurants are listed under more areas and types
+    picked = restaurants.iloc[rng.choice(len(restaurants), n_rows, p=restaurants['weight'])].reset_index(drop=True)
+    area = picked['location'].str.lower().str.replace(' ', '-')
+    df = pd.DataFrame({
+        'url': 'https://www.zomato.com/bangalore/' + picked['slug'] + '-' + area + '?context=' + URL_CONTEXT,
+        'address': picked['address'],
+        'name': picked['name'],
+        'online_order': picked['online_order'],
+        'book_table': picked['book_table'],
+        'rate': picked['rate'],
+        'votes': picked['votes'],
+        'phone': picked['phone'],
+        'location': picked['location'],
+        'rest_type': picked['rest_type'],
+        'dish_liked': picked['dish_liked'],
+        'cuisines': picked['cuisines'],
+        # Costs of a thousand or more carry a thousands separator, as in the scraped file
+        'approx_cost(for two people)': [f"{cost:,}" for cost in picked['cost']],
+        'reviews_list': _reviews(rng, picked),
+        'menu_item': '[]',
+        'listed_in(type)': pick(rng, list(LISTING_TYPES), n_rows, p=list(LISTING_TYPES.values())),
+        'listed_in(city)': np.where(rng.random(n_rows) < 0.7, picked['location'],
+                                    pick(rng, LOCATIONS, n_rows, p=zipf_weights(len(LOCATIONS), 0.5))),
+    }, columns=COLUMNS)
+    return {'restaurants': df}